@@ -0,0 +1,241 @@
+"""Yearly placement and salary trends of every branch, computed with NumPy.
+
+``BranchYearStat`` rows are loaded into (branches x years) arrays once per
+data version, with NaN for the years a branch has no figures for. Growth,
+CAGR, moving averages and linear projections are then computed for all
+branches in one pass instead of per object. Predicted years
+(``FORECAST_YEARS``) are not observations: they are kept out of those
+series and reported separately as the forecast.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .data_version import VersionedValue
+from .models import BranchYearStat, EngineeringBranch
+from .yearly_stats import FORECAST_YEARS
+
+# Trailing window of the moving averages, in years
+MOVING_AVERAGE_WINDOW = 3
+
+# Projections look this many years past the latest year on record
+PROJECTION_HORIZON = 2
+
+# Per-branch values computed for every branch, in BranchTrend order
+METRICS = (
+    'placement', 'salary', 'placement_growth', 'salary_growth', 'placement_cagr', 'salary_cagr',
+    'placement_average', 'salary_average', 'placement_slope', 'projected_placement', 'projected_salary',
+    'forecast_placement', 'forecast_growth', 'forecast_cagr',
+)
+
+Trends = namedtuple('Trends', ['version', 'ids', 'names', 'years', 'placement', 'salary',
+                               'projection_year', 'forecast_year', 'metrics', 'by_id'])
+
+
+class BranchTrend(namedtuple('BranchTrend', ['id', 'name', 'first_year', 'last_year'] + list(METRICS))):
+    """One branch's figures for its latest observed year, and the trends behind them.
+
+    Values a branch has too little history for are None. ``forecast_growth``
+    and ``forecast_cagr`` run from the latest observed placement to the
+    forecast one.
+    """
+    __slots__ = ()
+
+    def is_forecast(self):
+        """Whether the headline growth is the forecast, for want of observed history."""
+        return self.placement_growth is None and self.forecast_growth is not None
+
+    def headline_growth(self):
+        return self.forecast_growth if self.is_forecast() else self.placement_growth
+
+    def headline_cagr_percent(self):
+        rate = self.forecast_cagr if self.is_forecast() else self.placement_cagr
+        return None if rate is None else rate * 100
+
+    def placement_cagr_percent(self):
+        return None if self.placement_cagr is None else self.placement_cagr * 100
+
+    def salary_cagr_percent(self):
+        return None if self.salary_cagr is None else self.salary_cagr * 100
+
+    def __str__(self):
+        return self.name
+
+
+def first_last(values):
+    """Column of the first and last known value in each row, -1 for empty rows."""
+    if not values.shape[1]:
+        return np.full(len(values), -1), np.full(len(values), -1)
+    known = ~np.isnan(values)
+    has_any = known.any(axis=1)
+    first = np.where(has_any, known.argmax(axis=1), -1)
+    last = np.where(has_any, values.shape[1] - 1 - known[:, ::-1].argmax(axis=1), -1)
+    return first, last
+
+
+def take(values, columns):
+    """``values[i, columns[i]]`` for every row, NaN where the column is -1."""
+    if not values.size:
+        return np.full(len(values), np.nan)
+    return np.where(columns >= 0, values[np.arange(len(values)), columns], np.nan)
+
+
+def growth(values):
+    """Change from the first to the last known value; NaN with fewer than two."""
+    first, last = first_last(values)
+    return np.where(last > first, take(values, last) - take(values, first), np.nan)
+
+
+def cagr(values, years):
+    """Compound annual growth rate between the first and last known values."""
+    first, last = first_last(values)
+    start, end = take(values, first), take(values, last)
+    span = np.where(last > first, years[last] - years[first], 0) if len(years) else np.zeros(len(values))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = (end / start) ** (1.0 / span) - 1.0
+    return np.where((span > 0) & (start > 0) & (end >= 0), rate, np.nan)
+
+
+def moving_average(values, window=MOVING_AVERAGE_WINDOW):
+    """Trailing mean over ``window`` years, skipping missing ones."""
+    known = ~np.isnan(values)
+    sums = np.cumsum(np.where(known, values, 0.0), axis=1)
+    counts = np.cumsum(known, axis=1)
+    sums[:, window:] = sums[:, window:] - sums[:, :-window]
+    counts[:, window:] = counts[:, window:] - counts[:, :-window]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def linear_fit(values, years):
+    """Least-squares ``(slope, intercept)`` of each row over the known years.
+
+    A single known value gives a flat line through it; no values give NaN.
+    """
+    known = ~np.isnan(values)
+    count = known.sum(axis=1)
+    y = np.where(known, values, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = (known * years).sum(axis=1) / count
+        y_mean = y.sum(axis=1) / count
+        dx = np.where(known, years - x_mean[:, None], 0.0)
+        slope = (dx * (y - y_mean[:, None])).sum(axis=1) / (dx * dx).sum(axis=1)
+    slope = np.where(count == 1, 0.0, slope)
+    return slope, y_mean - slope * x_mean
+
+
+def project(values, years, year, low=0.0, high=None):
+    """Each row's linear trend evaluated at ``year``, clipped to ``[low, high]``."""
+    slope, intercept = linear_fit(values, years)
+    return np.clip(intercept + slope * year, low, high)
+
+
+def build_trends(version, branches, stats, forecast_years=()):
+    """Trends from ``(id, name)`` branch rows and ``(branch_id, year, placement, salary)`` stat rows.
+
+    Stats in ``forecast_years`` only feed the forecast of the latest such year.
+    """
+    branches = sorted(branches)
+    ids = np.array([row[0] for row in branches], dtype=np.int64)
+    names = [row[1] for row in branches]
+
+    # None becomes NaN in a float array
+    stats = np.array(list(stats), dtype=float).reshape(-1, 4)
+    # Stats of branches that are gone (or not yet visible) are dropped
+    if len(ids):
+        rows = np.searchsorted(ids, stats[:, 0]).clip(max=len(ids) - 1)
+        matched = ids[rows] == stats[:, 0]
+        stats, rows = stats[matched], rows[matched]
+    else:
+        stats, rows = stats[:0], np.zeros(0, dtype=np.int64)
+
+    predicted = np.isin(stats[:, 1], list(forecast_years))
+    forecast_year = int(stats[predicted, 1].max()) if predicted.any() else None
+    forecast_placement = np.full(len(ids), np.nan)
+    if forecast_year is not None:
+        latest = stats[:, 1] == forecast_year
+        forecast_placement[rows[latest]] = stats[latest, 2]
+    stats, rows = stats[~predicted], rows[~predicted]
+
+    years = np.arange(stats[:, 1].min(), stats[:, 1].max() + 1) if len(stats) else np.zeros(0)
+    placement = np.full((len(ids), len(years)), np.nan)
+    salary = np.full((len(ids), len(years)), np.nan)
+    if len(stats):
+        columns = (stats[:, 1] - years[0]).astype(np.int64)
+        placement[rows, columns] = stats[:, 2]
+        salary[rows, columns] = stats[:, 3]
+
+    projection_year = int(years[-1]) + PROJECTION_HORIZON if len(years) else None
+    first, last = first_last(placement)
+    salary_last = first_last(salary)[1]
+    slope, _ = linear_fit(placement, years)
+    metrics = {
+        'placement': take(placement, last),
+        'salary': take(salary, salary_last),
+        'placement_growth': growth(placement),
+        'salary_growth': growth(salary),
+        'placement_cagr': cagr(placement, years),
+        'salary_cagr': cagr(salary, years),
+        'placement_average': take(moving_average(placement), last),
+        'salary_average': take(moving_average(salary), salary_last),
+        'placement_slope': slope,
+        'projected_placement': project(placement, years, projection_year or 0, high=100.0),
+        'projected_salary': project(salary, years, projection_year or 0),
+        'forecast_placement': forecast_placement,
+    }
+    metrics['forecast_growth'] = forecast_placement - metrics['placement']
+    latest_year = years[last.clip(min=0)] if len(years) else np.zeros(len(ids))
+    span = np.where(last >= 0, (forecast_year or 0) - latest_year, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = (forecast_placement / metrics['placement']) ** (1.0 / span) - 1.0
+    metrics['forecast_cagr'] = np.where((span > 0) & (metrics['placement'] > 0), rate, np.nan)
+
+    # Row years and metrics as plain Python values, NaN as None, for templates
+    year_of = [int(year) for year in years]
+    first_years = [year_of[i] if i >= 0 else None for i in first.tolist()]
+    last_years = [year_of[i] if i >= 0 else None for i in last.tolist()]
+    columns = [[None if value != value else value for value in metrics[name].tolist()] for name in METRICS]
+    trends = [BranchTrend(*row) for row in zip(ids.tolist(), names, first_years, last_years, *columns)]
+    return Trends(
+        version=version,
+        ids=ids,
+        names=names,
+        years=years,
+        placement=placement,
+        salary=salary,
+        projection_year=projection_year,
+        forecast_year=forecast_year,
+        metrics=metrics,
+        by_id={trend.id: trend for trend in trends},
+    )
+
+
+def _load_trends(version):
+    return build_trends(
+        version,
+        EngineeringBranch.objects.order_by().values_list('id', 'name'),
+        BranchYearStat.objects.order_by().values_list('branch_id', 'year', 'placement', 'salary'),
+        FORECAST_YEARS,
+    )
+
+
+_trends = VersionedValue(_load_trends)
+
+
+def get_trends():
+    """Trends for the current data version, rebuilt only when it moves."""
+    return _trends.get()
+
+
+def top(trends, metric, k):
+    """The ``k`` branches with the highest ``metric``, branches without one last."""
+    values = trends.metrics[metric]
+    order = np.lexsort((trends.ids, -np.nan_to_num(values, nan=-np.inf)))[:k]
+    return [trends.by_id[int(trends.ids[i])] for i in order if not np.isnan(values[i])]
+
+
+def average(trends, metric):
+    """Mean of ``metric`` over the branches that have it, or None."""
+    values = trends.metrics[metric]
+    known = values[~np.isnan(values)]
+    return float(known.mean()) if known.size else None
@@ -0,0 +1,158 @@
+"""Read-only JSON API over the catalog.
+
+Collections are streamed: rows come from ``QuerySet.iterator()`` and are
+encoded in small batches, so a response never holds the whole result set.
+"""
+import hashlib
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Company, Course, EngineeringBranch, Project
+
+API_VERSION = 1
+
+# Rows fetched from the database and encoded per chunk
+CHUNK_SIZE = 500
+
+# field name -> lookup, and how to convert the query parameter
+Filter = namedtuple('Filter', ['lookup', 'convert'])
+Resource = namedtuple('Resource', ['model', 'fields', 'filters'])
+
+
+class ApiError(Exception):
+    """A bad request, answered with status 400 and the message."""
+
+
+def _int(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(f"Expected an integer, got {value!r}")
+
+
+def _float(value):
+    try:
+        return float(value)
+    except ValueError:
+        raise ApiError(f"Expected a number, got {value!r}")
+
+
+def _bool(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ApiError(f"Expected true or false, got {value!r}")
+
+
+def _str(value):
+    return value
+
+
+RESOURCES = {
+    'branches': Resource(
+        EngineeringBranch,
+        ('id', 'name', 'code', 'description', 'icon', 'placement_2024', 'placement_2026',
+         'salary_2024', 'future_trends', 'future_skills', 'updated_at'),
+        {'name': Filter('name', _str), 'code': Filter('code', _str),
+         'min_placement': Filter('placement_2024__gte', _int),
+         'min_salary': Filter('salary_2024__gte', _float)},
+    ),
+    'companies': Resource(
+        Company,
+        ('id', 'name', 'branch', 'description', 'website'),
+        {'branch': Filter('branch_id', _int), 'name': Filter('name', _str)},
+    ),
+    'courses': Resource(
+        Course,
+        ('id', 'name', 'platform', 'branch', 'level', 'duration', 'is_free', 'free_details'),
+        {'branch': Filter('branch_id', _int), 'platform': Filter('platform', _str),
+         'level': Filter('level', _str), 'is_free': Filter('is_free', _bool)},
+    ),
+    'projects': Resource(
+        Project,
+        ('id', 'name', 'branch', 'description', 'difficulty'),
+        {'branch': Filter('branch_id', _int), 'difficulty': Filter('difficulty', _str)},
+    ),
+}
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def select_fields(resource, fields_param):
+    """Fields asked for with ``?fields=a,b`` (all of them by default)."""
+    if not fields_param:
+        return resource.fields
+    fields = tuple(dict.fromkeys(f.strip() for f in fields_param.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in resource.fields]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields or resource.fields
+
+
+def filtered_queryset(resource, params):
+    """The resource's rows, filtered by the query parameters it understands."""
+    lookups = {}
+    for name, (lookup, convert) in resource.filters.items():
+        value = params.get(name)
+        if value not in (None, ''):
+            lookups[lookup] = convert(value)
+    return resource.model.objects.filter(**lookups).order_by('id')
+
+
+def etag(name, request, data_version):
+    """Changes with the data version and with anything in the query string."""
+    digest = hashlib.sha1(request.META.get('QUERY_STRING', '').encode()).hexdigest()[:12]
+    return f'"v{API_VERSION}-{name}-{data_version}-{digest}"'
+
+
+def field_columns(model, fields):
+    """Columns to select for ``fields``.
+
+    Foreign keys are selected by column (``branch_id``) but named after the
+    field in the output.
+    """
+    return [model._meta.get_field(field).attname for field in fields]
+
+
+def encode_rows(queryset, fields, header):
+    """JSON text of ``header`` with the rows appended as ``results``, in chunks."""
+    columns = field_columns(queryset.model, fields)
+    yield _encoder.encode(header)[:-1] + ',"results":['
+    first = True
+    batch = []
+    for row in queryset.values_list(*columns).iterator(chunk_size=CHUNK_SIZE):
+        batch.append(_encoder.encode(dict(zip(fields, row))))
+        if len(batch) >= CHUNK_SIZE:
+            yield ('' if first else ',') + ','.join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield ('' if first else ',') + ','.join(batch)
+    yield ']}'
+
+
+def encode_row(obj, fields):
+    columns = field_columns(type(obj), fields)
+    return _encoder.encode({field: getattr(obj, column) for field, column in zip(fields, columns)})
+
+
+def streaming_content(request, chunks):
+    """Chunks suited to the server: under ASGI a sync iterator would be
+    buffered whole, so it is drained one chunk at a time from a thread."""
+    if not isinstance(request, ASGIRequest):
+        return chunks
+    return _drain(iter(chunks))
+
+
+async def _drain(chunks):
+    # thread_sensitive keeps every chunk's queries on the same connection
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while True:
+        chunk = await next_chunk(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
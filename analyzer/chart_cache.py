@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict, namedtuple
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.utils import timezone
+from .chart_renderer import CHART_FIELDS, chart_data, submit_render
+from .metrics import timed
+from .models import EngineeringBranch
+
+logger = logging.getLogger(__name__)
+
+ChartImage = namedtuple('ChartImage', ['content', 'etag', 'last_modified'])
+
+# (chart name, fingerprint) -> ChartImage, least recently used first
+_images = OrderedDict()
+# chart name -> its most recently rendered ChartImage, served while a newer one renders
+_latest = {}
+# (chart name, fingerprint) -> (Future, monotonic start time) of renders in flight
+_pending = {}
+_stats = {'hits': 0, 'misses': 0}
+_lock = threading.Lock()
+_render_locks = defaultdict(threading.Lock)
+
+
+class ChartPending(Exception):
+    """The chart is being rendered and no earlier image of it is available."""
+
+
+def branch_fingerprint(fields):
+    """Fingerprint of the branch data a chart is drawn from.
+
+    Built from the row count, the latest ``updated_at`` and the plotted
+    columns, so a chart is only re-rendered when its input really changed.
+    """
+    rows = EngineeringBranch.objects.values_list('updated_at', 'name', *fields)
+    digest = hashlib.sha1()
+    last_updated = None
+    count = 0
+    for row in rows:
+        count += 1
+        if last_updated is None or row[0] > last_updated:
+            last_updated = row[0]
+        digest.update(repr(row[1:]).encode('utf-8'))
+    return f"{count}:{last_updated.isoformat() if last_updated else ''}:{digest.hexdigest()}"
+
+
+def get_chart_image(name):
+    """PNG bytes for a chart, kept in a bounded in-memory LRU.
+
+    Never waits for a render: a chart that is not cached yet is queued on
+    the render pool and its previous image is served meanwhile, or
+    ``ChartPending`` is raised if there is none. Returns None when there is
+    no branch data to chart.
+    """
+    key = (name, branch_fingerprint(CHART_FIELDS[name]))
+    image = _cached(key, count=True)
+    if image is not None:
+        return image
+
+    # Per-chart lock so concurrent misses queue a single render; hits never wait on it
+    with _render_locks[name]:
+        image = _cached(key)
+        if image is None:
+            if not _start_render(name, key):
+                return None
+            # Inline renders (no pool) are already done and stored
+            image = _cached(key)
+    if image is not None:
+        return image
+    with _lock:
+        image = _latest.get(name)
+    if image is None:
+        raise ChartPending(name)
+    return image
+
+
+def _cached(key, count=False):
+    with _lock:
+        image = _images.get(key)
+        if image is not None:
+            _images.move_to_end(key)
+        if count:
+            _stats['hits' if image is not None else 'misses'] += 1
+        return image
+
+
+def _start_render(name, key):
+    """Queue a render of ``key`` unless one is running; False without branch data."""
+    timeout = getattr(settings, 'CHART_RENDER_TIMEOUT', 30)
+    with _lock:
+        pending = _pending.get(key)
+    if pending is not None:
+        future, started = pending
+        if time.monotonic() - started < timeout:
+            return True
+        logger.warning("Rendering the %s chart took over %ss, starting it again", name, timeout)
+        future.cancel()
+
+    data = chart_data(name)
+    if data is None:
+        return False
+    with timed('chart'):
+        future = submit_render(name, data)
+    with _lock:
+        _pending[key] = (future, time.monotonic())
+    future.add_done_callback(partial(_store, key))
+    return True
+
+
+def _store(key, future):
+    # Runs when the render finishes, on the pool's thread or inline
+    with _lock:
+        if _pending.get(key, (None,))[0] is future:
+            del _pending[key]
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Rendering the %s chart failed", key[0], exc_info=exc)
+        return
+    content = future.result()
+    etag = hashlib.sha256(content).hexdigest()
+    max_size = getattr(settings, 'CHART_MEMORY_CACHE_SIZE', 16)
+    with _lock:
+        # Last-Modified is the render time (deletes never move any updated_at),
+        # a second past the previous image's so If-Modified-Since can't match it
+        last_modified = timezone.now().replace(microsecond=0)
+        previous = _latest.get(key[0])
+        if previous is not None and previous.etag != etag and last_modified <= previous.last_modified:
+            last_modified = previous.last_modified + timedelta(seconds=1)
+        image = ChartImage(content=content, etag=etag, last_modified=last_modified)
+        _images[key] = image
+        _latest[key[0]] = image
+        while len(_images) > max_size:
+            _images.popitem(last=False)
+
+
+def invalidate_charts():
+    with _lock:
+        _images.clear()
+
+
+def chart_cache_stats():
+    with _lock:
+        return dict(_stats, images=len(_images), rendering=len(_pending))
+
@@ -0,0 +1,116 @@
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from django.conf import settings
+from .models import EngineeringBranch
+
+logger = logging.getLogger(__name__)
+
+# Branch columns each chart is drawn from
+CHART_FIELDS = {
+    'placement': ('placement_2024', 'placement_2026'),
+    'salary': ('salary_2024',),
+    'growth': ('placement_2024', 'placement_2026'),
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def chart_data(name):
+    """Plain lists a chart is drawn from, or None when there are no branches."""
+    branches = EngineeringBranch.objects.all()
+    if not branches:
+        return None
+
+    data = {'names': [b.name for b in branches]}
+    if name == 'placement':
+        data['placement_2024'] = [b.placement_2024 for b in branches]
+        data['placement_2026'] = [b.placement_2026 for b in branches]
+    elif name == 'salary':
+        data['salaries'] = [b.salary_2024 for b in branches]
+    elif name == 'growth':
+        data['growth'] = [b.placement_growth() for b in branches]
+    return data
+
+
+def submit_render(name, data):
+    """Start rendering a chart to PNG bytes; returns its Future without waiting."""
+    return _submit(_charts().render_chart_png, name, data)
+
+
+def shutdown_pool(wait=True):
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _charts():
+    # matplotlib and numpy are only loaded once a chart is actually needed,
+    # not by every process that imports the URLconf
+    from . import charts
+    return charts
+
+
+def _submit(func, *args):
+    pool = _get_pool()
+    if pool is None:
+        # CHART_RENDER_WORKERS = 0 renders inline, e.g. for tests
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    try:
+        future = pool.submit(func, *args)
+    except BrokenProcessPool:
+        logger.warning("Chart render pool broke, restarting it")
+        _reset_pool(pool)
+        pool = _get_pool()
+        future = pool.submit(func, *args)
+    # A pool can also break while the render runs: replace it for the next one
+    future.add_done_callback(partial(_check_pool, pool))
+    return future
+
+
+def _check_pool(pool, future):
+    global _pool
+    if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+        logger.warning("Chart render pool broke during a render, replacing it")
+        # Its workers are already gone; the next submit starts a new pool
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+
+
+def _get_pool():
+    global _pool
+    workers = getattr(settings, 'CHART_RENDER_WORKERS', 2)
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the web process has threads and open DB connections
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _reset_pool(broken):
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False)
+
+
+atexit.register(shutdown_pool, wait=False)
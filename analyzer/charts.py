@@ -0,0 +1,117 @@
+"""Chart drawing functions run by the chart render pool.
+
+These take plain lists (no querysets) and must not import Django, so they
+can run in a separate worker process.
+"""
+from io import BytesIO
+
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+from matplotlib.figure import Figure
+import numpy as np
+
+
+def draw_placement_chart(data):
+    names = data['names']
+    x = np.arange(len(names))
+    width = 0.35
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    bars1 = ax.bar(x - width/2, data['placement_2024'], width, label='2024', color='#3498db')
+    bars2 = ax.bar(x + width/2, data['placement_2026'], width, label='2026', color='#e74c3c')
+
+    ax.set_xlabel('Engineering Branches')
+    ax.set_ylabel('Placement Percentage (%)')
+    ax.set_title('Placement Rates: 2024 vs 2026')
+    ax.set_xticks(x)
+    ax.set_xticklabels(names, rotation=45, ha='right')
+    ax.legend()
+
+    # Add value labels on bars
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.annotate(f'{height}%',
+                        xy=(bar.get_x() + bar.get_width() / 2, height),
+                        xytext=(0, 3),
+                        textcoords="offset points",
+                        ha='center', va='bottom', fontsize=8)
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_salary_chart(data):
+    names = data['names']
+    colors = ['#2ecc71', '#3498db', '#9b59b6', '#e67e22', '#1abc9c', '#e74c3c']
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.bar(names, data['salaries'], color=colors[:len(names)])
+
+    ax.set_xlabel('Engineering Branches')
+    ax.set_ylabel('Salary (Lakhs per Annum)')
+    ax.set_title('Average Salary Package 2024')
+    ax.set_xticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=45, ha='right')
+
+    # Add value labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.annotate(f'₹{height}L',
+                    xy=(bar.get_x() + bar.get_width() / 2, height),
+                    xytext=(0, 3),
+                    textcoords="offset points",
+                    ha='center', va='bottom', fontsize=10)
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_growth_chart(data):
+    names = data['names']
+    growth = data['growth']
+    colors = ['#27ae60' if g > 0 else '#c0392b' for g in growth]
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.bar(names, growth, color=colors)
+
+    ax.set_xlabel('Engineering Branches')
+    ax.set_ylabel('Growth (%)')
+    ax.set_title('Placement Growth: 2024 to 2026')
+    ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+    ax.set_xticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=45, ha='right')
+
+    # Add value labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.annotate(f'{height:+.1f}%',
+                    xy=(bar.get_x() + bar.get_width() / 2, height),
+                    xytext=(0, 5 if height > 0 else -15),
+                    textcoords="offset points",
+                    ha='center', va='bottom' if height > 0 else 'top',
+                    fontsize=10)
+
+    fig.tight_layout()
+    return fig
+
+
+DRAWERS = {
+    'placement': draw_placement_chart,
+    'salary': draw_salary_chart,
+    'growth': draw_growth_chart,
+}
+
+
+def render_chart_png(name, data):
+    """Render a chart straight to PNG bytes, without touching the disk."""
+    return chart_png(DRAWERS[name](data))
+
+
+def chart_png(fig):
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    return buffer.getvalue()
@@ -0,0 +1,85 @@
+"""Versions of the catalog, kept in the database so every process agrees on them.
+
+Each scope is one ``CatalogVersion`` row: ``data`` for the whole catalog,
+plus the narrower scopes of the fragment cache. Writers bump the rows in the
+same transaction as their change, so another process, worker or management
+command sees a new version exactly when it can see the data behind it. A
+bump stores a fresh ``time_ns()`` instead of adding one, so the version of a
+rolled-back transaction is never handed out again.
+"""
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+
+from .models import CatalogVersion
+
+DATA_SCOPE = 'data'
+
+
+def get_versions(scopes):
+    """Current version of each scope, in one query once they all exist."""
+    found = dict(CatalogVersion.objects.filter(scope__in=scopes).values_list('scope', 'version'))
+    missing = [scope for scope in scopes if scope not in found]
+    if missing:
+        # Never bumped: start fresh versions, keeping any another process wrote first
+        CatalogVersion.objects.bulk_create(
+            [CatalogVersion(scope=scope, version=time.time_ns()) for scope in missing], ignore_conflicts=True)
+        found.update(CatalogVersion.objects.filter(scope__in=missing).values_list('scope', 'version'))
+    return [found[scope] for scope in scopes]
+
+
+def bump_versions(*scopes):
+    version = time.time_ns()
+    CatalogVersion.objects.bulk_create(
+        [CatalogVersion(scope=scope, version=version) for scope in scopes],
+        update_conflicts=True, unique_fields=['scope'], update_fields=['version'])
+    return version
+
+
+def get_data_version():
+    """Version of the branch/company/course/project data: one primary key lookup."""
+    return get_versions([DATA_SCOPE])[0]
+
+
+async def aget_data_version():
+    version = await CatalogVersion.objects.filter(scope=DATA_SCOPE).values_list('version', flat=True).afirst()
+    if version is None:
+        version = await sync_to_async(get_data_version)()
+    return version
+
+
+def bump_data_version():
+    return bump_versions(DATA_SCOPE)
+
+
+class VersionedValue:
+    """A value built once per data version and shared by every thread.
+
+    ``build(version, *args)`` makes it. Readers keep whichever value they
+    already hold, so a rebuild never disturbs them, and concurrent callers
+    wait for a single build of a new version.
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._current = None  # (version, value)
+        self._lock = threading.Lock()
+
+    def get(self, version=None, *args):
+        """The value for ``version`` (default: the current data version)."""
+        if version is None:
+            version = get_data_version()
+        current = self._current
+        if current is None or current[0] != version:
+            with self._lock:
+                current = self._current
+                if current is None or current[0] != version:
+                    current = (version, self._build(version, *args))
+                    self._current = current
+        return current[1]
+
+    def cached(self, version):
+        """The value for ``version`` if it is already built, else None."""
+        current = self._current
+        return current[1] if current is not None and current[0] == version else None
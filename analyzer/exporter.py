@@ -0,0 +1,139 @@
+"""Streaming CSV / JSON Lines export of chatbot feedback and the catalog.
+
+Rows come from ``QuerySet.iterator()`` and are encoded a chunk at a time,
+optionally through an incremental gzip compressor, so memory use and time
+to first byte don't depend on the size of the table.
+"""
+import csv
+import datetime
+import io
+import zlib
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .api import RESOURCES, field_columns
+from .models import UserFeedback
+
+# Rows fetched from the database and encoded per chunk
+CHUNK_SIZE = 2000
+
+FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+# ``ordering`` follows an index, so a date range is a single range scan
+Export = namedtuple('Export', ['model', 'fields', 'ordering', 'timestamp'])
+
+EXPORTS = {
+    'feedback': Export(UserFeedback, ('id', 'timestamp', 'user_input', 'bot_response'),
+                       ('timestamp', 'id'), 'timestamp'),
+}
+EXPORTS.update(
+    (name, Export(resource.model, resource.fields, ('id',), None))
+    for name, resource in RESOURCES.items()
+)
+
+
+class ExportError(Exception):
+    """Bad export parameters, answered with status 400."""
+
+
+def parse_bound(value, end=False):
+    """Aware datetime for a ``since`` / ``until`` parameter.
+
+    A bare date means the start of that day, or with ``end`` the start of
+    the next one, so ``until=2026-03-31`` includes all of March 31st.
+    """
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+        moment = None if day else parse_datetime(value)
+    except ValueError:
+        day = moment = None
+    if day is not None:
+        if end:
+            day += datetime.timedelta(days=1)
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    elif moment is None:
+        raise ExportError(f"Expected a date or datetime, got {value!r}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(kind, since=None, until=None):
+    if kind not in EXPORTS:
+        raise ExportError(f"Unknown export {kind!r}; expected one of {', '.join(EXPORTS)}")
+    export = EXPORTS[kind]
+    queryset = export.model.objects.order_by(*export.ordering)
+    if since or until:
+        if export.timestamp is None:
+            raise ExportError(f"{kind} can't be filtered by date")
+        if since:
+            queryset = queryset.filter(**{f'{export.timestamp}__gte': since})
+        if until:
+            queryset = queryset.filter(**{f'{export.timestamp}__lt': until})
+    return queryset
+
+
+def export_chunks(kind, fmt, since=None, until=None, compress=False):
+    """Encoded (and optionally gzipped) chunks of the whole export."""
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format {fmt!r}; expected csv or jsonl")
+    export = EXPORTS.get(kind)
+    queryset = export_queryset(kind, since, until)
+    rows = queryset.values_list(*field_columns(export.model, export.fields)).iterator(chunk_size=CHUNK_SIZE)
+    encode = _csv_chunks if fmt == 'csv' else _jsonl_chunks
+    chunks = encode(export.fields, rows)
+    return _gzip(chunks) if compress else chunks
+
+
+def filename(kind, fmt, compress=False):
+    return f"{kind}.{fmt}{'.gz' if compress else ''}"
+
+
+def _csv_chunks(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    # Header first, so the client sees bytes before the first query returns
+    yield buffer.getvalue()
+    while True:
+        buffer.seek(0)
+        buffer.truncate()
+        count = 0
+        for row in rows:
+            writer.writerow([value.isoformat() if isinstance(value, datetime.datetime) else value
+                             for value in row])
+            count += 1
+            if count == CHUNK_SIZE:
+                break
+        if count == 0:
+            return
+        yield buffer.getvalue()
+        if count < CHUNK_SIZE:
+            return
+
+
+def _jsonl_chunks(fields, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    batch = []
+    for row in rows:
+        batch.append(encoder.encode(dict(zip(fields, row))))
+        if len(batch) == CHUNK_SIZE:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+
+def _gzip(chunks):
+    # wbits=31: a gzip container around the deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
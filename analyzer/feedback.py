@@ -0,0 +1,181 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .models import UserFeedback
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+class FeedbackWriter:
+    """Buffers chatbot feedback and writes it with ``bulk_create`` in batches.
+
+    A batch is written once ``batch_size`` records are waiting or
+    ``flush_interval`` seconds have passed since the first of them. The
+    queue is bounded: when it is full, ``policy='drop'`` discards the record
+    and ``policy='block'`` makes the caller wait up to ``block_timeout``
+    seconds (then drops it). Dropped records are counted. Async callers use
+    ``asubmit``, which waits in a worker thread rather than on the event
+    loop. Rows are timestamped when they are submitted.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=1.0, max_queue=10000,
+                 policy='drop', block_timeout=0.5):
+        if policy not in ('drop', 'block'):
+            raise ValueError(f"Unknown feedback queue policy: {policy!r}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.written = self.dropped = self.failed = self.batches = 0
+
+    def submit(self, user_input, bot_response):
+        """Queue one record; returns False if it had to be dropped."""
+        if self._closed:
+            self._count(dropped=1)
+            return False
+        self._start()
+        record = UserFeedback(user_input=user_input, bot_response=bot_response, timestamp=timezone.now())
+        try:
+            if self.policy == 'block':
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._count(dropped=1)
+            return False
+        return True
+
+    async def asubmit(self, user_input, bot_response):
+        """``submit`` for async views; never blocks the event loop."""
+        if self.policy == 'block':
+            return await sync_to_async(self.submit, thread_sensitive=False)(user_input, bot_response)
+        return self.submit(user_input, bot_response)
+
+    def flush(self, timeout=10):
+        """Write everything queued so far, waiting up to ``timeout`` seconds.
+
+        Returns False if the records were not all written in time.
+        """
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(max(deadline - time.monotonic(), 0))
+
+    def close(self, timeout=10):
+        """Flush what is left and stop the writer thread, within ``timeout``."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            deadline = time.monotonic() + timeout
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                logger.warning("Feedback writer did not stop: %d records still queued",
+                               self._queue.qsize())
+                return
+            thread.join(max(deadline - time.monotonic(), 0))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'written': self.written,
+                'batches': self.batches,
+                'dropped': self.dropped,
+                'failed': self.failed,
+            }
+
+    def _count(self, written=0, batches=0, dropped=0, failed=0):
+        with self._lock:
+            self.written += written
+            self.batches += batches
+            self.dropped += dropped
+            self.failed += failed
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='feedback-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if isinstance(item, UserFeedback):
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    if len(batch) < self.batch_size:
+                        continue
+
+                # Batch full, interval elapsed, flush requested or stopping
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = None
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is _STOP:
+                    return
+        finally:
+            connection.close()
+
+    def _write(self, batch):
+        close_old_connections()
+        try:
+            UserFeedback.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception:
+            self._count(failed=len(batch))
+            logger.exception("Writing %d chatbot feedback records failed", len(batch))
+        else:
+            self._count(written=len(batch), batches=1)
+
+
+def get_feedback_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = FeedbackWriter(
+                    batch_size=getattr(settings, 'FEEDBACK_BATCH_SIZE', 100),
+                    flush_interval=getattr(settings, 'FEEDBACK_FLUSH_INTERVAL', 1.0),
+                    max_queue=getattr(settings, 'FEEDBACK_QUEUE_SIZE', 10000),
+                    policy=getattr(settings, 'FEEDBACK_QUEUE_POLICY', 'drop'),
+                )
+                atexit.register(_writer.close)
+    return _writer
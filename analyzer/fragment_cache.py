@@ -0,0 +1,74 @@
+"""Cached template fragments, invalidated per branch by model signals.
+
+A fragment's key holds the versions of the scopes it depends on: the branch
+list (``branches``) or a single branch (``branch:<id>``), plus an epoch that
+bulk loads move. Saving or deleting a branch, company, course or project
+bumps only the scopes it touches, so other branches' fragments stay cached.
+Scope versions are ``CatalogVersion`` rows bumped in the writing
+transaction, so a change made by any process expires the fragments of
+every process.
+"""
+import threading
+
+from django.core.cache import caches
+
+from .data_version import bump_versions, get_versions
+
+FRAGMENT_CACHE_ALIAS = 'fragments'
+
+# Scopes: every fragment also depends on EPOCH
+EPOCH = 'fragments'
+BRANCH_LIST = 'branches'
+
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+_lock = threading.Lock()
+
+
+def fragment_cache():
+    return caches[FRAGMENT_CACHE_ALIAS]
+
+
+def branch_scope(branch_id):
+    return f'branch:{branch_id}'
+
+
+def fragment_key(name, scopes):
+    versions = get_versions([EPOCH, *scopes])
+    return f"analyzer:fragment:{name}:{','.join(scopes)}:{'.'.join(map(str, versions))}"
+
+
+def get_fragment(name, scopes, render):
+    """Cached output of ``render()`` for the current versions of ``scopes``."""
+    cache = fragment_cache()
+    key = fragment_key(name, scopes)
+    content = cache.get(key)
+    if content is not None:
+        _count('hits')
+        return content
+    _count('misses')
+    content = render()
+    cache.set(key, content)
+    return content
+
+
+def invalidate_scopes(*scopes):
+    """Move the versions of ``scopes``; fragments rendered for the old ones expire unused."""
+    bump_versions(*scopes)
+    _count('invalidations', len(scopes))
+
+
+def invalidate_all_fragments():
+    invalidate_scopes(EPOCH)
+
+
+def fragment_cache_stats():
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def _count(name, amount=1):
+    with _lock:
+        _stats[name] += amount
@@ -0,0 +1,309 @@
+"""Streaming CSV / JSON Lines upsert into the catalog tables.
+
+Files hold one kind of row (branches, companies, courses or projects). Rows
+are read lazily, validated with the model fields and written in chunks: one
+lookup query per chunk finds the rows that already exist, then new rows go
+through ``bulk_create`` and changed ones through ``bulk_update``. Memory use
+depends on the chunk size, not on the size of the file.
+"""
+import csv
+import gzip
+import io
+import json
+import time
+from collections import namedtuple
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, models, transaction
+from django.utils import timezone
+
+from .data_version import bump_data_version
+from .fragment_cache import invalidate_all_fragments
+from .loader import catalog_changed
+from .models import Company, Course, EngineeringBranch, Project
+from .search import index_objects
+from .yearly_stats import sync_headline_stats
+
+# Keys looked up per query when matching a chunk against existing rows
+LOOKUP_BATCH = 500
+
+# Row errors kept for the report; the rest are only counted
+MAX_ERRORS = 50
+
+# ``key`` columns identify a row; ``branch`` holds a branch name or code
+ImportSpec = namedtuple('ImportSpec', ['model', 'key', 'fields'])
+
+SPECS = {
+    'branches': ImportSpec(EngineeringBranch, ('name',), (
+        'code', 'description', 'placement_2024', 'placement_2026', 'salary_2024',
+        'future_trends', 'future_skills', 'icon')),
+    'companies': ImportSpec(Company, ('branch', 'name'), ('description', 'website')),
+    'courses': ImportSpec(Course, ('branch', 'platform', 'name'), (
+        'level', 'duration', 'is_free', 'free_details')),
+    'projects': ImportSpec(Project, ('branch', 'name'), ('description', 'difficulty')),
+}
+
+FORMATS = ('csv', 'jsonl')
+
+# Import kind -> kind of search document
+SEARCH_KINDS = {'branches': 'branch', 'companies': 'company', 'courses': 'course', 'projects': 'project'}
+
+
+class CatalogImportError(Exception):
+    """The file as a whole can't be imported (bad header, unknown kind...)."""
+
+
+class RowError(Exception):
+    pass
+
+
+class ImportReport:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+        self.read = 0
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.errors = []
+
+    @property
+    def rows_per_second(self):
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def error(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+    def __str__(self):
+        return (f"{self.read} rows read, {self.created} created, {self.updated} updated, "
+                f"{self.skipped} skipped in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)")
+
+
+def detect_format(filename):
+    name = filename.lower().removesuffix('.gz')
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    raise CatalogImportError(f"Can't tell the format of {filename!r}; use .csv or .jsonl")
+
+
+def open_text(binary, filename=''):
+    """Text stream over a binary file, gunzipped on the fly for ``.gz`` names."""
+    if filename.lower().endswith('.gz'):
+        binary = gzip.GzipFile(fileobj=binary)
+    return io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line number, row dict or RowError)`` without reading ahead."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, RowError("More values than columns")
+            else:
+                yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, RowError(f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(row, dict):
+            yield line_number, RowError("Expected a JSON object")
+        else:
+            yield line_number, row
+
+
+def import_rows(kind, rows, chunk_size=2000, strict=False, progress=None):
+    """Upsert ``(line, row)`` pairs of one kind in a single transaction.
+
+    Invalid rows are skipped and reported, or abort the whole import with
+    ``strict``. ``progress`` is called with the report after every chunk.
+    """
+    if kind not in SPECS:
+        raise CatalogImportError(f"Unknown kind {kind!r}; expected one of {', '.join(SPECS)}")
+    spec = SPECS[kind]
+    report = ImportReport()
+    try:
+        _import_chunks(kind, spec, iter(rows), report, chunk_size, strict, progress)
+    except IntegrityError as exc:
+        # e.g. a new branch reusing another branch's code; nothing was saved
+        raise CatalogImportError(f"Rejected by the database: {exc}")
+    except (UnicodeDecodeError, csv.Error, OSError) as exc:
+        # Undecodable text, broken CSV quoting or a corrupt .gz
+        raise CatalogImportError(f"Can't read the file: {exc}")
+    report.seconds = time.perf_counter() - report.start
+    return report
+
+
+def _import_chunks(kind, spec, rows, report, chunk_size, strict, progress):
+    with transaction.atomic():
+        branches = _branch_ids() if 'branch' in spec.key else {}
+        header_checked = False
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            cleaned = {}
+            for line, row in chunk:
+                report.read += 1
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    if not header_checked:
+                        _check_columns(spec, row)
+                        header_checked = True
+                    key, values = _clean_row(spec, row, branches)
+                except RowError as exc:
+                    if strict:
+                        raise CatalogImportError(f"Line {line}: {exc}")
+                    report.error(line, str(exc))
+                    continue
+                # A key repeated within the chunk: the last row wins
+                cleaned[key] = (line, values)
+            _upsert(kind, spec, cleaned, report, strict)
+            report.seconds = time.perf_counter() - report.start
+            if progress:
+                progress(report)
+
+        # bulk writes send no signals: the data version moves with them and
+        # this process's caches are invalidated by hand on commit
+        bump_data_version()
+        invalidate_all_fragments()
+        transaction.on_commit(catalog_changed)
+
+
+def import_file(kind, binary, filename, fmt=None, **kwargs):
+    """Import an open binary file; the format comes from the name unless given."""
+    fmt = fmt or detect_format(filename)
+    if fmt not in FORMATS:
+        raise CatalogImportError(f"Unknown format {fmt!r}")
+    return import_rows(kind, read_rows(open_text(binary, filename), fmt), **kwargs)
+
+
+def _branch_ids():
+    # Branches are referenced by name or code; a name wins over an equal code
+    rows = list(EngineeringBranch.objects.values_list('id', 'name', 'code'))
+    ids = {code: branch_id for branch_id, _, code in rows}
+    ids.update((name, branch_id) for branch_id, name, _ in rows)
+    return ids
+
+
+def _check_columns(spec, row):
+    allowed = set(spec.key) | set(spec.fields)
+    unknown = sorted(set(row) - allowed)
+    if unknown:
+        raise CatalogImportError(f"Unknown column(s): {', '.join(unknown)}")
+    missing = [column for column in spec.key if column not in row]
+    if missing:
+        raise CatalogImportError(f"Missing key column(s): {', '.join(missing)}")
+
+
+def _clean_row(spec, row, branches):
+    missing = [column for column in spec.key if column not in row]
+    if missing:
+        raise RowError(f"Missing {', '.join(missing)}")
+    values = {}
+    for column, raw in row.items():
+        if column not in spec.key and column not in spec.fields:
+            raise RowError(f"Unknown column {column!r}")
+        if column == 'branch':
+            branch_id = branches.get(str(raw).strip())
+            if branch_id is None:
+                raise RowError(f"Unknown branch {raw!r}")
+            values['branch_id'] = branch_id
+            continue
+        field = spec.model._meta.get_field(column)
+        if raw is None or (raw == '' and not isinstance(field, (models.CharField, models.TextField))):
+            if column in spec.key:
+                raise RowError(f"{column} is required")
+            continue
+        if isinstance(field, models.BooleanField) and isinstance(raw, str):
+            raw = raw.strip().lower() in ('1', 'true', 't', 'yes', 'y')
+        try:
+            values[column] = field.clean(raw, None)
+        except ValidationError as exc:
+            raise RowError(f"{column}: {' '.join(exc.messages)}")
+    key = tuple(values['branch_id' if column == 'branch' else column] for column in spec.key)
+    return key, values
+
+
+def _existing(spec, keys):
+    """Rows already stored under any of ``keys``.
+
+    The keys are joined as a VALUES list against the table, so each one is
+    a single probe of the composite key index. (SQLite scans the table for
+    ``(a, b) IN (VALUES ...)``, and IN lists per column probe every
+    combination of their values.)
+    """
+    model = spec.model
+    quote = connection.ops.quote_name
+    join = ' AND '.join(f"t.{quote('branch_id' if column == 'branch' else column)} = k.column{i}"
+                        for i, column in enumerate(spec.key, start=1))
+    row = f"({', '.join(['%s'] * len(spec.key))})"
+    for start in range(0, len(keys), LOOKUP_BATCH):
+        batch = keys[start:start + LOOKUP_BATCH]
+        sql = (f"SELECT t.* FROM (VALUES {', '.join([row] * len(batch))}) AS k "
+               f"JOIN {quote(model._meta.db_table)} t ON {join}")
+        yield from model.objects.raw(sql, [value for key in batch for value in key])
+
+
+def _key_of(spec, obj):
+    return tuple(getattr(obj, 'branch_id' if column == 'branch' else column) for column in spec.key)
+
+
+def _upsert(kind, spec, cleaned, report, strict):
+    if not cleaned:
+        return
+    model = spec.model
+    existing = {_key_of(spec, obj): obj for obj in _existing(spec, list(cleaned))}
+
+    to_create, to_update, update_fields = [], [], set()
+    for key, (line, values) in cleaned.items():
+        obj = existing.get(key)
+        if obj is None:
+            missing = [f.name for f in model._meta.concrete_fields
+                       if not (f.primary_key or f.has_default() or f.blank or f.null
+                               or getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)
+                               or f.attname in values)]
+            if missing:
+                message = f"New row needs {', '.join(missing)}"
+                if strict:
+                    raise CatalogImportError(f"Line {line}: {message}")
+                report.error(line, message)
+                continue
+            to_create.append(model(**values))
+        else:
+            changed = [field for field, value in values.items() if getattr(obj, field) != value]
+            if changed:
+                for field in changed:
+                    setattr(obj, field, values[field])
+                update_fields.update(changed)
+                to_update.append(obj)
+
+    if to_create:
+        model.objects.bulk_create(to_create)
+        report.created += len(to_create)
+    if to_update:
+        if model is EngineeringBranch:
+            # bulk_update skips auto_now
+            now = timezone.now()
+            for obj in to_update:
+                obj.updated_at = now
+            update_fields.add('updated_at')
+        model.objects.bulk_update(to_update, sorted(update_fields), batch_size=500)
+        report.updated += len(to_update)
+    # bulk writes skip the signals that keep the search index and the yearly
+    # stats current
+    index_objects(SEARCH_KINDS[kind], to_create + to_update)
+    if model is EngineeringBranch:
+        sync_headline_stats(to_create + to_update)
@@ -0,0 +1,143 @@
+"""Seed catalog loaded by the load_initial_data command and view."""
+
+BRANCHES = [
+    {"name": "Computer Science", "code": "CS", "placement_2024": 88, "placement_2026": 91, "salary_2024": 9.2,
+     "future_trends": "AI jobs will grow by 40%, Cybersecurity demand increasing, Cloud computing expansion",
+     "future_skills": "AI/ML, Cloud Computing, Cybersecurity, Data Science, Full Stack Development", "icon": "💻"},
+    {"name": "Mechanical", "code": "ME", "placement_2024": 72, "placement_2026": 75, "salary_2024": 6.5,
+     "future_trends": "EV sector boom, Robotics automation expanding, Additive manufacturing growth",
+     "future_skills": "CAD/CAM, Robotics, EV Technology, 3D Printing, Thermodynamics", "icon": "🚗"},
+    {"name": "Civil", "code": "CE", "placement_2024": 68, "placement_2026": 70, "salary_2024": 5.9,
+     "future_trends": "Infrastructure projects under National Pipeline, Smart cities, Green building",
+     "future_skills": "BIM, Project Management, Sustainable Materials, Structural Analysis", "icon": "🏗️"},
+    {"name": "Electronics", "code": "EC", "placement_2024": 79, "placement_2026": 82, "salary_2024": 7.8,
+     "future_trends": "Semiconductor industry growth, IoT devices expansion, 5G implementation",
+     "future_skills": "VLSI, Embedded Systems, IoT, PCB Design, Communication Systems", "icon": "📱"},
+    {"name": "Chemical", "code": "CH", "placement_2024": 71, "placement_2026": 74, "salary_2024": 6.8,
+     "future_trends": "Green chemistry emerging, Pharmaceutical sector stable, Sustainable processes",
+     "future_skills": "Process Optimization, Green Chemistry, Data Analysis, Thermodynamics", "icon": "⚗️"},
+    {"name": "Aerospace", "code": "AE", "placement_2024": 75, "placement_2026": 78, "salary_2024": 8.1,
+     "future_trends": "Space tech growing, Drone technology expanding, Commercial space flight",
+     "future_skills": "Aerodynamics, Composite Materials, Drone Tech, Propulsion Systems", "icon": "✈️"},
+]
+
+COMPANIES = {
+    "Computer Science": ["Google", "Microsoft", "Amazon", "Infosys", "TCS", "Wipro", "Facebook", "Apple"],
+    "Mechanical": ["TATA Motors", "Mahindra", "L&T", "Maruti Suzuki", "John Deere", "BHEL", "Siemens"],
+    "Civil": ["L&T Construction", "Shapoorji Pallonji", "TATA Projects", "GMR Group", "DLF", "Prestige"],
+    "Electronics": ["Intel", "Samsung", "Qualcomm", "Texas Instruments", "NVIDIA", "AMD", "Broadcom"],
+    "Chemical": ["Reliance", "BASF", "Dow Chemical", "Shell", "BPCL", "IOCL", "ONGC"],
+    "Aerospace": ["ISRO", "DRDO", "Boeing", "Airbus", "HAL", "SpaceX", "Blue Origin"],
+}
+
+COURSES = {
+    "Computer Science": [
+        {"platform": "NPTEL", "name": "Programming in Java", "level": "Intermediate", "duration": "12 weeks", "is_free": True},
+        {"platform": "Coursera", "name": "Machine Learning by Andrew Ng", "level": "Beginner", "duration": "11 weeks", "is_free": False},
+        {"platform": "edX", "name": "CS50's Introduction to CS", "level": "Beginner", "duration": "12 weeks", "is_free": True},
+        {"platform": "Udemy", "name": "Web Development Bootcamp", "level": "Beginner", "duration": "55 hours", "is_free": False},
+        {"platform": "NPTEL", "name": "Data Structures and Algorithms", "level": "Intermediate", "duration": "8 weeks", "is_free": True},
+    ],
+    "Mechanical": [
+        {"platform": "NPTEL", "name": "Introduction to Electric Vehicles", "level": "Beginner", "duration": "8 weeks", "is_free": True},
+        {"platform": "Coursera", "name": "Robotics Specialization", "level": "Intermediate", "duration": "7 months", "is_free": False},
+        {"platform": "edX", "name": "CAD and Digital Manufacturing", "level": "Intermediate", "duration": "9 weeks", "is_free": True},
+        {"platform": "NPTEL", "name": "Automobile Engineering", "level": "Advanced", "duration": "12 weeks", "is_free": True},
+    ],
+    "Civil": [
+        {"platform": "NPTEL", "name": "Building Information Modeling", "level": "Intermediate", "duration": "8 weeks", "is_free": True},
+        {"platform": "Coursera", "name": "Construction Management", "level": "Beginner", "duration": "6 months", "is_free": False},
+        {"platform": "edX", "name": "Sustainable Building Design", "level": "Intermediate", "duration": "10 weeks", "is_free": True},
+    ],
+    "Electronics": [
+        {"platform": "NPTEL", "name": "VLSI Design", "level": "Advanced", "duration": "12 weeks", "is_free": True},
+        {"platform": "Coursera", "name": "IoT Programming", "level": "Intermediate", "duration": "7 weeks", "is_free": False},
+        {"platform": "edX", "name": "Embedded Systems", "level": "Beginner", "duration": "8 weeks", "is_free": True},
+    ],
+    "Chemical": [
+        {"platform": "NPTEL", "name": "Process Integration", "level": "Advanced", "duration": "8 weeks", "is_free": True},
+        {"platform": "Coursera", "name": "Introduction to Chemistry", "level": "Beginner", "duration": "7 weeks", "is_free": True},
+        {"platform": "edX", "name": "Sustainable Chemical Engineering", "level": "Intermediate", "duration": "6 weeks", "is_free": True},
+    ],
+    "Aerospace": [
+        {"platform": "NPTEL", "name": "Aerodynamics", "level": "Advanced", "duration": "12 weeks", "is_free": True},
+        {"platform": "Coursera", "name": "Flight Mechanics", "level": "Intermediate", "duration": "8 weeks", "is_free": False},
+        {"platform": "edX", "name": "Introduction to Aeronautical Engineering", "level": "Beginner", "duration": "7 weeks", "is_free": True},
+    ],
+}
+
+PROJECTS = {
+    "Computer Science": [
+        "AI Chatbot using Python and NLP",
+        "E-commerce Website with React",
+        "Mobile App with Flutter",
+        "Stock Price Prediction Model",
+        "Blockchain-based Voting System",
+        "Cybersecurity Threat Detection"
+    ],
+    "Mechanical": [
+        "Electric Vehicle Conversion Kit",
+        "3D Printed Prosthetic Hand",
+        "Automated Solar Panel Cleaner",
+        "RC Aircraft with FPV System",
+        "Hydraulic Robotic Arm",
+        "Smart Irrigation System"
+    ],
+    "Civil": [
+        "BIM Model for Smart Building",
+        "Earthquake Resistant Design",
+        "Green Building with Sustainable Materials",
+        "Traffic Management System",
+        "Bridge Health Monitoring",
+        "Water Treatment Plant Design"
+    ],
+    "Electronics": [
+        "IoT Home Automation System",
+        "Arduino Weather Station",
+        "PCB Design for Power Supply",
+        "Drone with GPS Navigation",
+        "Digital Oscilloscope",
+        "Smart Energy Meter"
+    ],
+    "Chemical": [
+        "Biodiesel Production from Waste Oil",
+        "Water Purification System",
+        "Plastic Recycling Process",
+        "Chemical Process Simulation",
+        "Nanomaterial Synthesis",
+        "Food Preservation Technology"
+    ],
+    "Aerospace": [
+        "Quadcopter with Autonomous Navigation",
+        "Rocket Propulsion System Design",
+        "Aircraft Wing Design Optimization",
+        "Satellite Communication System",
+        "Drone-based Delivery System",
+        "Aerodynamic Analysis"
+    ],
+}
+
+
+def project_difficulty(project_name):
+    if "AI" in project_name or "Rocket" in project_name:
+        return "Hard"
+    elif "Weather" in project_name or "Website" in project_name:
+        return "Easy"
+    return "Medium"
+
+
+def catalog():
+    """The seed data as loader rows: (branches, companies, courses, projects)."""
+    companies = [
+        {"branch": branch, "name": name}
+        for branch, names in COMPANIES.items() for name in names
+    ]
+    courses = [
+        dict(course, branch=branch)
+        for branch, branch_courses in COURSES.items() for course in branch_courses
+    ]
+    projects = [
+        {"branch": branch, "name": name, "difficulty": project_difficulty(name)}
+        for branch, names in PROJECTS.items() for name in names
+    ]
+    return BRANCHES, companies, courses, projects
@@ -0,0 +1,101 @@
+import re
+from collections import namedtuple
+
+TOKEN_RE = re.compile(r"[a-z0-9+#&]+")
+
+# Whole-word keywords for each chatbot intent
+INTENT_KEYWORDS = {
+    'greeting': ('hi', 'hello', 'hey', 'greetings'),
+    'help': ('help',),
+    'placement': ('placement', 'placements'),
+    'salary': ('salary', 'salaries', 'package', 'packages'),
+    'trends': ('future', 'trend', 'trends', 'growing'),
+    'skills': ('skill', 'skills'),
+    'courses': ('course', 'courses'),
+    'projects': ('project', 'projects'),
+    'compare': ('compare', 'compared', 'comparing', 'comparison', 'vs', 'versus'),
+}
+
+# Branch codes that are also everyday words ("tell me about ...")
+AMBIGUOUS_CODES = {'me', 'it', 'is', 'am', 'an', 'as', 'at', 'be', 'by', 'do', 'go',
+                   'he', 'if', 'in', 'no', 'of', 'on', 'or', 'so', 'to', 'up', 'us', 'we'}
+
+Match = namedtuple('Match', ['intents', 'branch_ids'])
+
+_LEAF = object()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class IntentMatcher:
+    """Single-pass intent and branch matcher over the tokens of a message.
+
+    Intents are looked up per token in a keyword table; branch names and
+    codes live in a token trie, so multi-word names like "computer science"
+    are matched greedily in the same pass.
+    """
+
+    def __init__(self, branches):
+        self.keywords = {}
+        for intent, words in INTENT_KEYWORDS.items():
+            for word in words:
+                self.keywords[word] = intent
+
+        self.trie = {}
+        for branch_id, name, code in branches:
+            self._add(tokenize(name), branch_id)
+            code_tokens = tokenize(code)
+            if len(code_tokens) == 1 and code_tokens[0] not in AMBIGUOUS_CODES:
+                self._add(code_tokens, branch_id)
+
+    def _add(self, tokens, branch_id):
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_LEAF, branch_id)
+
+    def match(self, text):
+        """Return the intents and the mentioned branch ids, in order of mention."""
+        keywords = self.keywords
+        trie = self.trie
+        tokens = TOKEN_RE.findall(text.lower())
+        intents = set()
+        branch_ids = []
+        i, n = 0, len(tokens)
+        while i < n:
+            token = tokens[i]
+            intent = keywords.get(token)
+            if intent:
+                intents.add(intent)
+
+            node = trie.get(token)
+            if node is None:
+                i += 1
+                continue
+
+            # Longest branch name starting at this token
+            found, end = node.get(_LEAF), i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _LEAF in node:
+                    found, end = node[_LEAF], j
+
+            if found is None:
+                i += 1
+                continue
+            if found not in branch_ids:
+                branch_ids.append(found)
+            # Keywords inside a branch name still count as intents
+            for token in tokens[i + 1:end]:
+                if token in keywords:
+                    intents.add(keywords[token])
+            i = end
+        return Match(frozenset(intents), tuple(branch_ids))
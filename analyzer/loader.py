@@ -0,0 +1,89 @@
+import time
+from itertools import islice
+
+from django.db import connection, transaction
+from .chart_cache import invalidate_charts
+from .data_version import bump_data_version
+from .fragment_cache import invalidate_all_fragments
+from .market import refresh_market_summary
+from .models import BranchYearStat, Company, Course, EngineeringBranch, Project
+from .search import rebuild_search_index
+from .yearly_stats import HEADLINE_YEARS, sync_headline_stats
+
+
+class LoadReport:
+    def __init__(self, counts, seconds):
+        self.counts = counts
+        self.seconds = seconds
+
+    @property
+    def rows(self):
+        return sum(self.counts.values())
+
+    def __str__(self):
+        parts = ', '.join(f"{count} {name}" for name, count in self.counts.items())
+        return f"{parts} in {self.seconds:.2f}s"
+
+
+def load_catalog(branches, companies=(), courses=(), projects=(), stats=(), replace=True, batch_size=2000):
+    """Load branches and their companies, courses, projects and yearly stats in one transaction.
+
+    ``companies``, ``courses``, ``projects`` and ``stats`` are iterables of
+    dicts with a ``branch`` key holding the branch *name*; names are resolved
+    to ids with a single query after the branches are inserted. Stats for the
+    headline years come from the branch columns instead. With ``replace`` the
+    existing catalog is wiped first. Nothing is committed unless every row
+    loads.
+    """
+    start = time.perf_counter()
+    with transaction.atomic():
+        if replace:
+            # Plain DELETEs: Model.delete() would fetch every row to send signals
+            for model in (BranchYearStat, Project, Course, Company, EngineeringBranch):
+                delete_all(model)
+
+        counts = {'branches': _bulk_insert(EngineeringBranch, (EngineeringBranch(**row) for row in branches),
+                                           batch_size)}
+        branch_ids = dict(EngineeringBranch.objects.values_list('name', 'id'))
+
+        for name, model, rows in (('companies', Company, companies),
+                                  ('courses', Course, courses),
+                                  ('projects', Project, projects),
+                                  ('yearly stats', BranchYearStat,
+                                   (row for row in stats if row['year'] not in HEADLINE_YEARS))):
+            objs = (model(branch_id=branch_ids[row['branch']],
+                          **{k: v for k, v in row.items() if k != 'branch'})
+                    for row in rows)
+            counts[name] = _bulk_insert(model, objs, batch_size)
+
+        # bulk_create sends no signals: mirror the headline years, re-index and
+        # move the data version in the same transaction, and drop this
+        # process's caches by hand once committed
+        sync_headline_stats(EngineeringBranch.objects.order_by(), batch_size)
+        rebuild_search_index()
+        bump_data_version()
+        invalidate_all_fragments()
+        transaction.on_commit(catalog_changed)
+
+    return LoadReport(counts, time.perf_counter() - start)
+
+
+def catalog_changed():
+    invalidate_charts()
+    refresh_market_summary()
+
+
+def _bulk_insert(model, objs, batch_size):
+    count = 0
+    while True:
+        batch = list(islice(objs, batch_size))
+        if not batch:
+            return count
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        count += len(batch)
+
+
+def delete_all(model):
+    """Empty a table with one DELETE, without fetching rows or sending signals."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
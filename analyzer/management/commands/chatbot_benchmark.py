@@ -0,0 +1,154 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analyzer.data_version import get_data_version
+from analyzer.intents import IntentMatcher
+from analyzer.management.commands.generate_dataset import (
+    generate_branches, generate_companies, generate_courses, generate_projects,
+)
+from analyzer.market import TOP_GROWTH, Leader, MarketSummary
+from analyzer.models import EngineeringBranch
+from analyzer.snapshot import BranchData, CourseData, ProjectData, Snapshot, build_snapshot, get_snapshot
+from analyzer.views import generate_chatbot_response
+
+SAMPLE_MESSAGES = [
+    "hi",
+    "what are the placement rates?",
+    "salary packages for this year",
+    "tell me about computer science",
+    "courses for electronics",
+    "project ideas for civil",
+    "compare cs and mechanical",
+    "which fields are growing in the future",
+    "what skills do chemical engineers need",
+    "is aerospace a good choice",
+    "thanks, this was useful",
+]
+
+# Messages naming synthetic branches, filled with one or two branch names
+SYNTHETIC_MESSAGES = [
+    "tell me about {0}",
+    "courses for {0}",
+    "project ideas for {0}",
+    "what is the salary in {0}",
+    "compare {0} and {1}",
+]
+
+
+class Command(BaseCommand):
+    help = "Measure chatbot messages/sec with the catalog loaded per message and from the shared snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=2000,
+                            help="Messages to answer per measurement")
+        parser.add_argument('--synthetic', type=int, default=0,
+                            help="Answer from this many in-memory branches instead of the database")
+        parser.add_argument('--per-branch', type=int, default=5,
+                            help="Companies, courses and projects per synthetic branch")
+
+    def handle(self, *args, **options):
+        count = options['messages']
+        # The undecorated function: every message is answered, none replayed
+        # from the reply memo
+        generate = generate_chatbot_response.__wrapped__
+
+        if options['synthetic']:
+            start = time.perf_counter()
+            snapshot = self.synthetic_snapshot(options['synthetic'], options['per_branch'])
+            build_ms = (time.perf_counter() - start) * 1000
+            messages = self.synthetic_messages(snapshot, count)
+            self.stdout.write(f"Synthetic branches: {len(snapshot.branches):,} "
+                              f"(snapshot built in {build_ms:,.1f} ms), messages: {count}")
+            self.stdout.write(f"Snapshot + matcher, no memo: "
+                              f"{self.rate(messages, lambda message: generate(message, snapshot)):12,.0f} msg/s")
+            return
+
+        if not EngineeringBranch.objects.exists():
+            raise CommandError("No branches found, load data first (/load-data/) or pass --synthetic")
+        messages = [SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)] for i in range(count)]
+
+        # What every message cost before the snapshot: the catalog read from
+        # the database for each reply
+        version = get_data_version()
+        before = self.rate(messages, lambda message: generate(message, build_snapshot(version)))
+
+        # The snapshot is fetched per message, as the view does
+        get_snapshot()
+        after = self.rate(messages, lambda message: generate(message, get_snapshot()))
+
+        self.stdout.write(f"Branches: {EngineeringBranch.objects.count()}, messages: {count}")
+        self.stdout.write(f"Catalog loaded per message (before): {before:9,.0f} msg/s")
+        self.stdout.write(f"Snapshot + matcher, no memo (after): {after:9,.0f} msg/s "
+                          f"({after / before:.1f}x)")
+
+    def rate(self, messages, answer):
+        start = time.perf_counter()
+        for message in messages:
+            answer(message)
+        return len(messages) / (time.perf_counter() - start)
+
+    def synthetic_messages(self, snapshot, count):
+        rng = random.Random(42)
+        names = [branch.name.lower() for branch in snapshot.branches]
+        messages = []
+        for i in range(count):
+            if i % 2:
+                messages.append(SAMPLE_MESSAGES[i // 2 % len(SAMPLE_MESSAGES)])
+            else:
+                messages.append(rng.choice(SYNTHETIC_MESSAGES).format(rng.choice(names), rng.choice(names)))
+        return messages
+
+    def synthetic_snapshot(self, count, per_branch):
+        rng = random.Random(42)
+        generated = generate_branches(rng, count)
+        names = [branch['name'] for branch in generated]
+        total = count * per_branch
+
+        companies, courses, projects = {}, {}, {}
+        for company in generate_companies(rng, names, total):
+            companies.setdefault(company['branch'], []).append(company['name'])
+        for course in generate_courses(rng, names, total):
+            courses.setdefault(course['branch'], []).append(CourseData(
+                course['name'], course['platform'], course['level'], course['duration'],
+                course['is_free'], course['branch']))
+        for project in generate_projects(rng, names, total):
+            projects.setdefault(project['branch'], []).append(ProjectData(
+                project['name'], project['description'], project['difficulty']))
+
+        branches = tuple(
+            BranchData(
+                id=i, name=b['name'], code=b['code'], description='', icon=b['icon'],
+                placement_2024=b['placement_2024'], placement_2026=b['placement_2026'],
+                salary_2024=b['salary_2024'], future_trends=b['future_trends'],
+                future_skills=b['future_skills'], companies=tuple(companies.get(b['name'], ())),
+                courses=tuple(courses.get(b['name'], ())), projects=tuple(projects.get(b['name'], ())),
+            )
+            for i, b in enumerate(generated, start=1)
+        )
+        return Snapshot(
+            version=0,
+            branches=branches,
+            by_id={branch.id: branch for branch in branches},
+            matcher=IntentMatcher((b.id, b.name, b.code) for b in branches),
+            market=self.synthetic_market(branches),
+        )
+
+    def synthetic_market(self, branches):
+        # compute_market_summary over in-memory branches
+        leaders = [Leader(b.id, b.name, b.code, b.icon, b.placement_2024, b.placement_2026,
+                          b.salary_2024, b.placement_growth()) for b in branches]
+        return MarketSummary(
+            version=0,
+            branch_count=len(leaders),
+            avg_placement=statistics.fmean(leader.placement_2024 for leader in leaders),
+            avg_salary=statistics.fmean(leader.salary_2024 for leader in leaders),
+            max_placement=max(leader.placement_2024 for leader in leaders),
+            max_salary=max(leader.salary_2024 for leader in leaders),
+            max_growth=max(leader.growth for leader in leaders),
+            best_placement=min(leaders, key=lambda leader: (-leader.placement_2024, leader.name)),
+            highest_salary=min(leaders, key=lambda leader: (-leader.salary_2024, leader.name)),
+            top_growth=tuple(sorted(leaders, key=lambda leader: (-leader.growth, leader.name))[:TOP_GROWTH]),
+        )
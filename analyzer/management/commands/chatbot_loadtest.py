@@ -0,0 +1,115 @@
+import asyncio
+import json
+import statistics
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ("Load-test the chatbot API of a running server with many concurrent connections. "
+            "Run it against a sync worker (e.g. gunicorn career_analyzer.wsgi) and an ASGI "
+            "server (e.g. uvicorn career_analyzer.asgi:application) to compare them.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Server base URL")
+        parser.add_argument('--concurrency', type=int, default=100,
+                            help="Connections kept open at the same time")
+        parser.add_argument('--requests', type=int, default=2000, help="Total chat messages to send")
+        parser.add_argument('--message', default='placement rates')
+        parser.add_argument('--timeout', type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        try:
+            report = asyncio.run(run_load_test(**{k: options[k] for k in (
+                'url', 'concurrency', 'requests', 'message', 'timeout')}))
+        except OSError as exc:
+            raise CommandError(f"Could not reach {options['url']}: {exc}")
+
+        latencies = sorted(report['latencies'])
+        self.stdout.write(f"{report['ok']} ok, {report['errors']} errors in {report['elapsed']:.2f}s "
+                          f"at concurrency {options['concurrency']}")
+        self.stdout.write(f"Throughput: {report['ok'] / report['elapsed']:,.1f} req/s")
+        if latencies:
+            self.stdout.write("Latency ms: p50 {:.1f}  p95 {:.1f}  p99 {:.1f}  max {:.1f}".format(
+                percentile(latencies, 50) * 1000, percentile(latencies, 95) * 1000,
+                percentile(latencies, 99) * 1000, latencies[-1] * 1000))
+            self.stdout.write(f"Mean latency: {statistics.mean(latencies) * 1000:.1f} ms")
+
+
+async def run_load_test(url, concurrency, requests, message, timeout):
+    parts = urlsplit(url)
+    host = parts.hostname
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    use_ssl = parts.scheme == 'https'
+    base = parts.path.rstrip('/')
+
+    # The API is CSRF-protected like the chatbot page that calls it
+    status, headers, _ = await http_request(host, port, use_ssl, 'GET', f'{base}/chatbot/', {}, timeout=timeout)
+    cookie = SimpleCookie()
+    for name, value in headers:
+        if name == 'set-cookie':
+            cookie.load(value)
+    if 'csrftoken' not in cookie:
+        raise CommandError(f"No csrftoken cookie from {url}/chatbot/ (status {status})")
+    token = cookie['csrftoken'].value
+
+    body = json.dumps({'message': message}).encode()
+    request_headers = {
+        'Content-Type': 'application/json',
+        'X-CSRFToken': token,
+        'Cookie': f'csrftoken={token}',
+        'Referer': url,
+    }
+    report = {'ok': 0, 'errors': 0, 'latencies': []}
+    remaining = [requests]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            try:
+                status, _, _ = await http_request(host, port, use_ssl, 'POST', f'{base}/api/chatbot/',
+                                                  request_headers, body, timeout)
+            except (OSError, asyncio.TimeoutError):
+                status = None
+            if status == 200:
+                report['ok'] += 1
+                report['latencies'].append(time.perf_counter() - start)
+            else:
+                report['errors'] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report['elapsed'] = time.perf_counter() - start
+    return report
+
+
+async def http_request(host, port, use_ssl, method, path, headers, body=b'', timeout=30.0):
+    """Minimal HTTP/1.1 request over a fresh connection; returns (status, headers, body)."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port, ssl=use_ssl), timeout)
+    try:
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {host}:{port}', 'Connection: close',
+                 f'Content-Length: {len(body)}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+
+    head, _, content = raw.partition(b'\r\n\r\n')
+    head_lines = head.decode('latin-1').split('\r\n')
+    status = int(head_lines[0].split()[1])
+    response_headers = []
+    for line in head_lines[1:]:
+        name, _, value = line.partition(':')
+        response_headers.append((name.strip().lower(), value.strip()))
+    return status, response_headers, content
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
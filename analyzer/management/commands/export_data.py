@@ -0,0 +1,43 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analyzer.exporter import EXPORTS, FORMATS, ExportError, export_chunks, parse_bound
+
+
+class Command(BaseCommand):
+    help = "Stream chatbot feedback or a catalog table as CSV or JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--since', help="Only rows from this date or datetime on (feedback)")
+        parser.add_argument('--until', help="Only rows up to this date (inclusive) or datetime (feedback)")
+        parser.add_argument('--gzip', action='store_true', help="Compress the output")
+        parser.add_argument('-o', '--output', default='-', help="File to write, or - for stdout")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            chunks = export_chunks(options['kind'], options['format'],
+                                   since=parse_bound(options['since']),
+                                   until=parse_bound(options['until'], end=True),
+                                   compress=options['gzip'])
+            if options['output'] == '-':
+                written = self._write(chunks, sys.stdout.buffer)
+            else:
+                with open(options['output'], 'wb') as out:
+                    written = self._write(chunks, out)
+        except (OSError, ExportError) as exc:
+            raise CommandError(str(exc))
+        self.stderr.write(f"Exported {options['kind']}: {written:,} bytes in {time.perf_counter() - start:.2f}s")
+
+    def _write(self, chunks, out):
+        written = 0
+        for chunk in chunks:
+            data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+            out.write(data)
+            written += len(data)
+        out.flush()
+        return written
@@ -0,0 +1,165 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from analyzer.loader import delete_all, load_catalog
+from analyzer.models import UserFeedback
+
+DISCIPLINES = [
+    "Computer Science", "Mechanical", "Civil", "Electronics", "Chemical", "Aerospace",
+    "Electrical", "Biomedical", "Robotics", "Data Science", "Environmental", "Industrial",
+    "Materials", "Mining", "Petroleum", "Marine", "Agricultural", "Textile", "Nuclear",
+    "Instrumentation", "Mechatronics", "Automobile", "Metallurgical", "Production",
+]
+TRENDS = [
+    "AI adoption accelerating", "EV sector boom", "Semiconductor fabs expanding",
+    "Green hydrogen projects", "Smart city rollouts", "Space tech growing",
+    "Drone regulation easing", "5G and 6G deployment", "Cybersecurity demand increasing",
+    "Additive manufacturing growth", "Battery recycling scale-up", "Climate tech funding",
+    "Medical devices demand", "Automation of factories", "Cloud computing expansion",
+]
+SKILLS = [
+    "Python", "MATLAB", "CAD/CAM", "AI/ML", "Embedded Systems", "VLSI", "BIM", "IoT",
+    "Data Analysis", "Thermodynamics", "Cloud Computing", "Robotics", "PLC Programming",
+    "Finite Element Analysis", "Project Management", "Process Optimization", "PCB Design",
+]
+ICONS = ["💻", "🚗", "🏗️", "📱", "⚗️", "✈️", "⚡", "🧬", "🤖", "📊", "🌱", "🏭"]
+COMPANY_WORDS = ["Tata", "Reliance", "Infosys", "Bharat", "Global", "Nova", "Apex", "Vertex",
+                 "Quantum", "Orbit", "Delta", "Sigma", "Zenith", "Prime", "Fusion", "Atlas"]
+COMPANY_SUFFIXES = ["Technologies", "Industries", "Systems", "Labs", "Engineering", "Works"]
+TOPICS = ["Introduction to", "Advanced", "Applied", "Foundations of", "Hands-on", "Practical"]
+PROJECT_KINDS = ["Smart", "Autonomous", "Low-cost", "Solar-powered", "IoT-based", "AI-driven"]
+PROJECT_THINGS = ["Monitoring System", "Controller", "Prototype", "Simulator", "Dashboard",
+                  "Sensor Network", "Test Rig", "Optimizer"]
+QUESTIONS = ["placement rates", "salary packages", "courses for {}", "projects for {}",
+             "tell me about {}", "compare {} and {}", "future trends", "skills for {}", "hi", "help"]
+
+
+class Command(BaseCommand):
+    help = "Replace the database with a deterministic synthetic dataset for profiling"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--branches', type=int, default=500)
+        parser.add_argument('--companies', type=int, default=5000)
+        parser.add_argument('--courses', type=int, default=100000)
+        parser.add_argument('--projects', type=int, default=100000)
+        parser.add_argument('--history-years', type=int, default=6,
+                            help="Years of placement/salary history before 2024 per branch")
+        parser.add_argument('--feedback', type=int, default=5000000)
+        parser.add_argument('--days', type=int, default=365,
+                            help="Spread feedback timestamps over this many past days")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options['branches'] < 1:
+            raise CommandError("--branches must be at least 1")
+        rng = random.Random(options['seed'])
+
+        branches = generate_branches(rng, options['branches'])
+        names = [branch['name'] for branch in branches]
+        report = load_catalog(
+            branches,
+            companies=generate_companies(rng, names, options['companies']),
+            courses=generate_courses(rng, names, options['courses']),
+            projects=generate_projects(rng, names, options['projects']),
+            stats=generate_history(rng, branches, options['history_years']),
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(f"Catalog: {report} ({report.rows / report.seconds:,.0f} rows/s)")
+
+        if options['feedback']:
+            self.load_feedback(rng, names, options['feedback'], options['days'], options['batch_size'])
+
+    def load_feedback(self, rng, names, total, days, batch_size):
+        # Raw executemany: bulk_create would build a model instance per row
+        table = connection.ops.quote_name(UserFeedback._meta.db_table)
+        sql = f"INSERT INTO {table} (user_input, bot_response, timestamp) VALUES (%s, %s, %s)"
+        now = timezone.now()
+        span = days * 86400
+        start = time.perf_counter()
+        written = 0
+        with transaction.atomic():
+            delete_all(UserFeedback)
+            with connection.cursor() as cursor:
+                while written < total:
+                    batch = []
+                    for _ in range(min(batch_size, total - written)):
+                        question = rng.choice(QUESTIONS).format(rng.choice(names), rng.choice(names))
+                        timestamp = now - timedelta(seconds=rng.randrange(span))
+                        batch.append((question.lower(), f"Synthetic answer to: {question}", timestamp))
+                    cursor.executemany(sql, batch)
+                    written += len(batch)
+                    if written % (batch_size * 100) == 0 or written == total:
+                        rate = written / (time.perf_counter() - start)
+                        self.stdout.write(f"  feedback: {written:,}/{total:,} ({rate:,.0f} rows/s)")
+        self.stdout.write(f"Feedback: {written:,} rows in {time.perf_counter() - start:.2f}s")
+
+
+def generate_branches(rng, count):
+    branches = []
+    for i in range(count):
+        discipline = DISCIPLINES[i % len(DISCIPLINES)]
+        cohort = i // len(DISCIPLINES)
+        placement_2024 = rng.randint(45, 95)
+        branches.append({
+            "name": discipline if cohort == 0 else f"{discipline} {cohort + 1}",
+            "code": f"B{i:04d}",
+            "placement_2024": placement_2024,
+            "placement_2026": min(100, placement_2024 + rng.randint(-4, 9)),
+            "salary_2024": round(rng.uniform(3.5, 22.0), 1),
+            "future_trends": ", ".join(rng.sample(TRENDS, 3)),
+            "future_skills": ", ".join(rng.sample(SKILLS, 5)),
+            "icon": rng.choice(ICONS),
+        })
+    return branches
+
+
+def generate_history(rng, branches, years):
+    # A random walk back from each branch's 2024 figures
+    for branch in branches:
+        placement, salary = branch["placement_2024"], branch["salary_2024"]
+        for year in range(2023, 2023 - years, -1):
+            placement = max(20, min(100, placement - rng.randint(-3, 6)))
+            salary = max(2.0, round(salary * rng.uniform(0.88, 1.02), 1))
+            yield {"branch": branch["name"], "year": year, "placement": placement, "salary": salary}
+
+
+def generate_companies(rng, names, count):
+    for i in range(count):
+        name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {i}"
+        yield {"branch": names[i % len(names)], "name": name}
+
+
+def generate_courses(rng, names, count):
+    platforms = ["NPTEL", "Coursera", "edX", "Udemy"]
+    levels = ["Beginner", "Intermediate", "Advanced"]
+    for i in range(count):
+        branch = names[i % len(names)]
+        is_free = rng.random() < 0.6
+        yield {
+            "branch": branch,
+            "name": f"{rng.choice(TOPICS)} {rng.choice(SKILLS)} {i}",
+            "platform": rng.choice(platforms),
+            "level": rng.choice(levels),
+            "duration": f"{rng.randint(4, 16)} weeks",
+            "is_free": is_free,
+            "free_details": "Audit for free" if is_free else "",
+        }
+
+
+def generate_projects(rng, names, count):
+    difficulties = ["Easy", "Medium", "Hard"]
+    for i in range(count):
+        branch = names[i % len(names)]
+        name = f"{rng.choice(PROJECT_KINDS)} {rng.choice(PROJECT_THINGS)} {i}"
+        yield {
+            "branch": branch,
+            "name": name,
+            "description": f"A {branch} project: build a {name.lower()} using {rng.choice(SKILLS)}.",
+            "difficulty": rng.choice(difficulties),
+        }
@@ -0,0 +1,47 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analyzer.importer import FORMATS, SPECS, CatalogImportError, import_file
+
+
+class Command(BaseCommand):
+    help = "Upsert branches, companies, courses or projects from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(SPECS))
+        parser.add_argument('path', help="File to import (.csv, .jsonl, optionally .gz), or - for stdin")
+        parser.add_argument('--format', choices=FORMATS,
+                            help="Needed for stdin; otherwise taken from the file extension")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--strict', action='store_true',
+                            help="Abort the whole import on the first invalid row")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if path == '-' and not options['format']:
+            raise CommandError("--format is required when reading from stdin")
+
+        def progress(report):
+            self.stderr.write(f"  {report.read:,} rows, {report.rows_per_second:,.0f} rows/s", ending='\r')
+
+        try:
+            if path == '-':
+                report = self._import(sys.stdin.buffer, '-', options, progress)
+            else:
+                with open(path, 'rb') as binary:
+                    report = self._import(binary, path, options, progress)
+        except (OSError, CatalogImportError) as exc:
+            raise CommandError(str(exc))
+
+        self.stderr.write('')
+        for line, message in report.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        if report.skipped > len(report.errors):
+            self.stderr.write(f"... and {report.skipped - len(report.errors)} more invalid rows")
+        self.stdout.write(self.style.SUCCESS(f"Imported {options['kind']}: {report}"))
+
+    def _import(self, binary, name, options, progress):
+        return import_file(options['kind'], binary, name, fmt=options['format'],
+                           chunk_size=options['chunk_size'], strict=options['strict'],
+                           progress=progress)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from analyzer import initial_data
+from analyzer.loader import load_catalog
+
+
+class Command(BaseCommand):
+    help = "Replace the catalog with the built-in branches, companies, courses and projects"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        report = load_catalog(*initial_data.catalog(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Loaded {report}"))
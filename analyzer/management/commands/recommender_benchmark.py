@@ -0,0 +1,85 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analyzer import recommender
+from analyzer.management.commands.generate_dataset import (
+    generate_branches, generate_courses, generate_projects,
+)
+
+SAMPLE_QUERIES = [
+    "AI, machine learning and cloud computing",
+    "robotics and embedded systems",
+    "I like drones, rockets and space",
+    "green chemistry and sustainable processes",
+    "smart cities, BIM and project management",
+    "VLSI and PCB design",
+    "python data analysis",
+    "electric vehicles and battery technology",
+]
+
+
+class Command(BaseCommand):
+    help = "Measure TF-IDF index build time and per-query scoring latency of the recommender"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=5000,
+                            help="Queries to score per measurement")
+        parser.add_argument('--synthetic', type=int, default=0,
+                            help="Build the index from this many in-memory branches instead of the database")
+        parser.add_argument('--per-branch', type=int, default=20,
+                            help="Courses and projects per synthetic branch")
+        parser.add_argument('-k', type=int, default=recommender.DEFAULT_K)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['synthetic']:
+            index = self.synthetic_index(options['synthetic'], options['per_branch'])
+        else:
+            index = recommender.get_index()
+        build_ms = (time.perf_counter() - start) * 1000
+        if not len(index.ids):
+            raise CommandError("Nothing to index, load data first (/load-data/) or pass --synthetic")
+
+        branches, courses, projects = (int(n) for n in index.offsets[1:] - index.offsets[:-1])
+        self.stdout.write(f"Index: {branches:,} branches, {courses:,} courses, {projects:,} projects, "
+                          f"{len(index.vocabulary):,} terms, {len(index.data):,} non-zeros, "
+                          f"built in {build_ms:,.1f} ms")
+
+        queries = [SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] for i in range(options['queries'])]
+        vectors = [recommender.query_vector(index, query) for query in queries]
+
+        timings = []
+        for terms, weights in vectors:
+            start = time.perf_counter()
+            recommender.score(index, terms, weights)
+            timings.append(time.perf_counter() - start)
+        self.report("Scoring (matrix-vector product)", timings)
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            recommender.recommend(query, options['k'], index=index)
+            timings.append(time.perf_counter() - start)
+        self.report(f"recommend() end to end, top {options['k']}", timings)
+
+    def report(self, label, timings):
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(f"{label}: median {statistics.median(timings) * 1000:.3f} ms, "
+                          f"p99 {p99 * 1000:.3f} ms")
+
+    def synthetic_index(self, count, per_branch):
+        rng = random.Random(42)
+        branches = generate_branches(rng, count)
+        names = [branch['name'] for branch in branches]
+        ids = {name: i for i, name in enumerate(names, start=1)}
+        branch_rows = [(ids[b['name']], b['name'], b['code'], '', b['future_trends'], b['future_skills'])
+                       for b in branches]
+        course_rows = [(i, ids[c['branch']], c['name'], c['platform'], c['level'])
+                       for i, c in enumerate(generate_courses(rng, names, count * per_branch), start=1)]
+        project_rows = [(i, ids[p['branch']], p['name'], p['description'], p['difficulty'])
+                        for i, p in enumerate(generate_projects(rng, names, count * per_branch), start=1)]
+        return recommender.build_index(0, branch_rows, course_rows, project_rows)
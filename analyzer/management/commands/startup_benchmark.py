@@ -0,0 +1,109 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Separates Django's own startup imports from the ones made by the module
+MARKER = '--- startup_benchmark: importing module ---'
+
+# Run in a fresh interpreter so nothing is already imported
+CHILD_SCRIPT = """
+import json, os, resource, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', {settings_module!r})
+import django
+django.setup()
+
+def rss_kb():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+rss_before = rss_kb()
+sys.stderr.write({marker!r} + '\\n')
+sys.stderr.flush()
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'import_ms': elapsed * 1000,
+    'rss_kb': rss_kb(),
+    'rss_delta_kb': rss_kb() - rss_before,
+    'heavy_modules': sorted(m for m in ('matplotlib', 'numpy') if m in sys.modules),
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure the import time and memory cost of analyzer.views in a fresh process"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='analyzer.views')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10,
+                            help="Slowest imports to list from -X importtime")
+        parser.add_argument('--json', action='store_true', help="Print a JSON report")
+
+    def handle(self, *args, **options):
+        module = options['module']
+        script = CHILD_SCRIPT.format(settings_module=settings.SETTINGS_MODULE, module=module,
+                                     marker=MARKER)
+
+        runs = []
+        importtime = ''
+        for _ in range(max(options['repeat'], 1)):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', script],
+                capture_output=True, text=True, cwd=settings.BASE_DIR,
+            )
+            if result.returncode != 0:
+                self.stderr.write(result.stderr)
+                return
+            runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+            importtime = result.stderr
+
+        report = {
+            'module': module,
+            'runs': len(runs),
+            'import_ms_median': statistics.median(r['import_ms'] for r in runs),
+            'import_ms_min': min(r['import_ms'] for r in runs),
+            'rss_kb': runs[-1]['rss_kb'],
+            'rss_delta_kb': runs[-1]['rss_delta_kb'],
+            'heavy_modules': runs[-1]['heavy_modules'],
+            'slowest_imports': parse_importtime(importtime)[:options['top']],
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{module}: {report['import_ms_median']:.1f} ms median "
+                          f"({report['import_ms_min']:.1f} ms best of {report['runs']})")
+        self.stdout.write(f"RSS after import: {report['rss_kb'] / 1024:.1f} MiB "
+                          f"(+{report['rss_delta_kb'] / 1024:.1f} MiB)")
+        heavy = ', '.join(report['heavy_modules']) or 'none'
+        self.stdout.write(f"Heavy modules loaded: {heavy}")
+        self.stdout.write(f"Slowest imports triggered by {module} (cumulative):")
+        for name, cumulative_us in report['slowest_imports']:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+def parse_importtime(output):
+    """Return ``[(module, cumulative_us)]`` from ``-X importtime`` output, slowest first.
+
+    Only imports made after the marker line, i.e. by the benchmarked module, count.
+    """
+    imports = []
+    lines = output.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    for line in lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(cumulative)))
+    return sorted(imports, key=lambda item: item[1], reverse=True)
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Max
+
+from .data_version import get_data_version
+from .models import EngineeringBranch
+
+MARKET_SUMMARY_KEY = 'analyzer:market_summary'
+
+# Fastest growing branches kept in the summary
+TOP_GROWTH = 3
+
+LEADER_FIELDS = ['id', 'name', 'code', 'icon', 'placement_2024', 'placement_2026', 'salary_2024', 'growth']
+
+MarketSummary = namedtuple('MarketSummary', [
+    'version', 'branch_count', 'avg_placement', 'avg_salary', 'max_placement', 'max_salary',
+    'max_growth', 'best_placement', 'highest_salary', 'top_growth',
+])
+
+
+class Leader(namedtuple('Leader', LEADER_FIELDS)):
+    __slots__ = ()
+
+    def placement_growth(self):
+        return self.growth
+
+    def __str__(self):
+        return self.name
+
+
+def compute_market_summary(version):
+    """Leaderboard and averages for every branch, computed in the database."""
+    branches = EngineeringBranch.objects.annotate(growth=F('placement_2026') - F('placement_2024'))
+    totals = branches.aggregate(
+        branch_count=Count('id'),
+        avg_placement=Avg('placement_2024'),
+        avg_salary=Avg('salary_2024'),
+        max_placement=Max('placement_2024'),
+        max_salary=Max('salary_2024'),
+        max_growth=Max('growth'),
+    )
+
+    def leaders(*ordering, limit=1):
+        return [Leader(*row) for row in branches.order_by(*ordering).values_list(*LEADER_FIELDS)[:limit]]
+
+    best_placement = leaders('-placement_2024', 'name')
+    highest_salary = leaders('-salary_2024', 'name')
+    return MarketSummary(
+        version=version,
+        best_placement=best_placement[0] if best_placement else None,
+        highest_salary=highest_salary[0] if highest_salary else None,
+        top_growth=tuple(leaders('-growth', 'name', limit=TOP_GROWTH)),
+        **totals,
+    )
+
+
+def get_market_summary():
+    """The materialized market summary for the current data version.
+
+    Normally already refreshed by ``refresh_market_summary()`` when a branch
+    changed, so a page reads the version row and one cache entry.
+    """
+    version = get_data_version()
+    summary = cache.get(MARKET_SUMMARY_KEY)
+    if summary is None or summary.version != version:
+        summary = compute_market_summary(version)
+        cache.set(MARKET_SUMMARY_KEY, summary, timeout=None)
+    return summary
+
+
+def refresh_market_summary():
+    """Recompute the summary now instead of on the next request. Run after commit."""
+    summary = compute_market_summary(get_data_version())
+    cache.set(MARKET_SUMMARY_KEY, summary, timeout=None)
+    return summary
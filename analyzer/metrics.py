@@ -0,0 +1,163 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from django.template.backends.django import DjangoTemplates
+
+# Upper bounds (seconds) of the per-route histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Timings collected for the request being handled. A context variable, so it
+# follows the request into sync_to_async threads and back.
+_current = contextvars.ContextVar('analyzer_request_metrics', default=None)
+
+_histograms = {}
+_counters = {}
+_lock = threading.Lock()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.timings = {'sql': 0.0, 'template': 0.0, 'chart': 0.0, 'chatbot': 0.0}
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def server_timing(self):
+        """Value for the ``Server-Timing`` response header."""
+        parts = [f'sql;dur={self.timings["sql"] * 1000:.2f};desc="{self.sql_count} queries"']
+        parts += [f'{name};dur={seconds * 1000:.2f}'
+                  for name, seconds in self.timings.items() if name != 'sql' and seconds]
+        parts.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(parts)
+
+
+def begin_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name`` timing."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - start)
+
+
+def sql_timer(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook counting and timing queries."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add('sql', time.perf_counter() - start)
+        metrics.sql_count += 1
+
+
+def install_sql_timer(sender, connection, **kwargs):
+    # connection_created receiver: every connection (one per thread) gets the hook
+    if sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_timer)
+
+
+def record(route, metrics):
+    """Fold one finished request into the per-route histograms."""
+    observations = {
+        'request_duration_seconds': metrics.total,
+        'sql_duration_seconds': metrics.timings['sql'],
+        'template_duration_seconds': metrics.timings['template'],
+        'chart_duration_seconds': metrics.timings['chart'],
+        'chatbot_duration_seconds': metrics.timings['chatbot'],
+    }
+    with _lock:
+        for name, value in observations.items():
+            histogram = _histograms.setdefault((name, route), [[0] * len(BUCKETS), 0, 0.0])
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += 1
+            histogram[2] += value
+        _counters[('sql_queries_total', route)] = _counters.get(('sql_queries_total', route), 0) \
+            + metrics.sql_count
+
+
+def render_prometheus(gauges=None):
+    """All collected metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        histograms = {key: (list(h[0]), h[1], h[2]) for key, h in _histograms.items()}
+        counters = dict(_counters)
+
+    for name in sorted({name for name, _ in histograms}):
+        lines.append(f'# TYPE analyzer_{name} histogram')
+        for (metric, route), (buckets, count, total) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            label = f'route="{_escape(route)}"'
+            for bound, bucket_count in zip(BUCKETS, buckets):
+                lines.append(f'analyzer_{name}_bucket{{{label},le="{bound}"}} {bucket_count}')
+            lines.append(f'analyzer_{name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'analyzer_{name}_sum{{{label}}} {total:.6f}')
+            lines.append(f'analyzer_{name}_count{{{label}}} {count}')
+
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f'# TYPE analyzer_{name} counter')
+        for (metric, route), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'analyzer_{name}{{route="{_escape(route)}"}} {value}')
+
+    for group, values in sorted((gauges or {}).items()):
+        for key, value in sorted(values.items()):
+            lines.append(f'# TYPE analyzer_{group}_{key} gauge')
+            lines.append(f'analyzer_{group}_{key} {value}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class TimedTemplate:
+    """Wraps a backend template so rendering counts towards the request's timings."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return self.template.render(context, request)
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render time recorded per request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
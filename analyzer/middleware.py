@@ -0,0 +1,45 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .metrics import begin_request, end_request, record
+
+
+class PerformanceMiddleware:
+    """Times SQL, templates, charts and chatbot logic for every analyzer view.
+
+    Adds a ``Server-Timing`` header to the response and feeds the per-route
+    histograms served at ``/metrics``. Works for sync and async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token = begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = begin_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        match = getattr(request, 'resolver_match', None)
+        if match is None or not match.func.__module__.startswith('analyzer.') or match.url_name == 'metrics':
+            return response
+        record(match.url_name or match.route, metrics)
+        response['Server-Timing'] = metrics.server_timing()
+        return response
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['branch', 'name'], name='company_branch_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['branch', 'platform', 'name'], name='course_branch_platform_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['branch', 'name'], name='project_branch_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['branch', 'difficulty', 'name'], name='project_branch_diff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userfeedback',
+            index=models.Index(fields=['timestamp'], name='feedback_timestamp_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# Kept in the migration rather than imported from analyzer.search, so later
+# changes to the app can't change what this migration does.
+CREATE_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS analyzer_search USING fts5(
+        kind UNINDEXED, object_id UNINDEXED, branch_id UNINDEXED, title, body,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+"""
+
+# Index whatever the catalog already holds; rowid = id * 4 + kind position
+BACKFILL_SQL = (
+    "INSERT INTO analyzer_search (rowid, kind, object_id, branch_id, title, body) "
+    "SELECT id * 4 + 0, 'branch', id, id, name, "
+    "code || ' ' || description || ' ' || future_trends || ' ' || future_skills "
+    "FROM analyzer_engineeringbranch",
+    "INSERT INTO analyzer_search (rowid, kind, object_id, branch_id, title, body) "
+    "SELECT id * 4 + 1, 'company', id, branch_id, name, description "
+    "FROM analyzer_company",
+    "INSERT INTO analyzer_search (rowid, kind, object_id, branch_id, title, body) "
+    "SELECT id * 4 + 2, 'course', id, branch_id, name, platform || ' ' || level "
+    "FROM analyzer_course",
+    "INSERT INTO analyzer_search (rowid, kind, object_id, branch_id, title, body) "
+    "SELECT id * 4 + 3, 'project', id, branch_id, name, difficulty || ' ' || description "
+    "FROM analyzer_project",
+)
+
+
+def create_index(apps, schema_editor):
+    # FTS5 is SQLite only; other databases run without search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        for sql in BACKFILL_SQL:
+            cursor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP TABLE IF EXISTS analyzer_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0002_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
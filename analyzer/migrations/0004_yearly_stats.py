@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_headline_years(apps, schema_editor):
+    # Seed the table from the branch columns it replaces for analytics
+    EngineeringBranch = apps.get_model('analyzer', 'EngineeringBranch')
+    BranchYearStat = apps.get_model('analyzer', 'BranchYearStat')
+    stats = []
+    for branch_id, placement_2024, placement_2026, salary_2024 in EngineeringBranch.objects.values_list(
+            'id', 'placement_2024', 'placement_2026', 'salary_2024'):
+        stats.append(BranchYearStat(branch_id=branch_id, year=2024, placement=placement_2024, salary=salary_2024))
+        stats.append(BranchYearStat(branch_id=branch_id, year=2026, placement=placement_2026))
+    BranchYearStat.objects.bulk_create(stats, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BranchYearStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('placement', models.IntegerField(blank=True, null=True)),
+                ('salary', models.FloatField(blank=True, null=True)),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='yearly_stats', to='analyzer.engineeringbranch')),
+            ],
+            options={
+                'ordering': ['branch_id', 'year'],
+                'unique_together': {('branch', 'year')},
+            },
+        ),
+        migrations.RunPython(copy_headline_years, migrations.RunPython.noop),
+    ]
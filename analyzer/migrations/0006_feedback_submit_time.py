@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:09
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0005_catalog_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userfeedback',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
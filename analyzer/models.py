@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class EngineeringBranch(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -22,6 +23,20 @@ class EngineeringBranch(models.Model):
     def placement_growth(self):
         return self.placement_2026 - self.placement_2024
 
+class BranchYearStat(models.Model):
+    """Placement rate and average salary of one branch in one year."""
+    branch = models.ForeignKey(EngineeringBranch, on_delete=models.CASCADE, related_name='yearly_stats')
+    year = models.PositiveSmallIntegerField()
+    placement = models.IntegerField(null=True, blank=True)
+    salary = models.FloatField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['branch_id', 'year']
+        unique_together = ['branch', 'year']
+    
+    def __str__(self):
+        return f"{self.branch} {self.year}"
+
 class Company(models.Model):
     name = models.CharField(max_length=200)
     branch = models.ForeignKey(EngineeringBranch, on_delete=models.CASCADE, related_name='companies')
@@ -31,6 +46,9 @@ class Company(models.Model):
     class Meta:
         ordering = ['name']
         unique_together = ['name', 'branch']
+        indexes = [
+            models.Index(fields=['branch', 'name'], name='company_branch_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name}"
@@ -59,6 +77,9 @@ class Course(models.Model):
     
     class Meta:
         ordering = ['branch', 'platform', 'name']
+        indexes = [
+            models.Index(fields=['branch', 'platform', 'name'], name='course_branch_platform_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -75,6 +96,10 @@ class Project(models.Model):
     
     class Meta:
         ordering = ['branch', 'name']
+        indexes = [
+            models.Index(fields=['branch', 'name'], name='project_branch_name_idx'),
+            models.Index(fields=['branch', 'difficulty', 'name'], name='project_branch_diff_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -82,10 +107,25 @@ class Project(models.Model):
 class UserFeedback(models.Model):
     user_input = models.TextField()
     bot_response = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: the feedback writer sets the submit time and
+    # bulk_create would overwrite it with the flush time
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='feedback_timestamp_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_input[:50]}..."
+
+
+class CatalogVersion(models.Model):
+    # Bumped in the same transaction as every catalog write, so caches in
+    # every process can tell when the data behind them moved
+    scope = models.CharField(max_length=64, primary_key=True)
+    version = models.BigIntegerField()
     
     def __str__(self):
-        return f"{self.user_input[:50]}..."
\ No newline at end of file
+        return f"{self.scope} {self.version}"
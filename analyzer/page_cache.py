@@ -0,0 +1,117 @@
+"""Whole-page cache for the read-only analyzer views.
+
+These pages are a pure function of the catalog and the query string, so a
+rendered response is stored under its path and query plus the data version
+and replayed, with one query for that version and no template rendering,
+until the catalog changes. The version is shared by every process, so a
+write from another worker or a management command expires the page too.
+Every page carries an ETag and Last-Modified, so browsers revalidate it
+with a 304.
+
+Only pages that are the same for every visitor are stored: not one whose
+render used the CSRF token, set a cookie, read the session or varies on a
+header. A request with pending flash messages bypasses the cache, so they
+are shown once, in a freshly rendered page.
+"""
+import hashlib
+import threading
+import time
+from collections import namedtuple
+from functools import wraps
+
+from django.contrib import messages
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .data_version import get_data_version
+
+PAGE_CACHE_ALIAS = 'pages'
+
+CachedPage = namedtuple('CachedPage', ['content', 'content_type', 'etag', 'last_modified'])
+
+_stats = {'hits': 0, 'misses': 0, 'bypasses': 0, 'not_modified': 0}
+_lock = threading.Lock()
+
+
+def page_cache():
+    return caches[PAGE_CACHE_ALIAS]
+
+
+def page_key(request, version):
+    digest = hashlib.sha1(request.get_full_path().encode()).hexdigest()
+    return f'analyzer:page:{version}:{digest}'
+
+
+def has_pending_messages(request):
+    # len() loads the messages without marking them as shown
+    return len(messages.get_messages(request)) > 0
+
+
+def is_shared(request, response):
+    """Whether ``response`` is the same for every visitor, so it may be stored."""
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    cache_control = response.get('Cache-Control', '')
+    if response.has_header('Vary') or 'private' in cache_control or 'no-store' in cache_control:
+        return False
+    # The page embeds this visitor's CSRF token
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        return False
+    session = getattr(request, 'session', None)
+    return session is None or not session.accessed
+
+
+def cached_page(view):
+    """Serve ``view`` from the page cache, with ETag / Last-Modified revalidation."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or has_pending_messages(request):
+            _count('bypasses')
+            return view(request, *args, **kwargs)
+
+        cache = page_cache()
+        version = get_data_version()
+        key = page_key(request, version)
+        page = cache.get(key)
+        if page is None:
+            response = view(request, *args, **kwargs)
+            if not is_shared(request, response):
+                _count('bypasses')
+                return response
+            _count('misses')
+            page = CachedPage(
+                content=response.content,
+                content_type=response['Content-Type'],
+                etag=f'"page-{version}-{key[-12:]}"',
+                last_modified=int(time.time()),
+            )
+            cache.set(key, page)
+        else:
+            _count('hits')
+
+        response = HttpResponse(page.content, content_type=page.content_type)
+        response['ETag'] = page.etag
+        response['Last-Modified'] = http_date(page.last_modified)
+        # Browsers keep the page but revalidate it on every view
+        patch_cache_control(response, no_cache=True)
+        conditional = get_conditional_response(request, etag=page.etag, last_modified=page.last_modified,
+                                               response=response)
+        if conditional is not response:
+            _count('not_modified')
+        return conditional
+    return wrapper
+
+
+def page_cache_stats():
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
@@ -0,0 +1,137 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of a keyset (seek) paginated queryset."""
+
+    def __init__(self, items, next_cursor, previous_cursor, page_size):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.page_size = page_size
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Cursor values for ``ordering``, or None if missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    for field, value in zip(ordering, values):
+        # A forged value of the wrong type would otherwise fail inside the query;
+        # cursors we issue already hold each field's own type
+        try:
+            if value is None or model._meta.get_field(field).to_python(value) != value:
+                return None
+        except (ValidationError, TypeError, ValueError):
+            return None
+    return values
+
+
+def page_size_from(request):
+    default = getattr(settings, 'CATALOG_PAGE_SIZE', 24)
+    maximum = getattr(settings, 'CATALOG_MAX_PAGE_SIZE', 100)
+    try:
+        size = int(request.GET.get('page_size', default))
+    except ValueError:
+        size = default
+    return max(1, min(size, maximum))
+
+
+def page_queries(request, page):
+    """Query strings for the previous and next pages (None past either end).
+
+    The other parameters (filters, ``page_size``) are kept; only the cursor
+    changes.
+    """
+    def query(param, cursor):
+        if cursor is None:
+            return None
+        params = request.GET.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[param] = cursor
+        return params.urlencode()
+
+    return query('before', page.previous_cursor), query('after', page.next_cursor)
+
+
+def keyset_paginate(queryset, ordering, after=None, before=None, page_size=24):
+    """Seek to the page after (or before) a cursor without OFFSET.
+
+    ``ordering`` is a tuple of ascending field names that must end in a
+    unique field (``'id'``), so every row has a distinct position. Each page
+    costs one indexed range scan of ``page_size + 1`` rows no matter how deep
+    it is.
+    """
+    backwards = False
+    cursor = decode_cursor(after, queryset.model, ordering)
+    if cursor is None:
+        cursor = decode_cursor(before, queryset.model, ordering)
+        backwards = cursor is not None
+
+    if backwards:
+        queryset = queryset.order_by(*(f'-{field}' for field in ordering))
+    else:
+        queryset = queryset.order_by(*ordering)
+    if cursor is not None:
+        queryset = queryset.filter(_seek(ordering, cursor, 'lt' if backwards else 'gt'))
+
+    rows = list(queryset[:page_size + 1])
+    more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    def key(row):
+        return encode_cursor([getattr(row, field) for field in ordering])
+
+    if not rows:
+        return KeysetPage(rows, None, None, page_size)
+    if backwards:
+        next_cursor = key(rows[-1])
+        previous_cursor = key(rows[0]) if more else None
+    else:
+        next_cursor = key(rows[-1]) if more else None
+        previous_cursor = key(rows[0]) if cursor is not None else None
+    return KeysetPage(rows, next_cursor, previous_cursor, page_size)
+
+
+def _seek(ordering, values, lookup):
+    # (a, b, c) > (x, y, z)  ==  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+    clauses = []
+    for i, field in enumerate(ordering):
+        equal = {f: v for f, v in zip(ordering[:i], values[:i])}
+        clauses.append(Q(**equal, **{f'{field}__{lookup}': values[i]}))
+    return reduce(or_, clauses)
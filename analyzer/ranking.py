@@ -0,0 +1,112 @@
+"""Weighted scoring and ranking of engineering branches.
+
+Branch metrics are held in one NumPy matrix per data version, so scoring
+any number of branches is a single matrix-vector product.
+"""
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+
+from .data_version import VersionedValue
+from .models import EngineeringBranch
+
+# Columns of the metric matrix, in order
+METRICS = ('placement_2024', 'placement_2026', 'salary_2024', 'growth')
+
+# The original compare formula: placement_2024 + salary_2024 * 8
+DEFAULT_WEIGHTS = {'placement_2024': 1.0, 'salary_2024': 8.0}
+
+BranchMatrix = namedtuple('BranchMatrix', ['version', 'ids', 'names', 'values', 'positions'])
+Ranked = namedtuple('Ranked', ['rank', 'id', 'name', 'score'] + list(METRICS))
+
+def build_matrix(version, rows):
+    """Matrix from ``(id, name, placement_2024, placement_2026, salary_2024)`` rows."""
+    rows = sorted(rows, key=lambda row: row[1])
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    values = np.zeros((len(rows), len(METRICS)))
+    if rows:
+        values[:, :3] = np.array([row[2:] for row in rows], dtype=float)
+        values[:, 3] = values[:, 1] - values[:, 0]
+    return BranchMatrix(
+        version=version,
+        ids=ids,
+        names=[row[1] for row in rows],
+        values=values,
+        positions={branch_id: i for i, branch_id in enumerate(ids.tolist())},
+    )
+
+
+def _load_matrix(version, snapshot):
+    if snapshot is not None:
+        rows = [(b.id, b.name, b.placement_2024, b.placement_2026, b.salary_2024)
+                for b in snapshot.branches]
+    else:
+        rows = EngineeringBranch.objects.values_list(
+            'id', 'name', 'placement_2024', 'placement_2026', 'salary_2024')
+    return build_matrix(version, rows)
+
+
+_matrices = VersionedValue(_load_matrix)
+
+
+def get_matrix(snapshot=None):
+    """Metric matrix for the current data version, rebuilt when it moves.
+
+    Given a catalog snapshot the matrix is built from it instead of the
+    database, so async code holding a snapshot can rank without queries.
+    """
+    return _matrices.get(snapshot.version if snapshot is not None else None, snapshot)
+
+
+def default_weights():
+    return dict(getattr(settings, 'BRANCH_RANKING_WEIGHTS', DEFAULT_WEIGHTS))
+
+
+def weight_vector(weights):
+    return np.array([float(weights.get(metric, 0.0)) for metric in METRICS])
+
+
+def rank_branches(weights=None, branch_ids=None, k=None, snapshot=None):
+    """Branches ordered by weighted score, best first.
+
+    ``weights`` maps metric names to weights (defaults to the
+    ``BRANCH_RANKING_WEIGHTS`` setting); ``branch_ids`` limits the ranking to
+    those branches and ``k`` keeps only the top ``k``. Ties keep name order.
+    """
+    matrix = get_matrix(snapshot)
+    rows = np.arange(len(matrix.ids))
+    if branch_ids is not None:
+        rows = np.array(sorted({matrix.positions[i] for i in branch_ids if i in matrix.positions}),
+                        dtype=np.int64)
+
+    scores = matrix.values[rows] @ weight_vector(weights if weights is not None else default_weights())
+    if k is not None and 0 < k < len(rows):
+        # Only scores tied with or above the k-th best need a full sort
+        kth = np.partition(-scores, k - 1)[k - 1]
+        top = np.flatnonzero(-scores <= kth)
+        order = top[np.lexsort((rows[top], -scores[top]))][:k]
+    else:
+        order = np.lexsort((rows, -scores))
+
+    return [
+        Ranked(rank, int(matrix.ids[rows[i]]), matrix.names[rows[i]], float(scores[i]),
+               *matrix.values[rows[i]].tolist())
+        for rank, i in enumerate(order, start=1)
+    ]
+
+
+def parse_weights(params, prefix='w_'):
+    """Weights from ``w_<metric>`` request parameters, over the defaults."""
+    weights = default_weights()
+    for metric in METRICS:
+        value = params.get(prefix + metric)
+        if value in (None, ''):
+            continue
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        if np.isfinite(weight):
+            weights[metric] = weight
+    return weights
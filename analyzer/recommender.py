@@ -0,0 +1,182 @@
+"""TF-IDF recommendations of branches, courses and projects for free text.
+
+Every branch, course and project is one row of a sparse TF-IDF matrix built
+once per data version. A branch's document is its skills, trends and
+description plus the names of its courses and projects. Rows are
+L2-normalised, so a query's scores are the cosine similarities: a single
+sparse matrix-vector product. The matrix is held column-wise (CSC) in plain
+NumPy arrays, which makes that product a ``bincount`` over the postings of
+the query's few terms.
+"""
+import re
+from collections import Counter, defaultdict, namedtuple
+
+import numpy as np
+
+from .data_version import VersionedValue
+from .models import Course, EngineeringBranch, Project
+
+# Rows of each kind are stored together, in this order
+KINDS = ('branch', 'course', 'project')
+
+# Results per kind
+DEFAULT_K = 5
+MAX_K = 50
+
+WORD_RE = re.compile(r'\w+')
+
+# Too common in the catalog (or in "I like..." sentences) to tell documents apart
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from i in into is it its like love me my of on or the to
+    want with will work working
+""".split())
+
+Match = namedtuple('Match', ['kind', 'id', 'branch_id', 'title', 'detail', 'score'])
+Recommendation = namedtuple('Recommendation', ['branches', 'courses', 'projects'])
+
+# CSC layout: rows of term t are indices[indptr[t]:indptr[t + 1]], weights in data
+TfidfIndex = namedtuple('TfidfIndex', [
+    'version', 'vocabulary', 'idf', 'indptr', 'indices', 'data', 'offsets',
+    'ids', 'branch_ids', 'titles', 'details',
+])
+
+def tokenize(text):
+    words = []
+    for word in WORD_RE.findall(text.lower()):
+        if word in STOP_WORDS or len(word) < 2:
+            continue
+        # Fold plain plurals, so "drones" finds "Drone Tech"
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def build_index(version, branches, courses, projects):
+    """Index from ``(id, name, code, description, future_trends, future_skills)`` branch
+    rows, ``(id, branch_id, name, platform, level)`` course rows and
+    ``(id, branch_id, name, description, difficulty)`` project rows."""
+    branches, courses, projects = list(branches), list(courses), list(projects)
+
+    # Branch documents also carry their courses' and projects' names
+    extra = defaultdict(list)
+    for row in courses:
+        extra[row[1]].append(row[2])
+    for row in projects:
+        extra[row[1]].append(row[2])
+
+    documents, ids, branch_ids, titles, details = [], [], [], [], []
+    for branch_id, name, code, description, trends, skills in branches:
+        documents.append(' '.join([name, code, description, trends, skills, *extra[branch_id]]))
+        ids.append(branch_id)
+        branch_ids.append(branch_id)
+        titles.append(name)
+        details.append(skills)
+    for course_id, branch_id, name, platform, level in courses:
+        documents.append(f'{name} {platform} {level}')
+        ids.append(course_id)
+        branch_ids.append(branch_id)
+        titles.append(name)
+        details.append(f'{platform} · {level}')
+    for project_id, branch_id, name, description, difficulty in projects:
+        documents.append(f'{name} {description}')
+        ids.append(project_id)
+        branch_ids.append(branch_id)
+        titles.append(name)
+        details.append(difficulty)
+    offsets = np.cumsum([0, len(branches), len(courses), len(projects)])
+
+    # Term counts as COO triplets
+    vocabulary = {}
+    rows, terms, counts = [], [], []
+    for row, document in enumerate(documents):
+        for word, count in Counter(tokenize(document)).items():
+            rows.append(row)
+            terms.append(vocabulary.setdefault(word, len(vocabulary)))
+            counts.append(count)
+    rows = np.array(rows, dtype=np.int32)
+    terms = np.array(terms, dtype=np.int32)
+    counts = np.array(counts, dtype=float)
+
+    # Sublinear tf, smoothed idf, unit-length rows
+    idf = np.log((1 + len(documents)) / (1 + np.bincount(terms, minlength=len(vocabulary)))) + 1
+    data = (1 + np.log(counts)) * idf[terms]
+    norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(documents)))
+    data /= norms[rows]
+
+    order = np.argsort(terms, kind='stable')
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(terms, minlength=len(vocabulary)))))
+    return TfidfIndex(
+        version=version,
+        vocabulary=vocabulary,
+        idf=idf,
+        indptr=indptr,
+        indices=rows[order],
+        data=data[order],
+        offsets=offsets,
+        ids=np.array(ids, dtype=np.int64),
+        branch_ids=np.array(branch_ids, dtype=np.int64),
+        titles=titles,
+        details=details,
+    )
+
+
+def _load_index(version):
+    return build_index(
+        version,
+        EngineeringBranch.objects.order_by('id').values_list(
+            'id', 'name', 'code', 'description', 'future_trends', 'future_skills'),
+        Course.objects.order_by('id').values_list('id', 'branch_id', 'name', 'platform', 'level'),
+        Project.objects.order_by('id').values_list('id', 'branch_id', 'name', 'description', 'difficulty'),
+    )
+
+
+_indexes = VersionedValue(_load_index)
+
+
+def get_index():
+    """The TF-IDF index for the current data version, rebuilt only when it moves."""
+    return _indexes.get()
+
+
+def query_vector(index, text):
+    """``(term ids, weights)`` of the unit-length TF-IDF vector of ``text``."""
+    counts = Counter(index.vocabulary[word] for word in tokenize(text) if word in index.vocabulary)
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    terms = np.fromiter(counts, dtype=np.int64, count=len(counts))
+    weights = (1 + np.log(np.fromiter(counts.values(), dtype=float, count=len(counts)))) * index.idf[terms]
+    return terms, weights / np.sqrt(weights @ weights)
+
+
+def score(index, terms, weights):
+    """Cosine similarity of every row with the query: the matrix-vector product."""
+    if not len(terms):
+        return np.zeros(len(index.ids))
+    # Contiguous slices of each term's postings: no fancy-index gathers
+    spans = list(zip(index.indptr[terms].tolist(), index.indptr[terms + 1].tolist(), weights.tolist()))
+    rows = np.concatenate([index.indices[start:end] for start, end, _ in spans])
+    values = np.concatenate([index.data[start:end] * weight for start, end, weight in spans])
+    return np.bincount(rows, weights=values, minlength=len(index.ids))
+
+
+def top_k(index, scores, kind, k):
+    """Best ``k`` matching rows of one kind, best first; ties keep row order."""
+    position = KINDS.index(kind)
+    start, end = int(index.offsets[position]), int(index.offsets[position + 1])
+    rows = start + np.flatnonzero(scores[start:end] > 0)
+    if len(rows) > k:
+        # Only rows tied with or above the k-th best need a full sort
+        kth = np.partition(-scores[rows], k - 1)[k - 1]
+        rows = rows[-scores[rows] <= kth]
+    rows = rows[np.lexsort((rows, -scores[rows]))][:k]
+    return [Match(kind, int(index.ids[row]), int(index.branch_ids[row]), index.titles[row],
+                  index.details[row], float(scores[row])) for row in rows]
+
+
+def recommend(text, k=DEFAULT_K, index=None):
+    """Top ``k`` branches, courses and projects for free-text interests or skills."""
+    index = index if index is not None else get_index()
+    k = max(1, min(k, MAX_K))
+    scores = score(index, *query_vector(index, text))
+    return Recommendation(*(top_k(index, scores, kind, k) for kind in KINDS))
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from .intents import tokenize
+from .snapshot import get_snapshot
+
+
+class LRUCache:
+    """Thread-safe LRU with a per-entry time to live and hit/miss counters."""
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+_responses = LRUCache(
+    maxsize=getattr(settings, 'CHATBOT_CACHE_SIZE', 256),
+    ttl=getattr(settings, 'CHATBOT_CACHE_TTL', 300),
+)
+_cached_version = None
+
+
+def normalize_input(user_input):
+    # Case, spacing and punctuation never change the answer
+    return ' '.join(tokenize(user_input))
+
+
+def cached_response(generate):
+    """Memoize chatbot replies by normalized input and data version."""
+    @wraps(generate)
+    def wrapper(user_input, snapshot=None):
+        global _cached_version
+        if snapshot is None:
+            snapshot = get_snapshot()
+        version = snapshot.version
+        if version != _cached_version:
+            # Catalog changed: every stored reply may be stale
+            _responses.clear()
+            _cached_version = version
+
+        key = (version, normalize_input(user_input))
+        response = _responses.get(key)
+        if response is None:
+            response = generate(user_input, snapshot)
+            _responses.set(key, response)
+        return response
+    return wrapper
+
+
+def chatbot_cache_stats():
+    return _responses.stats()
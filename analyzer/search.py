@@ -0,0 +1,138 @@
+"""Full-text search over the catalog, backed by an SQLite FTS5 table.
+
+Every branch, company, course and project has one row in ``analyzer_search``
+(created by migration 0003) keyed by a rowid derived from its kind and
+primary key, so single objects are re-indexed in place by the signals in
+``signals.py``. Bulk writes skip signals and call ``index_objects()`` or
+``rebuild_search_index()`` instead.
+"""
+import re
+from collections import namedtuple
+
+from django.db import connection
+
+TABLE = 'analyzer_search'
+
+# Results per query, and the most a client may ask for
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+# Query words used, so a pasted paragraph can't turn into a huge MATCH expression
+MAX_TERMS = 16
+
+# Kinds of indexed objects, in rowid order: rowid = object_id * len(KINDS) + position
+KINDS = ('branch', 'company', 'course', 'project')
+
+# (kind, source table, branch id column, title, body) for each indexed model
+SOURCES = (
+    ('branch', 'analyzer_engineeringbranch', 'id', 'name',
+     "code || ' ' || description || ' ' || future_trends || ' ' || future_skills"),
+    ('company', 'analyzer_company', 'branch_id', 'name', 'description'),
+    ('course', 'analyzer_course', 'branch_id', 'name', "platform || ' ' || level"),
+    ('project', 'analyzer_project', 'branch_id', 'name', "difficulty || ' ' || description"),
+)
+
+SearchResult = namedtuple('SearchResult', ['kind', 'id', 'branch_id', 'title', 'snippet', 'score'])
+
+WORD_RE = re.compile(r'\w+')
+
+
+def search_available():
+    return connection.vendor == 'sqlite'
+
+
+def rebuild_search_index():
+    """Re-index the whole catalog with one INSERT ... SELECT per model."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE}')
+        for position, (kind, table, branch_column, title, body) in enumerate(SOURCES):
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, kind, object_id, branch_id, title, body) "
+                f"SELECT id * {len(KINDS)} + {position}, %s, id, {branch_column}, {title}, {body} "
+                f"FROM {table}",
+                [kind],
+            )
+
+
+def index_object(kind, obj):
+    """Add or refresh the search row for one saved model instance."""
+    index_objects(kind, [obj])
+
+
+def index_objects(kind, objs):
+    """Add or refresh the search rows of saved instances of one kind, in bulk."""
+    if not search_available() or not objs:
+        return
+    rows = []
+    for obj in objs:
+        branch_id, title, body = _document(kind, obj)
+        rows.append((_rowid(kind, obj.pk), kind, obj.pk, branch_id, title, body))
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {TABLE} (rowid, kind, object_id, branch_id, title, body) '
+            f'VALUES (%s, %s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def unindex_object(kind, pk):
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [_rowid(kind, pk)])
+
+
+def search(text, kinds=None, limit=DEFAULT_LIMIT):
+    """BM25-ranked matches for ``text``, best first.
+
+    Every word must match; the last one also matches as a prefix, so
+    results show up while the user is still typing. Titles weigh ten times
+    as much as the rest of the text.
+    """
+    query = match_expression(text)
+    if not query or not search_available():
+        return []
+    kinds = [kind for kind in (kinds or ()) if kind in KINDS]
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    sql = (f"SELECT kind, object_id, branch_id, title, "
+           f"snippet({TABLE}, 4, '', '', '…', 16), bm25({TABLE}, 0, 0, 0, 10.0, 1.0) AS score "
+           f"FROM {TABLE} WHERE {TABLE} MATCH %s")
+    params = [query]
+    if kinds:
+        sql += f" AND kind IN ({', '.join(['%s'] * len(kinds))})"
+        params += kinds
+    sql += ' ORDER BY score LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [SearchResult(*row) for row in cursor.fetchall()]
+
+
+def match_expression(text):
+    """FTS5 MATCH expression for free text, with every word quoted as a literal."""
+    words = WORD_RE.findall(text.lower())[:MAX_TERMS]
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _rowid(kind, pk):
+    return pk * len(KINDS) + KINDS.index(kind)
+
+
+def _document(kind, obj):
+    if kind == 'branch':
+        body = ' '.join((obj.code, obj.description, obj.future_trends, obj.future_skills))
+        return obj.pk, obj.name, body
+    if kind == 'company':
+        return obj.branch_id, obj.name, obj.description
+    if kind == 'course':
+        return obj.branch_id, obj.name, f'{obj.platform} {obj.level}'
+    return obj.branch_id, obj.name, f'{obj.difficulty} {obj.description}'
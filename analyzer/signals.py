@@ -0,0 +1,97 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .chart_cache import invalidate_charts
+from .data_version import bump_data_version
+from .fragment_cache import BRANCH_LIST, branch_scope, invalidate_scopes
+from .market import refresh_market_summary
+from .metrics import install_sql_timer
+from .models import BranchYearStat, Company, Course, EngineeringBranch, Project
+from .search import index_object, unindex_object
+from .yearly_stats import sync_headline_stats
+
+
+# Drop cached charts whenever branch data changes
+@receiver(post_save, sender=EngineeringBranch)
+@receiver(post_delete, sender=EngineeringBranch)
+def branch_changed(sender, **kwargs):
+    invalidate_charts()
+
+
+# Drop the cached fragments of just the branch a change touches; branch
+# edits also drop the branch list. Like the data version, the scopes move
+# in the writing transaction, so pages cached for a new data version never
+# embed stale fragments.
+@receiver(post_save, sender=EngineeringBranch)
+@receiver(post_delete, sender=EngineeringBranch)
+def branch_fragments_changed(sender, instance, **kwargs):
+    invalidate_scopes(BRANCH_LIST, branch_scope(instance.pk))
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def related_fragments_changed(sender, instance, **kwargs):
+    invalidate_scopes(branch_scope(instance.branch_id))
+
+
+# Move the data version in the same transaction as the change, so every
+# process sees the new version together with the data behind it
+@receiver(post_save, sender=EngineeringBranch)
+@receiver(post_delete, sender=EngineeringBranch)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=BranchYearStat)
+@receiver(post_delete, sender=BranchYearStat)
+def catalog_changed(sender, **kwargs):
+    bump_data_version()
+
+
+# Mirror the headline columns into the yearly stats the analytics read
+@receiver(post_save, sender=EngineeringBranch)
+def headline_stats_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_headline_stats([instance])
+
+
+# Rebuild the market summary right after the version moves, so pages keep
+# reading a ready summary instead of recomputing it on the next request
+@receiver(post_save, sender=EngineeringBranch)
+@receiver(post_delete, sender=EngineeringBranch)
+def market_changed(sender, **kwargs):
+    transaction.on_commit(refresh_market_summary)
+
+
+# Keep the full-text search index in step with the catalog, in the same
+# transaction as the change itself
+SEARCH_KINDS = {EngineeringBranch: 'branch', Company: 'company', Course: 'course', Project: 'project'}
+
+
+@receiver(post_save, sender=EngineeringBranch)
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Project)
+def reindex_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_object(SEARCH_KINDS[sender], instance)
+
+
+@receiver(post_delete, sender=EngineeringBranch)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Project)
+def unindex_deleted(sender, instance, **kwargs):
+    unindex_object(SEARCH_KINDS[sender], instance.pk)
+
+
+# Count and time SQL for the request metrics on every new connection
+connection_created.connect(install_sql_timer, dispatch_uid='analyzer_sql_timer')
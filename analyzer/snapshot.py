@@ -0,0 +1,71 @@
+from collections import defaultdict, namedtuple
+
+from asgiref.sync import sync_to_async
+
+from .data_version import VersionedValue, aget_data_version
+from .intents import IntentMatcher
+from .market import get_market_summary
+from .models import Company, Course, EngineeringBranch, Project
+
+CourseData = namedtuple('CourseData', ['name', 'platform', 'level', 'duration', 'is_free', 'branch_name'])
+ProjectData = namedtuple('ProjectData', ['name', 'description', 'difficulty'])
+Snapshot = namedtuple('Snapshot', ['version', 'branches', 'by_id', 'matcher', 'market'])
+
+BRANCH_FIELDS = ['id', 'name', 'code', 'description', 'icon', 'placement_2024', 'placement_2026',
+                 'salary_2024', 'future_trends', 'future_skills']
+
+
+class BranchData(namedtuple('BranchData', BRANCH_FIELDS + ['companies', 'courses', 'projects'])):
+    __slots__ = ()
+
+    def placement_growth(self):
+        return self.placement_2026 - self.placement_2024
+
+    def __str__(self):
+        return self.name
+
+
+def build_snapshot(version):
+    """Load every branch with its companies, courses and projects in four queries."""
+    companies = defaultdict(list)
+    for branch_id, name in Company.objects.values_list('branch_id', 'name'):
+        companies[branch_id].append(name)
+
+    # Default orderings: courses by (branch, platform, name), projects by (branch, name)
+    courses = defaultdict(list)
+    for row in Course.objects.values_list('branch_id', 'name', 'platform', 'level', 'duration',
+                                          'is_free', 'branch__name'):
+        courses[row[0]].append(CourseData(*row[1:]))
+
+    projects = defaultdict(list)
+    for row in Project.objects.values_list('branch_id', 'name', 'description', 'difficulty'):
+        projects[row[0]].append(ProjectData(*row[1:]))
+
+    branches = tuple(
+        BranchData(*row, tuple(companies[row[0]]), tuple(courses[row[0]]), tuple(projects[row[0]]))
+        for row in EngineeringBranch.objects.values_list(*BRANCH_FIELDS)
+    )
+    return Snapshot(
+        version=version,
+        branches=branches,
+        by_id={branch.id: branch for branch in branches},
+        matcher=IntentMatcher((b.id, b.name, b.code) for b in branches),
+        market=get_market_summary(),
+    )
+
+
+_snapshots = VersionedValue(build_snapshot)
+
+
+def get_snapshot():
+    """Immutable snapshot of the catalog, rebuilt only when the data version moves."""
+    return _snapshots.get()
+
+
+async def aget_snapshot():
+    """Async get_snapshot: reads the version with the async ORM and only hops
+    to a thread when the snapshot must be rebuilt."""
+    snapshot = _snapshots.cached(await aget_data_version())
+    if snapshot is not None:
+        return snapshot
+    return await sync_to_async(get_snapshot)()
@@ -0,0 +1,36 @@
+"""``{% fragment name [branch_id] %}...{% endfragment %}`` caches a block of markup.
+
+Without a branch id the fragment depends on the branch list; with one, on
+that branch and its companies, courses and projects. Querysets the block
+iterates over are lazy, so a cached fragment also skips their queries.
+"""
+from django import template
+
+from ..fragment_cache import BRANCH_LIST, branch_scope, get_fragment
+
+register = template.Library()
+
+
+@register.tag
+def fragment(parser, token):
+    bits = token.split_contents()
+    if len(bits) not in (2, 3):
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a fragment name and an optional branch id")
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    branch_id = parser.compile_filter(bits[2]) if len(bits) == 3 else None
+    return FragmentNode(nodelist, parser.compile_filter(bits[1]), branch_id)
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, branch_id):
+        self.nodelist = nodelist
+        self.name = name
+        self.branch_id = branch_id
+
+    def render(self, context):
+        if self.branch_id is None:
+            scopes = (BRANCH_LIST,)
+        else:
+            scopes = (branch_scope(self.branch_id.resolve(context)),)
+        return get_fragment(self.name.resolve(context), scopes, lambda: self.nodelist.render(context))
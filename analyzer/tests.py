@@ -1,3 +1,850 @@
-from django.test import TestCase
+import io
+import gzip
+import json
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
 
-# Create your tests here.
+from django.db import IntegrityError, connection, transaction
+from asgiref.sync import async_to_sync
+from django.contrib import messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import chart_cache, chart_renderer, initial_data
+from .analytics import build_trends
+from .chart_cache import ChartPending, branch_fingerprint, chart_cache_stats, get_chart_image, invalidate_charts
+from .chart_renderer import CHART_FIELDS
+from .data_version import DATA_SCOPE, VersionedValue, bump_data_version, bump_versions, get_data_version
+from .models import BranchYearStat, CatalogVersion, Company, Course, EngineeringBranch, Project, UserFeedback
+from .exporter import export_chunks, parse_bound
+from .feedback import FeedbackWriter
+from .fragment_cache import BRANCH_LIST, fragment_cache, fragment_cache_stats
+from .importer import import_file
+from .intents import IntentMatcher
+from .loader import load_catalog
+from .page_cache import is_shared, page_cache
+from .pagination import encode_cursor, keyset_paginate
+from .ranking import rank_branches
+from .recommender import build_index, recommend
+from .response_cache import LRUCache, cached_response
+from .search import search
+from .snapshot import get_snapshot
+from .views import COURSE_ORDERING, PROJECT_ORDERING, about
+
+
+class ChartCacheTests(TestCase):
+    """Chart images are kept until the plotted branch columns change."""
+
+    def setUp(self):
+        invalidate_charts()
+
+    def test_fingerprint_follows_plotted_columns(self):
+        branch = EngineeringBranch.objects.create(name='Civil', code='CE', salary_2024=5.0)
+        fingerprint = branch_fingerprint(CHART_FIELDS['salary'])
+        # update() leaves updated_at alone, so only the columns count here
+        EngineeringBranch.objects.filter(pk=branch.pk).update(description='Bridges')
+        self.assertEqual(branch_fingerprint(CHART_FIELDS['salary']), fingerprint)
+        EngineeringBranch.objects.filter(pk=branch.pk).update(salary_2024=6.0)
+        self.assertNotEqual(branch_fingerprint(CHART_FIELDS['salary']), fingerprint)
+
+    @override_settings(CHART_RENDER_WORKERS=0)
+    def test_image_is_reused_until_a_branch_changes(self):
+        self.assertIsNone(get_chart_image('salary'))
+        branch = EngineeringBranch.objects.create(name='Civil', code='CE', salary_2024=5.0)
+        stats = chart_cache_stats()
+        image = get_chart_image('salary')
+        self.assertTrue(image.content.startswith(b'\x89PNG'))
+        self.assertIs(get_chart_image('salary'), image)
+        branch.salary_2024 = 6.0
+        branch.save()
+        self.assertNotEqual(get_chart_image('salary').etag, image.etag)
+        after = chart_cache_stats()
+        self.assertEqual((after['hits'] - stats['hits'], after['misses'] - stats['misses']), (1, 2))
+
+
+    @override_settings(CHART_RENDER_WORKERS=0)
+    def test_deleting_a_branch_moves_last_modified(self):
+        EngineeringBranch.objects.create(name='Civil', code='CE', salary_2024=5.0)
+        mining = EngineeringBranch.objects.create(name='Mining', code='MN', salary_2024=7.0)
+        first = self.client.get('/charts/salary.png')
+        mining.delete()
+        response = self.client.get('/charts/salary.png', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(self.client.get('/charts/salary.png', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                         .status_code, 304)
+
+
+class ChartRenderPoolTests(TestCase):
+    """Charts render on the worker pool, inline without one, and survive a broken pool."""
+
+    class BrokenPool:
+        shut_down = False
+
+        def submit(self, func, *args):
+            raise BrokenProcessPool()
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    class InlinePool(BrokenPool):
+        def submit(self, func, *args):
+            future = Future()
+            future.set_result(func(*args))
+            return future
+
+    def setUp(self):
+        invalidate_charts()
+        for state in (chart_cache._latest, chart_cache._pending):
+            patcher = mock.patch.dict(state, clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.branch = EngineeringBranch.objects.create(name='Civil', code='CE', salary_2024=5.0)
+        self.renders = []
+        patcher = mock.patch.object(chart_cache, 'submit_render', side_effect=self.submit)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self, name, data):
+        future = Future()
+        self.renders.append(future)
+        return future
+
+    def test_requests_never_wait_for_a_render(self):
+        response = self.client.get('/charts/salary.png')
+        self.assertEqual((response.status_code, response['Retry-After']), (503, '2'))
+        self.assertRaises(ChartPending, get_chart_image, 'salary')
+        self.assertEqual(len(self.renders), 1)
+
+        self.renders[0].set_result(b'\x89PNG first')
+        self.assertEqual(self.client.get('/charts/salary.png').content, b'\x89PNG first')
+
+        # New data: the previous image is served until the new one is ready
+        self.branch.salary_2024 = 6.0
+        self.branch.save()
+        self.assertEqual(self.client.get('/charts/salary.png').content, b'\x89PNG first')
+        self.renders[1].set_result(b'\x89PNG second')
+        self.assertEqual(get_chart_image('salary').content, b'\x89PNG second')
+        self.assertEqual(len(self.renders), 2)
+
+    def test_failed_render_is_retried(self):
+        self.assertRaises(ChartPending, get_chart_image, 'salary')
+        self.renders[0].set_exception(BrokenProcessPool())
+        response = self.client.get('/charts/salary.png')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.renders), 2)
+
+    @override_settings(CHART_RENDER_TIMEOUT=0)
+    def test_stuck_render_is_abandoned(self):
+        self.assertRaises(ChartPending, get_chart_image, 'salary')
+        self.assertRaises(ChartPending, get_chart_image, 'salary')
+        self.assertTrue(self.renders[0].cancelled())
+        self.assertEqual(len(self.renders), 2)
+
+    def test_hits_do_not_wait_for_the_render_lock(self):
+        self.assertRaises(ChartPending, get_chart_image, 'salary')
+        self.renders[0].set_result(b'\x89PNG')
+        results = []
+        # Another thread has no view of this test's transaction: hand it the data state
+        fingerprint = branch_fingerprint(CHART_FIELDS['salary'])
+        with chart_cache._render_locks['salary'], mock.patch.object(chart_cache, 'branch_fingerprint',
+                                                                    return_value=fingerprint):
+            thread = threading.Thread(target=lambda: results.append(get_chart_image('salary')))
+            thread.start()
+            thread.join(5)
+        self.assertEqual([image.content for image in results], [b'\x89PNG'])
+
+    def test_pool_broken_during_a_render_is_replaced(self):
+        future = Future()
+        pool = mock.Mock(submit=mock.Mock(return_value=future))
+        with override_settings(CHART_RENDER_WORKERS=1), mock.patch.object(chart_renderer, '_pool', pool):
+            self.assertIs(chart_renderer._submit(divmod, 7, 2), future)
+            future.set_exception(BrokenProcessPool())
+            self.assertIsNone(chart_renderer._pool)
+
+    @override_settings(CHART_RENDER_WORKERS=0)
+    def test_renders_inline_without_workers(self):
+        self.assertEqual(chart_renderer._submit(divmod, 7, 2).result(), (3, 1))
+        self.assertIsInstance(chart_renderer._submit(divmod, 1, 0).exception(), ZeroDivisionError)
+
+    @override_settings(CHART_RENDER_WORKERS=1)
+    def test_broken_pool_is_replaced(self):
+        broken = self.BrokenPool()
+        with mock.patch.object(chart_renderer, '_pool', broken), \
+                mock.patch.object(chart_renderer, 'ProcessPoolExecutor', return_value=self.InlinePool()):
+            self.assertEqual(chart_renderer._submit(divmod, 7, 2).result(), (3, 1))
+            self.assertIsInstance(chart_renderer._pool, self.InlinePool)
+        self.assertTrue(broken.shut_down)
+
+
+class IntentMatcherTests(TestCase):
+    """Intents and branches are matched on whole words, not substrings."""
+
+    matcher = IntentMatcher([(1, 'Mechanical', 'ME'), (2, 'Chemical', 'CHE'), (3, 'Computer Science', 'CSE')])
+
+    def test_greeting_is_a_whole_word(self):
+        self.assertEqual(self.matcher.match('Hi there!').intents, {'greeting'})
+        match = self.matcher.match('is this chemical?')
+        self.assertEqual((match.intents, match.branch_ids), (frozenset(), (2,)))
+
+    def test_ambiguous_codes_are_not_branches(self):
+        self.assertEqual(self.matcher.match('tell me about computer science').branch_ids, (3,))
+        self.assertEqual(self.matcher.match('tell me about it').branch_ids, ())
+
+    def test_codes_and_names_in_order(self):
+        match = self.matcher.match('compare CSE vs mechanical')
+        self.assertEqual((match.intents, match.branch_ids), ({'compare'}, (3, 1)))
+
+
+class DataVersionTests(TestCase):
+    """The data version lives in the database and moves with the write itself."""
+
+    def test_moves_in_the_writing_transaction(self):
+        version = get_data_version()
+        branch = EngineeringBranch.objects.create(name='Civil', code='CE')
+        self.assertNotEqual(get_data_version(), version)
+
+        version = get_data_version()
+        with self.assertRaises(ValueError), transaction.atomic():
+            Course.objects.create(branch=branch, name='Surveying')
+            rolled_back = get_data_version()
+            raise ValueError
+        self.assertEqual(get_data_version(), version)
+        bump_data_version()
+        self.assertNotIn(get_data_version(), (version, rolled_back))
+
+    def test_snapshot_follows_writes_from_other_processes(self):
+        self.assertEqual(get_snapshot().branches, ())
+        # What another process's write looks like here: rows plus a new
+        # version, with none of this process's signals or caches involved
+        EngineeringBranch.objects.bulk_create([EngineeringBranch(name='Mining', code='MN')])
+        CatalogVersion.objects.filter(scope=DATA_SCOPE).update(version=1)
+        self.assertEqual([branch.name for branch in get_snapshot().branches], ['Mining'])
+
+    def test_versioned_value_builds_once_per_version(self):
+        builds = []
+        value = VersionedValue(lambda version: builds.append(version) or object())
+        first = value.get()
+        self.assertIs(value.get(), first)
+        self.assertIs(value.cached(get_data_version()), first)
+        bump_data_version()
+        self.assertIsNone(value.cached(get_data_version()))
+        self.assertIsNot(value.get(), first)
+        self.assertEqual(len(builds), 2)
+
+
+class ResponseCacheTests(TestCase):
+    """The reply LRU evicts the least recently used entry and follows the data version."""
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (3, 1))
+
+    def test_entries_expire(self):
+        cache = LRUCache(maxsize=2, ttl=10)
+        with mock.patch('analyzer.response_cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with mock.patch('analyzer.response_cache.time.monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('analyzer.response_cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual((cache.stats()['expirations'], cache.stats()['size']), (1, 0))
+
+    def test_memo_follows_the_data_version(self):
+        snapshot = mock.Mock(version=1)
+        generate = mock.Mock(side_effect=lambda text, snapshot: f'{text}@{snapshot.version}')
+        reply = cached_response(generate)
+        self.assertEqual(reply('Hello, world!', snapshot), 'Hello, world!@1')
+        # Case, spacing and punctuation share an entry
+        self.assertEqual(reply('hello   WORLD', snapshot), 'Hello, world!@1')
+        self.assertEqual(generate.call_count, 1)
+
+        snapshot.version = 2
+        self.assertEqual(reply('hello world', snapshot), 'hello world@2')
+        self.assertEqual(generate.call_count, 2)
+
+
+class ChatbotApiTests(TestCase):
+    """The chatbot API answers malformed bodies with a 400, not a 500."""
+
+    def test_rejects_bodies_that_are_not_json_objects(self):
+        for body in ('not json', '[1, 2]', '"x"', '42', 'null'):
+            response = self.client.post('/api/chatbot/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
+            self.assertEqual(response.json(), {'error': 'Invalid JSON'})
+
+
+class FeedbackWriterTests(TestCase):
+    """Feedback is queued, written in batches and flushed on shutdown."""
+
+    def setUp(self):
+        patcher = mock.patch.object(UserFeedback.objects, 'bulk_create')
+        self.bulk_create = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def writer(self, **kwargs):
+        writer = FeedbackWriter(**{'flush_interval': 60, **kwargs})
+        self.addCleanup(writer.close, timeout=1)
+        return writer
+
+    def batches(self):
+        return [[record.user_input for record in call.args[0]] for call in self.bulk_create.call_args_list]
+
+    def test_writes_full_batches_and_flushes_the_rest(self):
+        writer = self.writer(batch_size=2)
+        for i in range(5):
+            self.assertTrue(writer.submit(f'q{i}', 'a'))
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(self.batches(), [['q0', 'q1'], ['q2', 'q3'], ['q4']])
+        self.assertEqual(writer.stats(), {'queued': 0, 'written': 5, 'batches': 3, 'dropped': 0, 'failed': 0})
+
+    def test_records_keep_their_submit_time(self):
+        writer = self.writer()
+        writer.submit('q0', 'a')
+        submitted = timezone.now()
+        self.assertTrue(writer.flush(timeout=5))
+        [records] = [call.args[0] for call in self.bulk_create.call_args_list]
+        UserFeedback.objects.all().bulk_create(records)
+        self.assertLessEqual(UserFeedback.objects.get().timestamp, submitted)
+
+    def test_full_queue_drops_and_counts(self):
+        writer = self.writer(max_queue=2)
+        with mock.patch.object(writer, '_start'):
+            self.assertEqual([writer.submit(f'q{i}', 'a') for i in range(3)], [True, True, False])
+        self.assertEqual(writer.stats()['dropped'], 1)
+
+    def test_block_policy_waits_off_the_event_loop(self):
+        writer = self.writer(max_queue=1, policy='block', block_timeout=0.05)
+        threads = []
+        submit = writer.submit
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return submit(*args)
+
+        async def asubmit(*args):
+            threads.append(threading.current_thread())
+            return await writer.asubmit(*args)
+
+        with mock.patch.object(writer, '_start'), mock.patch.object(writer, 'submit', record_thread):
+            self.assertTrue(async_to_sync(asubmit)('q0', 'a'))
+            self.assertFalse(async_to_sync(asubmit)('q1', 'a'))
+        self.assertNotEqual(threads[0], threads[1])
+        self.assertEqual(writer.stats()['dropped'], 1)
+
+    def test_flush_gives_up_on_a_stuck_writer(self):
+        writer = self.writer(max_queue=1)
+        with mock.patch.object(writer, '_start'):
+            writer.submit('q0', 'a')
+        writer._thread = threading.Thread(target=lambda: None)
+        self.assertFalse(writer.flush(timeout=0.05))
+        writer._thread = None
+
+    def test_close_flushes_and_stops(self):
+        writer = self.writer(batch_size=100)
+        writer.submit('q0', 'a')
+        writer.submit('q1', 'a')
+        thread = writer._thread
+        writer.close(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.batches(), [['q0', 'q1']])
+        self.assertFalse(writer.submit('q2', 'a'))
+        self.assertEqual(writer.stats()['dropped'], 1)
+
+
+class LoaderTests(TestCase):
+    """The bulk loader replaces the catalog in one transaction, or not at all."""
+
+    BRANCHES = [{'name': 'Civil', 'code': 'CE', 'placement_2024': 68, 'placement_2026': 70, 'salary_2024': 5.9}]
+
+    def load(self, branches=BRANCHES, **rows):
+        rows.setdefault('companies', [{'branch': 'Civil', 'name': 'L&T'}])
+        rows.setdefault('stats', [{'branch': 'Civil', 'year': 2022, 'placement': 65, 'salary': 5.5}])
+        return load_catalog(branches, **rows)
+
+    def test_reload_replaces_the_catalog(self):
+        self.load()
+        version = get_data_version()
+        report = self.load([dict(self.BRANCHES[0], placement_2024=72)],
+                           courses=[{'branch': 'Civil', 'name': 'Surveying', 'platform': 'NPTEL', 'level': 'Beginner'}])
+        self.assertEqual(report.counts, {'branches': 1, 'companies': 1, 'courses': 1, 'projects': 0,
+                                         'yearly stats': 1})
+        branch = EngineeringBranch.objects.get()
+        self.assertEqual(branch.placement_2024, 72)
+        self.assertEqual(list(Company.objects.values_list('branch_id', 'name')), [(branch.id, 'L&T')])
+        self.assertEqual(list(BranchYearStat.objects.values_list('year', 'placement')),
+                         [(2022, 65), (2024, 72), (2026, 70)])
+        self.assertEqual([result.title for result in search('surveying')], ['Surveying'])
+        self.assertNotEqual(get_data_version(), version)
+
+    def test_bad_row_rolls_everything_back(self):
+        self.load()
+        version = get_data_version()
+        bad_rows = (
+            {'companies': [{'branch': 'Mining', 'name': 'Coal India'}]},
+            {'courses': [{'branch': 'Civil', 'name': None, 'platform': 'NPTEL', 'level': 'Beginner'}]},
+        )
+        for rows in bad_rows:
+            with self.assertRaises((KeyError, IntegrityError)):
+                self.load([dict(self.BRANCHES[0], placement_2024=10)], **rows)
+            self.assertEqual(EngineeringBranch.objects.get().placement_2024, 68)
+            self.assertEqual(list(Company.objects.values_list('name', flat=True)), ['L&T'])
+            self.assertFalse(Course.objects.exists())
+            self.assertEqual(get_data_version(), version)
+
+    def test_seed_catalog(self):
+        report = load_catalog(*initial_data.catalog())
+        self.assertEqual(EngineeringBranch.objects.count(), report.counts['branches'])
+        self.assertEqual(Course.objects.count(), report.counts['courses'])
+        self.assertFalse(Course.objects.filter(branch__isnull=True).exists())
+
+
+class MetricsTests(TestCase):
+    """Requests feed the per-route metrics, served only to allowed addresses."""
+
+    def scrape(self, **extra):
+        return self.client.get('/metrics', **extra)
+
+    def sample(self, name, route):
+        prefix = f'analyzer_{name}{{route="{route}"}} '
+        lines = self.scrape().content.decode().splitlines()
+        return next((float(line[len(prefix):]) for line in lines if line.startswith(prefix)), 0.0)
+
+    def test_requests_are_counted_per_route(self):
+        EngineeringBranch.objects.create(name='Civil', code='CE')
+        requests = self.sample('request_duration_seconds_count', 'compare')
+        queries = self.sample('sql_queries_total', 'compare')
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/compare/')
+        count = len(captured)
+        self.assertRegex(response['Server-Timing'], rf'^sql;dur=[\d.]+;desc="{count} queries"')
+        self.assertIn('template;dur=', response['Server-Timing'])
+        self.assertEqual(self.sample('request_duration_seconds_count', 'compare'), requests + 1)
+        self.assertEqual(self.sample('sql_queries_total', 'compare'), queries + count)
+        # Scrapes are not measured themselves
+        self.assertNotIn('route="metrics"', self.scrape().content.decode())
+        self.assertNotIn('Server-Timing', self.scrape())
+
+    def test_access_is_limited_to_allowed_addresses(self):
+        self.assertEqual(self.scrape().status_code, 200)
+        self.assertEqual(self.scrape(REMOTE_ADDR='203.0.113.9').status_code, 403)
+
+    @override_settings(METRICS_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR', METRICS_ALLOWED_IPS=['10.0.0.7'])
+    def test_client_address_from_a_trusted_proxy(self):
+        self.assertEqual(self.scrape(HTTP_X_FORWARDED_FOR='10.0.0.7').status_code, 200)
+        # Only the address the proxy appended counts, not one the client sent
+        self.assertEqual(self.scrape(HTTP_X_FORWARDED_FOR='10.0.0.7, 203.0.113.9').status_code, 403)
+        self.assertEqual(self.scrape().status_code, 403)
+
+
+class CatalogPaginationTests(TestCase):
+    """Course and project pages are walked with keyset cursors, keeping filters."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = EngineeringBranch.objects.create(name='Civil', code='CE')
+        other = EngineeringBranch.objects.create(name='Mining', code='MN')
+        for name in ('Bridges', 'Concrete', 'Dams', 'Roads', 'Tunnels'):
+            Course.objects.create(name=name, platform='NPTEL', branch=cls.branch, level='Beginner')
+            Project.objects.create(name=name, branch=cls.branch)
+        Course.objects.create(name='Blasting', platform='NPTEL', branch=other, level='Beginner')
+
+    def walk(self, path, key):
+        pages = []
+        query = 'branch=Civil&page_size=2'
+        while query:
+            response = self.client.get(f'{path}?{query}')
+            pages.append([item.name for item in response.context[key]])
+            self.assertIn('branch=Civil', query)
+            query = response.context['next_query']
+        return pages, response
+
+    def test_courses_next_and_previous(self):
+        pages, last = self.walk('/courses/', 'courses')
+        self.assertEqual(pages, [['Bridges', 'Concrete'], ['Dams', 'Roads'], ['Tunnels']])
+        self.assertContains(last, '<td>Tunnels</td>', html=True)
+        self.assertContains(last, 'rel="prev"')
+        self.assertNotContains(last, 'rel="next"')
+
+        response = self.client.get('/courses/?' + last.context['previous_query'])
+        self.assertEqual([course.name for course in response.context['courses']], ['Dams', 'Roads'])
+        first = self.client.get('/courses/?' + response.context['previous_query'])
+        self.assertEqual([course.name for course in first.context['courses']], ['Bridges', 'Concrete'])
+        self.assertIsNone(first.context['previous_query'])
+
+    def test_malformed_cursors_start_over(self):
+        forged = (['x', 'NPTEL', 'Dams', 1], [None, 'NPTEL', 'Dams', 1], [self.branch.id, 'NPTEL', 'Dams', 1.5],
+                  [self.branch.id, ['NPTEL'], 'Dams', 1], [self.branch.id, 'NPTEL', 'Dams'])
+        for values in forged:
+            for param in ('after', 'before'):
+                response = self.client.get('/courses/', {'branch': 'Civil', 'page_size': 2,
+                                                         param: encode_cursor(values)})
+                self.assertEqual(response.status_code, 200, values)
+                self.assertEqual([course.name for course in response.context['courses']], ['Bridges', 'Concrete'])
+        response = self.client.get('/projects/', {'after': encode_cursor(['x', 'Dams', 'y']), 'page_size': 2})
+        self.assertEqual([project.name for project in response.context['projects']], ['Bridges', 'Concrete'])
+
+    def test_projects_pages(self):
+        pages, last = self.walk('/projects/', 'projects')
+        self.assertEqual(pages, [['Bridges', 'Concrete'], ['Dams', 'Roads'], ['Tunnels']])
+
+
+class QueryPlanTests(TestCase):
+    """The hot catalog queries are answered from indexes, without sorting."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = EngineeringBranch.objects.create(name='Computer Science', code='CSE')
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, queryset, index):
+        plan = self.query_plan(queryset)
+        self.assertTrue(any(f'INDEX {index}' in step for step in plan), plan)
+        self.assertFalse(any('TEMP B-TREE' in step for step in plan), plan)
+
+    def test_courses_by_branch_and_platform(self):
+        courses = Course.objects.filter(branch_id=self.branch.id, platform='NPTEL')
+        self.assertUsesIndex(courses.order_by(*COURSE_ORDERING), 'course_branch_platform_idx')
+
+    def test_courses_page_after_cursor(self):
+        for name in ('Algorithms', 'Compilers'):
+            Course.objects.create(name=name, platform='NPTEL', branch=self.branch, level='Beginner')
+        courses = Course.objects.filter(branch_id=self.branch.id)
+        first = keyset_paginate(courses, COURSE_ORDERING, page_size=1)
+        with CaptureQueriesContext(connection) as queries:
+            second = keyset_paginate(courses, COURSE_ORDERING, after=first.next_cursor, page_size=1)
+        self.assertEqual([course.name for course in second], ['Compilers'])
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries[0]['sql'])
+            plan = [row[-1] for row in cursor.fetchall()]
+        self.assertTrue(any('INDEX course_branch_platform_idx' in step for step in plan), plan)
+        self.assertFalse(any('TEMP B-TREE' in step for step in plan), plan)
+
+    def test_projects_by_branch(self):
+        projects = Project.objects.filter(branch_id=self.branch.id).order_by(*PROJECT_ORDERING)
+        self.assertUsesIndex(projects, 'project_branch_name_idx')
+
+    def test_projects_by_branch_and_difficulty(self):
+        projects = Project.objects.filter(branch_id=self.branch.id, difficulty='Hard')
+        self.assertUsesIndex(projects.order_by(*PROJECT_ORDERING), 'project_branch_diff_idx')
+
+    def test_companies_by_branch(self):
+        companies = Company.objects.filter(branch_id=self.branch.id).order_by('name')
+        self.assertUsesIndex(companies, 'company_branch_name_idx')
+
+    def test_latest_feedback(self):
+        self.assertUsesIndex(UserFeedback.objects.all()[:50], 'feedback_timestamp_idx')
+
+
+class SearchTests(TestCase):
+    """The full-text index follows saves and deletes through the signals."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = EngineeringBranch.objects.create(
+            name='Mechanical Engineering', code='ME', future_skills='Robotics, CAD')
+        cls.project = Project.objects.create(
+            name='Line Follower', branch=cls.branch, description='A small robot car')
+
+    def test_ranks_title_matches_first(self):
+        Project.objects.create(name='Robot Arm', branch=self.branch)
+        results = search('robot')
+        self.assertEqual([r.title for r in results][:1], ['Robot Arm'])
+        self.assertIn(('project', self.project.id), [(r.kind, r.id) for r in results])
+
+    def test_prefix_and_kind_filter(self):
+        self.assertEqual([r.kind for r in search('robo', kinds=['branch'])], ['branch'])
+
+    def test_follows_updates_and_deletes(self):
+        self.project.name = 'Maze Solver'
+        self.project.save()
+        self.assertEqual([r.id for r in search('maze')], [self.project.id])
+        self.project.delete()
+        self.assertEqual(search('maze'), [])
+
+    def test_ignores_query_syntax(self):
+        self.assertEqual(search('"robot" OR NEAR('), [])
+
+
+class CatalogApiTests(TestCase):
+    """The v1 API streams valid JSON and answers revalidation with 304."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = EngineeringBranch.objects.create(name='Civil Engineering', code='CE')
+        for name in ('Surveying', 'Structures'):
+            Course.objects.create(name=name, platform='NPTEL', branch=cls.branch, level='Beginner')
+
+    def get_json(self, path, **params):
+        response = self.client.get(path, params)
+        return response, json.loads(b''.join(response.streaming_content))
+
+    def test_streams_filtered_fields(self):
+        response, data = self.get_json('/api/v1/courses/', branch=self.branch.id, fields='name,branch')
+        self.assertEqual(data['results'], [{'name': 'Surveying', 'branch': self.branch.id},
+                                           {'name': 'Structures', 'branch': self.branch.id}])
+
+    def test_conditional_get(self):
+        response, _ = self.get_json('/api/v1/courses/')
+        response = self.client.get('/api/v1/courses/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_rejects_unknown_fields(self):
+        response = self.client.get('/api/v1/courses/', {'fields': 'price'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ImportTests(TestCase):
+    """CSV / JSON Lines upserts match existing rows on their natural keys."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = EngineeringBranch.objects.create(name='Electronics', code='ECE')
+
+    def import_csv(self, kind, text):
+        return import_file(kind, io.BytesIO(text.encode()), f'{kind}.csv')
+
+    def test_creates_then_updates(self):
+        report = self.import_csv('projects', 'branch,name,difficulty\nECE,Radio,Easy\n')
+        self.assertEqual((report.created, report.updated), (1, 0))
+        report = self.import_csv('projects', 'branch,name,difficulty\nElectronics,Radio,Hard\n')
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.assertEqual(Project.objects.get(name='Radio').difficulty, 'Hard')
+        self.assertEqual([r.id for r in search('radio')], [Project.objects.get(name='Radio').id])
+
+    def test_skips_invalid_rows(self):
+        report = import_file('courses', io.BytesIO(
+            b'{"branch": "ECE", "platform": "NPTEL", "name": "Signals", "level": "Beginner"}\n'
+            b'{"branch": "ECE", "platform": "Skillshare", "name": "Noise", "level": "Beginner"}\n'
+            b'{"branch": "Nope", "platform": "NPTEL", "name": "Filters", "level": "Beginner"}\n'
+        ), 'courses.jsonl')
+        self.assertEqual((report.created, report.skipped), (1, 2))
+        self.assertEqual([line for line, _ in report.errors], [2, 3])
+
+
+class RankingTests(TestCase):
+    """Weighted ranking orders branches by score, ties by name."""
+
+    PLACEMENT = {'placement_2024': 1.0}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.civil = EngineeringBranch.objects.create(name='Civil', code='CE', placement_2024=90.0)
+        cls.aero = EngineeringBranch.objects.create(name='Aerospace', code='AE', placement_2024=80.0)
+        cls.bio = EngineeringBranch.objects.create(name='Biotech', code='BT', placement_2024=80.0)
+
+    def names(self, ranking):
+        return [ranked.name for ranked in ranking]
+
+    def test_ties_keep_name_order(self):
+        ranking = rank_branches(self.PLACEMENT)
+        self.assertEqual(self.names(ranking), ['Civil', 'Aerospace', 'Biotech'])
+        self.assertEqual([ranked.rank for ranked in ranking], [1, 2, 3])
+        self.assertEqual(self.names(rank_branches(self.PLACEMENT, k=2)), ['Civil', 'Aerospace'])
+
+    def test_k_larger_than_candidates(self):
+        self.assertEqual(self.names(rank_branches(self.PLACEMENT, k=10)), ['Civil', 'Aerospace', 'Biotech'])
+        ranking = rank_branches(self.PLACEMENT, [self.bio.id, self.civil.id], k=5)
+        self.assertEqual(self.names(ranking), ['Civil', 'Biotech'])
+
+    def test_empty_candidates(self):
+        self.assertEqual(rank_branches(self.PLACEMENT, []), [])
+        self.assertEqual(rank_branches(self.PLACEMENT, [], k=3), [])
+        self.assertEqual(rank_branches(self.PLACEMENT, [0]), [])
+
+    def test_compared_pair_scored_outside_top_k(self):
+        response = self.client.post('/compare/', {
+            'branch1': self.aero.id, 'branch2': self.bio.id,
+            'branches': [self.civil.id, self.aero.id], 'k': 1, 'w_placement_2024': 1,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.context['score1'], response.context['score2']), (80.0, 80.0))
+        self.assertEqual(self.names(response.context['ranking']), ['Civil'])
+        self.assertContains(response, '<td>Civil</td>', html=True)
+
+    def test_bad_k_is_a_form_error(self):
+        for k in ('0', '-2', 'two'):
+            response = self.client.get('/compare/', {'rank': 1, 'k': k})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['ranking'], [])
+            self.assertEqual(response.context['errors'], ['Top k must be a whole number of at least 1.'])
+
+
+class ExportTests(TestCase):
+    """Exports stream every row, and date bounds cover whole days."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for day in (1, 2, 3):
+            feedback = UserFeedback.objects.create(user_input=f'q{day}', bot_response='a')
+            moment = parse_bound(f'2026-03-0{day}').replace(hour=12)
+            UserFeedback.objects.filter(pk=feedback.pk).update(timestamp=moment)
+
+    def export(self, *args, **kwargs):
+        return ''.join(export_chunks(*args, **kwargs))
+
+    def test_until_date_includes_that_day(self):
+        text = self.export('feedback', 'csv', since=parse_bound('2026-03-02'),
+                           until=parse_bound('2026-03-02', end=True))
+        lines = text.splitlines()
+        self.assertEqual(lines[0], 'id,timestamp,user_input,bot_response')
+        self.assertEqual([line.split(',')[2] for line in lines[1:]], ['q2'])
+
+    def test_gzipped_json_lines(self):
+        data = b''.join(export_chunks('feedback', 'jsonl', compress=True))
+        rows = [json.loads(line) for line in gzip.decompress(data).decode().splitlines()]
+        self.assertEqual([row['user_input'] for row in rows], ['q1', 'q2', 'q3'])
+
+
+class TrendTests(TestCase):
+    """Yearly stats mirror the headline columns and feed the vectorized trends."""
+
+    def test_trends(self):
+        trends = build_trends(1, [(1, 'Civil'), (2, 'Mining')], [
+            (1, 2020, 50, 4.0), (1, 2021, 55, None), (1, 2022, 60, 5.0), (2, 2022, 70, 8.0), (3, 2022, 1, 1.0),
+        ])
+        civil, mining = trends.by_id[1], trends.by_id[2]
+        self.assertEqual((civil.placement, civil.placement_growth, civil.placement_average), (60, 10, 55))
+        self.assertAlmostEqual(civil.salary_cagr, (5.0 / 4.0) ** 0.5 - 1)
+        self.assertEqual((trends.projection_year, civil.projected_placement, civil.projected_salary), (2024, 70, 6))
+        # One year of history: no growth, a flat projection
+        self.assertEqual((mining.placement_growth, mining.projected_placement), (None, 70))
+
+    def test_forecast_years_are_not_observations(self):
+        trends = build_trends(1, [(1, 'Civil')], [
+            (1, 2022, 60, 5.0), (1, 2024, 64, 5.5), (1, 2026, 75, None),
+        ], forecast_years={2026})
+        civil = trends.by_id[1]
+        self.assertEqual((civil.last_year, civil.placement, civil.placement_growth), (2024, 64, 4))
+        self.assertEqual((trends.forecast_year, civil.forecast_placement, civil.forecast_growth), (2026, 75, 11))
+        self.assertEqual((trends.projection_year, civil.projected_placement), (2026, 68))
+        self.assertAlmostEqual(civil.forecast_cagr, (75 / 64) ** 0.5 - 1)
+        self.assertFalse(civil.is_forecast())
+
+    def test_market_leaders_use_observed_placement(self):
+        EngineeringBranch.objects.create(name='Civil', code='CE', placement_2024=68, placement_2026=90)
+        EngineeringBranch.objects.create(name='Mining', code='MN', placement_2024=75, placement_2026=76)
+        response = self.client.get('/market/')
+        self.assertEqual([(t.name, t.placement) for t in response.context['top_performers']],
+                         [('Mining', 75), ('Civil', 68)])
+        self.assertEqual([(t.name, t.forecast_growth) for t in response.context['fastest_growing']],
+                         [('Civil', 22), ('Mining', 1)])
+
+    def test_placement_page_on_seed_data(self):
+        load_catalog(*initial_data.catalog())
+        response = self.client.get('/placement/')
+        html = response.content.decode()
+        for branch in response.context['branches']:
+            growth = branch.placement_2026 - branch.placement_2024
+            self.assertEqual((branch.trend.headline_growth(), branch.trend.is_forecast()), (growth, True))
+            self.assertIn(f'{growth:+d}%', html)
+        self.assertIn('(forecast to 2026)', html)
+        self.assertNotIn('Projection', html)
+        # Every branch has a growth and a yearly trend to show
+        self.assertNotIn('—', html)
+
+    def test_headline_columns_are_mirrored(self):
+        branch = EngineeringBranch.objects.create(name='Civil', code='CE', placement_2024=68,
+                                                  placement_2026=70, salary_2024=5.9)
+        branch.placement_2026 = 72
+        branch.save()
+        stats = BranchYearStat.objects.filter(branch=branch).values_list('year', 'placement', 'salary')
+        self.assertEqual(list(stats), [(2024, 68, 5.9), (2026, 72, None)])
+
+
+class RecommenderTests(TestCase):
+    """Free text is scored against branches, courses and projects by TF-IDF."""
+
+    def test_recommend(self):
+        index = build_index(1, [
+            (1, 'Aerospace', 'AE', '', 'Space tech growing', 'Aerodynamics, Drone Tech'),
+            (2, 'Civil', 'CE', '', 'Smart cities', 'BIM, Structural Analysis'),
+        ], [(7, 2, 'Structural Design', 'NPTEL', 'Advanced')], [(9, 1, 'Quadcopter Drone', '', 'Hard')])
+        result = recommend('I like drones and space', index=index)
+        self.assertEqual([match.title for match in result.branches], ['Aerospace'])
+        self.assertEqual([match.id for match in result.projects], [9])
+        self.assertEqual(result.courses, [])
+        self.assertEqual(recommend('zzz', index=index), ([], [], []))
+
+    def test_interest_cards(self):
+        EngineeringBranch.objects.create(name='Mechanical', code='ME', future_skills='Robotics, EV Technology')
+        EngineeringBranch.objects.create(name='Chemical', code='CH', future_skills='Green Chemistry')
+        # TestCase never commits, so on_commit hooks don't move the version
+        bump_data_version()
+        response = self.client.post('/suggestion/', {'interest': '2'})
+        self.assertEqual(response.context['suggested_branch'].name, 'Mechanical')
+
+
+class FragmentCacheTests(TestCase):
+    """Branch markup is cached per branch and dropped by the signals of what it shows."""
+
+    def setUp(self):
+        fragment_cache().clear()
+
+    def test_edit_invalidates_only_its_branch(self):
+        civil = EngineeringBranch.objects.create(name='Civil', code='CE', placement_2024=68)
+        mining = EngineeringBranch.objects.create(name='Mining', code='MN', placement_2024=60)
+        course = Course.objects.create(branch=civil, name='Surveying', platform='NPTEL')
+        for branch in (civil, mining):
+            self.client.get(f'/branch/{branch.id}/')
+        hits = fragment_cache_stats()['hits']
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f'/branch/{civil.id}/')
+        # The branch lookup and the scope versions; companies and courses come from the fragment
+        self.assertEqual(len(queries), 2)
+
+        course.name = 'Geomatics'
+        course.save()
+        self.assertContains(self.client.get(f'/branch/{civil.id}/'), 'Geomatics')
+        self.client.get(f'/branch/{mining.id}/')
+        self.assertEqual(fragment_cache_stats()['hits'], hits + 2)
+
+
+class PageCacheTests(TestCase):
+    """Read-only pages are replayed per data version and revalidated with 304s."""
+
+    def setUp(self):
+        page_cache().clear()
+
+    def test_repeat_views_skip_the_orm(self):
+        EngineeringBranch.objects.create(name='Civil', code='CE', placement_2024=68)
+        bump_data_version()
+        first = self.client.get('/branches/')
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get('/branches/')
+        # Only the shared data version is read
+        self.assertEqual((len(queries), again.content), (1, first.content))
+        response = self.client.get('/branches/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # Written by another process: rows and versions, none of this process's signals
+        EngineeringBranch.objects.bulk_create([EngineeringBranch(name='Mining', code='MN', placement_2024=60)])
+        bump_versions(DATA_SCOPE, BRANCH_LIST)
+        self.assertContains(self.client.get('/branches/', HTTP_IF_NONE_MATCH=first['ETag']), 'Mining')
+
+    def test_personal_pages_are_not_shared(self):
+        self.client.get('/about/')
+        request = RequestFactory().get('/about/')
+        request._messages = CookieStorage(request)
+        messages.info(request, 'Catalog reloaded')
+        self.assertContains(about(request), 'Catalog reloaded')
+
+        request = RequestFactory().get('/about/')
+        request.META['CSRF_COOKIE_NEEDS_UPDATE'] = True
+        self.assertFalse(is_shared(request, HttpResponse()))
@@ -8,12 +8,22 @@ urlpatterns = [
     path('salary/', views.salary_analysis, name='salary'),
     path('branch/<int:branch_id>/', views.branch_detail, name='branch_detail'),
     path('compare/', views.compare_branches, name='compare'),
+    path('api/rank/', views.rank_api, name='rank_api'),
     path('suggestion/', views.career_suggestion, name='suggestion'),
+    path('api/recommend/', views.recommend_api, name='recommend_api'),
     path('market/', views.market_analysis, name='market'),
     path('chatbot/', views.chatbot, name='chatbot'),
     path('api/chatbot/', views.chatbot_api, name='chatbot_api'),
     path('courses/', views.courses, name='courses'),
     path('projects/', views.projects, name='projects'),
+    path('search/', views.search, name='search'),
+    path('api/search/', views.search_api, name='search_api'),
+    path('api/v1/<str:resource>/', views.api_collection, name='api_collection'),
+    path('api/v1/<str:resource>/<int:pk>/', views.api_detail, name='api_detail'),
+    path('charts/<str:name>.png', views.chart_image, name='chart_image'),
     path('about/', views.about, name='about'),
+    path('metrics', views.metrics, name='metrics'),
+    path('export/<str:kind>.<str:fmt>', views.export_data, name='export_data'),
+    path('import/', views.import_data, name='import_data'),
     path('load-data/', views.load_initial_data, name='load_data'),
 ]
\ No newline at end of file
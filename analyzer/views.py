@@ -1,207 +1,142 @@
-from django.shortcuts import render, get_object_or_404
-from django.http import HttpResponse, JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_safe
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 import json
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend - MUST come before pyplot import
-import matplotlib.pyplot as plt
-import numpy as np
-import os
-from django.conf import settings
-from .models import EngineeringBranch, Company, Course, Project, UserFeedback
+from itertools import islice
+from . import api, exporter, initial_data
+from .models import EngineeringBranch, Company, Course, Project
+from .chart_cache import ChartPending, chart_cache_stats, get_chart_image
+from .chart_renderer import CHART_FIELDS
+from .data_version import get_data_version
+from .feedback import get_feedback_writer
+from .fragment_cache import fragment_cache_stats
+from .importer import SPECS as IMPORT_KINDS, CatalogImportError, import_file
+from .loader import load_catalog
+from .market import get_market_summary
+from .metrics import render_prometheus, timed
+from .page_cache import cached_page, page_cache_stats
+from .pagination import keyset_paginate, page_queries, page_size_from
+from .response_cache import cached_response, chatbot_cache_stats
+from .search import DEFAULT_LIMIT, search as search_catalog
+from .snapshot import aget_snapshot
 
-# Helper function to generate placement chart
-def generate_placement_chart():
-    branches = EngineeringBranch.objects.all()
-    if not branches:
-        return None
+# Seek keys for the catalog pages: the models' ordering on indexed columns,
+# with the primary key as tie-breaker
+COURSE_ORDERING = ('branch_id', 'platform', 'name', 'id')
+PROJECT_ORDERING = ('branch_id', 'name', 'id')
 
-    names = [b.name for b in branches]
-    placement_2024 = [b.placement_2024 for b in branches]
-    placement_2026 = [b.placement_2026 for b in branches]
+# Seconds a client should wait before asking again for a chart still being rendered
+CHART_RETRY_AFTER = 2
 
-    x = np.arange(len(names))
-    width = 0.35
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars1 = ax.bar(x - width/2, placement_2024, width, label='2024', color='#3498db')
-    bars2 = ax.bar(x + width/2, placement_2026, width, label='2026', color='#e74c3c')
-    
-    ax.set_xlabel('Engineering Branches')
-    ax.set_ylabel('Placement Percentage (%)')
-    ax.set_title('Placement Rates: 2024 vs 2026')
-    ax.set_xticks(x)
-    ax.set_xticklabels(names, rotation=45, ha='right')
-    ax.legend()
-    
-    # Add value labels on bars
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f'{height}%',
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),
-                        textcoords="offset points",
-                        ha='center', va='bottom', fontsize=8)
-    
-    plt.tight_layout()
-    
-    # Create media directory if it doesn't exist
-    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
-    
-    # Save chart
-    chart_path = os.path.join(settings.MEDIA_ROOT, 'placement_chart.png')
-    plt.savefig(chart_path, dpi=100, bbox_inches='tight')
-    plt.close()
-    
-    return 'placement_chart.png'
+# Rows in the market page's leaderboards
+TOP_PERFORMERS = 6
 
-# Helper function to generate salary chart
-def generate_salary_chart():
-    branches = EngineeringBranch.objects.all()
-    if not branches:
-        return None
+# The suggestion page's interest cards, as text for the recommender
+INTEREST_TEXTS = {
+    '1': 'Coding and technology: programming, AI, software development, web technologies',
+    '2': 'Machines and robotics: vehicles, automation, manufacturing, mechanical systems',
+    '3': 'Buildings and construction: infrastructure, design, project management, smart cities',
+    '4': 'Electronics and gadgets: circuits, IoT, semiconductors, communication systems',
+    '5': 'Chemicals and research: processes, green chemistry, pharmaceuticals, materials',
+    '6': 'Aircraft and space: aerodynamics, space technology, drones, defense',
+}
 
-    names = [b.name for b in branches]
-    salaries = [b.salary_2024 for b in branches]
-    
-    colors = ['#2ecc71', '#3498db', '#9b59b6', '#e67e22', '#1abc9c', '#e74c3c']
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    bars = ax.bar(names, salaries, color=colors[:len(names)])
-    
-    ax.set_xlabel('Engineering Branches')
-    ax.set_ylabel('Salary (Lakhs per Annum)')
-    ax.set_title('Average Salary Package 2024')
-    ax.set_xticklabels(names, rotation=45, ha='right')
-    
-    # Add value labels
-    for bar in bars:
-        height = bar.get_height()
-        ax.annotate(f'₹{height}L',
-                    xy=(bar.get_x() + bar.get_width() / 2, height),
-                    xytext=(0, 3),
-                    textcoords="offset points",
-                    ha='center', va='bottom', fontsize=10)
-    
-    plt.tight_layout()
-    
-    # Create media directory if it doesn't exist
-    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
-    
-    # Save chart
-    chart_path = os.path.join(settings.MEDIA_ROOT, 'salary_chart.png')
-    plt.savefig(chart_path, dpi=100, bbox_inches='tight')
-    plt.close()
-    
-    return 'salary_chart.png'
+# Chart image, rendered in memory and revalidated with ETag / Last-Modified
+def _chart_image(request, name):
+    if name not in CHART_FIELDS:
+        raise Http404("Unknown chart")
+    if not hasattr(request, '_chart_image'):
+        try:
+            request._chart_image = get_chart_image(name)
+        except ChartPending:
+            request._chart_image = None
+            request._chart_pending = True
+    return request._chart_image
 
-# Helper function to generate growth chart
-def generate_growth_chart():
-    branches = EngineeringBranch.objects.all()
-    if not branches:
-        return None
+def _chart_etag(request, name):
+    image = _chart_image(request, name)
+    return image.etag if image else None
 
-    names = [b.name for b in branches]
-    growth = [b.placement_growth() for b in branches]
-    
-    colors = ['#27ae60' if g > 0 else '#c0392b' for g in growth]
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    bars = ax.bar(names, growth, color=colors)
-    
-    ax.set_xlabel('Engineering Branches')
-    ax.set_ylabel('Growth (%)')
-    ax.set_title('Placement Growth: 2024 to 2026')
-    ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-    ax.set_xticklabels(names, rotation=45, ha='right')
-    
-    # Add value labels
-    for bar in bars:
-        height = bar.get_height()
-        ax.annotate(f'{height:+.1f}%',
-                    xy=(bar.get_x() + bar.get_width() / 2, height),
-                    xytext=(0, 5 if height > 0 else -15),
-                    textcoords="offset points",
-                    ha='center', va='bottom' if height > 0 else 'top',
-                    fontsize=10)
-    
-    plt.tight_layout()
-    
-    # Create media directory if it doesn't exist
-    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
-    
-    # Save chart
-    chart_path = os.path.join(settings.MEDIA_ROOT, 'growth_chart.png')
-    plt.savefig(chart_path, dpi=100, bbox_inches='tight')
-    plt.close()
-    
-    return 'growth_chart.png'
+def _chart_last_modified(request, name):
+    image = _chart_image(request, name)
+    return image.last_modified if image else None
+
+@condition(etag_func=_chart_etag, last_modified_func=_chart_last_modified)
+def chart_image(request, name):
+    image = _chart_image(request, name)
+    if getattr(request, '_chart_pending', False):
+        # First render still running: never hold the worker waiting for it
+        response = HttpResponse("Chart is being rendered", status=503, content_type='text/plain')
+        response['Retry-After'] = str(CHART_RETRY_AFTER)
+        patch_cache_control(response, no_store=True)
+        return response
+    if image is None:
+        raise Http404("No branch data to chart yet")
+    response = HttpResponse(image.content, content_type='image/png')
+    # Let browsers keep the bytes but revalidate on every view
+    patch_cache_control(response, no_cache=True)
+    return response
 
 # Home page
+@cached_page
 def index(request):
     branches = EngineeringBranch.objects.all()
+    market = get_market_summary()
     context = {
         'branches': branches,
-        'total_branches': branches.count(),
+        'total_branches': market.branch_count,
+        'market': market,
     }
     return render(request, 'analyzer/index.html', context)
 
 # All branches
+@cached_page
 def all_branches(request):
     branches = EngineeringBranch.objects.all()
     return render(request, 'analyzer/all_branches.html', {'branches': branches})
 
 # Placement comparison
+@cached_page
 def placement_comparison(request):
-    branches = EngineeringBranch.objects.all()
-    
-    # Generate chart
-    chart_file = generate_placement_chart()
+    branches = list(EngineeringBranch.objects.all())
+    trends = _analytics().get_trends()
     
-    # Calculate growth
+    # Growth and CAGR of every branch, from one vectorized pass; branches
+    # without observed history show the growth towards the forecast year
     for branch in branches:
-        branch.growth = branch.placement_growth()
-        branch.growth_icon = "📈" if branch.growth > 0 else "📉"
+        branch.trend = trends.by_id.get(branch.id)
     
     context = {
         'branches': branches,
-        'chart_file': chart_file,
+        'forecast_year': trends.forecast_year,
     }
     return render(request, 'analyzer/placement_comparison.html', context)
 
 # Salary analysis
+@cached_page
 def salary_analysis(request):
-    branches = EngineeringBranch.objects.all()
-    
-    # Generate chart
-    chart_file = generate_salary_chart()
-    growth_chart = generate_growth_chart()
+    branches = list(EngineeringBranch.objects.all())
+    analytics = _analytics()
+    trends = analytics.get_trends()
     
-    max_salary = max([b.salary_2024 for b in branches]) if branches else 1
+    max_salary = get_market_summary().max_salary or 1
     
     for branch in branches:
-        branch.bar_length = int((branch.salary_2024 / max_salary) * 20)
-        branch.bar = '█' * branch.bar_length
+        branch.trend = trends.by_id.get(branch.id)
     
     context = {
         'branches': branches,
-        'chart_file': chart_file,
-        'growth_chart': growth_chart,
         'max_salary': max_salary,
+        'projection_year': trends.projection_year,
+        'average_window': analytics.MOVING_AVERAGE_WINDOW,
     }
     return render(request, 'analyzer/salary_analysis.html', context)
 
-def market_analysis(request):
-    branches = EngineeringBranch.objects.all()
-    print(f"===== DEBUG: Found {branches.count()} branches =====")  # This shows in terminal
-    for branch in branches:
-        print(f"  - {branch.name}: {branch.placement_2024}%")
-    context = {
-        'branches': branches,
-    }
-    return render(request, 'analyzer/market_analysis.html', context)
-
 # Branch details
 def branch_detail(request, branch_id):
     branch = get_object_or_404(EngineeringBranch, id=branch_id)
@@ -227,21 +162,41 @@ def branch_detail(request, branch_id):
 
 # Compare branches
 def compare_branches(request):
-    branches = EngineeringBranch.objects.all()
+    branches = list(EngineeringBranch.objects.all())
+    by_id = {branch.id: branch for branch in branches}
     branch1 = None
     branch2 = None
     score1 = 0
     score2 = 0
-    
+    ranking = []
+    errors = []
+    params = request.POST if request.method == 'POST' else request.GET
+    ranker = _ranking()
+    weights = ranker.parse_weights(params)
+    
+    # Any number of branches (?branches=1&branches=2...) or the classic pair
+    selected = _int_list(params.getlist('branches'))
     if request.method == 'POST':
         branch1_id = request.POST.get('branch1')
         branch2_id = request.POST.get('branch2')
         
         if branch1_id and branch2_id and branch1_id != branch2_id:
-            branch1 = get_object_or_404(EngineeringBranch, id=branch1_id)
-            branch2 = get_object_or_404(EngineeringBranch, id=branch2_id)
-            score1 = branch1.placement_2024 + (branch1.salary_2024 * 8)
-            score2 = branch2.placement_2024 + (branch2.salary_2024 * 8)
+            pair = _int_list([branch1_id, branch2_id])
+            if len(pair) != 2 or not all(i in by_id for i in pair):
+                raise Http404("No EngineeringBranch matches the given query.")
+            branch1, branch2 = by_id[pair[0]], by_id[pair[1]]
+            selected = selected or pair
+            # Scored on their own: the pair need not make the top k below
+            scores = {ranked.id: ranked.score for ranked in ranker.rank_branches(weights, pair)}
+            score1, score2 = scores[branch1.id], scores[branch2.id]
+    
+    k = params.get('k', '').strip()
+    if k and (_int_or_none(k) is None or _int_or_none(k) < 1):
+        errors.append("Top k must be a whole number of at least 1.")
+    
+    # The ranking form ranks every branch when none is ticked
+    if not errors and (selected or 'rank' in params):
+        ranking = ranker.rank_branches(weights, selected or None, _int_or_none(k))
     
     context = {
         'branches': branches,
@@ -249,39 +204,108 @@ def compare_branches(request):
         'branch2': branch2,
         'score1': score1,
         'score2': score2,
+        'ranking': ranking,
+        'selected': selected,
+        'weights': [(metric, metric.replace('_', ' ').capitalize(), weights.get(metric, 0.0))
+                    for metric in ranker.METRICS],
+        'k': k,
+        'errors': errors,
     }
     return render(request, 'analyzer/branch_compare.html', context)
 
-# Career suggestion
+# Weighted branch ranking as JSON: ?ids=1,2,3&k=10&w_salary_2024=8
+def rank_api(request):
+    ranking = _ranking()
+    weights = ranking.parse_weights(request.GET)
+    ids = request.GET.get('ids')
+    branch_ids = _int_list(ids.split(',')) if ids else None
+    results = ranking.rank_branches(weights, branch_ids, _int_or_none(request.GET.get('k')))
+    return JsonResponse({
+        'weights': weights,
+        'results': [ranked._asdict() for ranked in results],
+    })
+
+def _ranking():
+    # numpy is only loaded once something is actually ranked
+    from . import ranking
+    return ranking
+
+def _analytics():
+    # numpy again: only loaded by the pages that show trends
+    from . import analytics
+    return analytics
+
+def _recommender():
+    from . import recommender
+    return recommender
+
+def _int_list(values):
+    return [int(value) for value in values if str(value).strip().isdigit()]
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+# Career suggestion: free-text interests or skills (or one of the interest
+# cards) scored against every branch, course and project
 def career_suggestion(request):
+    params = request.POST if request.method == 'POST' else request.GET
+    interests = params.get('interests', '').strip() or INTEREST_TEXTS.get(params.get('interest'), '')
+    recommendation = None
     suggested_branch = None
     
-    if request.method == 'POST':
-        interest = request.POST.get('interest')
-        interest_map = {
-            '1': 'Computer Science',
-            '2': 'Mechanical',
-            '3': 'Civil',
-            '4': 'Electronics',
-            '5': 'Chemical',
-            '6': 'Aerospace'
-        }
-        if interest in interest_map:
-            suggested_branch = EngineeringBranch.objects.filter(name=interest_map[interest]).first()
-    
-    return render(request, 'analyzer/career_suggestion.html', {'suggested_branch': suggested_branch})
+    if interests:
+        recommendation = _recommendation(interests, params.get('k'))
+        if recommendation.branches:
+            suggested_branch = EngineeringBranch.objects.filter(id=recommendation.branches[0].id).first()
+    
+    context = {
+        'interests': interests,
+        'recommendation': recommendation,
+        'suggested_branch': suggested_branch,
+    }
+    return render(request, 'analyzer/career_suggestion.html', context)
+
+# Recommendations as JSON: ?q=robotics and embedded systems&k=5
+def recommend_api(request):
+    query = request.GET.get('q', '').strip()
+    recommendation = _recommendation(query, request.GET.get('k'))
+    return JsonResponse({
+        'query': query,
+        'results': {kind: [dict(match._asdict(), score=round(match.score, 4),
+                                url=reverse('branch_detail', args=[match.branch_id]))
+                           for match in matches]
+                    for kind, matches in recommendation._asdict().items()},
+    })
+
+def _recommendation(text, k):
+    recommender = _recommender()
+    with timed('recommend'):
+        return recommender.recommend(text, _int_or_none(k) or recommender.DEFAULT_K)
 
 # Market analysis
+@cached_page
 def market_analysis(request):
-    branches = EngineeringBranch.objects.all()
-    best_placement = max(branches, key=lambda x: x.placement_2024) if branches else None
-    highest_salary = max(branches, key=lambda x: x.salary_2024) if branches else None
-    growth_branches = sorted(branches, key=lambda x: x.placement_growth(), reverse=True)[:3] if branches else []
+    # One read of the materialized summary, refreshed when branches change,
+    # and the yearly trends computed once per data version
+    market = get_market_summary()
+    analytics = _analytics()
+    trends = analytics.get_trends()
     
     context = {
-        'best_placement': best_placement,
-        'highest_salary': highest_salary,
-        'growth_branches': growth_branches,
+        'best_placement': market.best_placement,
+        'highest_salary': market.highest_salary,
+        'growth_branches': market.top_growth,
+        'summary': market,
+        'top_performers': analytics.top(trends, 'placement', TOP_PERFORMERS),
+        # Growth towards the predicted year, labelled as a forecast on the page
+        'fastest_growing': analytics.top(trends, 'forecast_growth', TOP_PERFORMERS),
+        'avg_growth': analytics.average(trends, 'forecast_growth'),
+        'avg_salary_cagr': analytics.average(trends, 'salary_cagr'),
+        'projection_year': trends.projection_year,
+        'forecast_year': trends.forecast_year,
     }
     return render(request, 'analyzer/market_analysis.html', context)
 
@@ -289,36 +313,51 @@ def market_analysis(request):
 def chatbot(request):
     return render(request, 'analyzer/chatbot.html')
 
-# Chatbot API - handles AJAX requests
-def chatbot_api(request):
+# Chatbot API - handles AJAX requests, async so it never blocks the event loop
+# under ASGI (career_analyzer.asgi)
+async def chatbot_api(request):
     if request.method == 'POST':
-        data = json.loads(request.body)
-        user_input = data.get('message', '').lower().strip()
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        user_input = str(data.get('message', '')).lower().strip()
         
-        response = generate_chatbot_response(user_input)
+        # Only touches the database when the catalog snapshot must be rebuilt
+        snapshot = await aget_snapshot()
+        with timed('chatbot'):
+            response = generate_chatbot_response(user_input, snapshot)
         
-        # Save feedback
-        UserFeedback.objects.create(
-            user_input=user_input,
-            bot_response=response
-        )
+        # Feedback is buffered and written in batches, off the response path
+        await save_feedback(user_input, response)
         
         return JsonResponse({'response': response})
     
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
-def generate_chatbot_response(user_input):
+async def save_feedback(user_input, response):
+    await get_feedback_writer().asubmit(user_input, response)
+
+@cached_response
+def generate_chatbot_response(user_input, snapshot):
     """Generate chatbot response based on user input"""
     
-    # Get all branches for data
-    branches = EngineeringBranch.objects.all()
+    # Answer from the in-memory snapshot, without querying the database
+    branches = snapshot.branches
+    
+    # Intents and branches are matched on whole words in one pass
+    match = snapshot.matcher.match(user_input)
+    intents = match.intents
+    mentioned = [snapshot.by_id[i] for i in match.branch_ids]
     
     # Greetings
-    if any(word in user_input for word in ['hi', 'hello', 'hey', 'greetings']):
+    if 'greeting' in intents:
         return "👋 Hello! I'm your Engineering Career Assistant. Ask me about placements, salaries, courses, or specific branches!"
     
     # Help
-    if 'help' in user_input:
+    if 'help' in intents:
         return """🤖 **I can help you with:**
 • Placement rates - Ask "placement rates" or "placements"
 • Salary information - Ask "salaries" or "salary packages"
@@ -332,79 +371,80 @@ def generate_chatbot_response(user_input):
 Just type your question! 🎯"""
     
     # Placement rates
-    if 'placement' in user_input:
+    if 'placement' in intents:
         response = "📊 **Placement Rates 2024:**\n\n"
         for branch in branches:
             response += f"• {branch.name}: {branch.placement_2024}%\n"
         response += "\n📈 **Fastest Growing:**\n"
-        top_growth = sorted(branches, key=lambda x: x.placement_growth(), reverse=True)[:2]
+        top_growth = snapshot.market.top_growth[:2]
         for branch in top_growth:
             response += f"• {branch.name}: +{branch.placement_growth()}% growth\n"
         return response
     
     # Salary information
-    if 'salary' in user_input or 'package' in user_input:
+    if 'salary' in intents:
         response = "💰 **Average Salary Packages 2024:**\n\n"
         for branch in branches:
             response += f"• {branch.name}: ₹{branch.salary_2024} LPA\n"
-        highest = max(branches, key=lambda x: x.salary_2024)
-        response += f"\n🏆 **Highest:** {highest.name} with ₹{highest.salary_2024} LPA"
+        highest = snapshot.market.highest_salary
+        if highest:
+            response += f"\n🏆 **Highest:** {highest.name} with ₹{highest.salary_2024} LPA"
         return response
     
     # Future trends
-    if 'future' in user_input or 'trend' in user_input or 'growing' in user_input:
+    if 'trends' in intents:
         response = "🔮 **Future Trends & Growing Fields:**\n\n"
         for branch in branches:
             response += f"• **{branch.name}:** {branch.future_trends}\n"
         return response
     
     # Skills
-    if 'skill' in user_input:
+    if 'skills' in intents:
         response = "🔧 **In-Demand Skills for 2026:**\n\n"
         for branch in branches:
             response += f"• **{branch.name}:** {branch.future_skills}\n"
         return response
     
     # Courses
-    if 'course' in user_input:
+    if 'courses' in intents:
         # Extract branch if mentioned
-        for branch in branches:
-            if branch.name.lower() in user_input:
-                courses = Course.objects.filter(branch=branch)[:4]
-                if courses:
-                    response = f"🎓 **Recommended Courses for {branch.name}:**\n\n"
-                    for course in courses:
-                        free_icon = "🆓" if course.is_free else "💰"
-                        response += f"• **{course.name}**\n  {free_icon} {course.platform} | {course.level} | {course.duration}\n"
-                    return response
-                else:
-                    return f"No courses found for {branch.name} yet."
+        if mentioned:
+            branch = mentioned[0]
+            courses = branch.courses[:4]
+            if courses:
+                response = f"🎓 **Recommended Courses for {branch.name}:**\n\n"
+                for course in courses:
+                    free_icon = "🆓" if course.is_free else "💰"
+                    response += f"• **{course.name}**\n  {free_icon} {course.platform} | {course.level} | {course.duration}\n"
+                return response
+            else:
+                return f"No courses found for {branch.name} yet."
         
         # If no specific branch, show popular courses
         response = "🎓 **Popular Courses:**\n\n"
-        popular_courses = Course.objects.all()[:5]
+        popular_courses = islice((course for branch in branches for course in branch.courses), 5)
         for course in popular_courses:
-            response += f"• **{course.name}** ({course.platform}) - {course.branch.name}\n"
+            response += f"• **{course.name}** ({course.platform}) - {course.branch_name}\n"
         return response
     
     # Projects
-    if 'project' in user_input:
+    if 'projects' in intents:
         # Extract branch if mentioned
-        for branch in branches:
-            if branch.name.lower() in user_input:
-                projects = Project.objects.filter(branch=branch)[:4]
-                if projects:
-                    response = f"🔧 **Project Ideas for {branch.name}:**\n\n"
-                    for project in projects:
-                        response += f"• {project.name} ({project.difficulty})\n"
-                    return response
-                else:
-                    return f"No projects found for {branch.name} yet."
+        if mentioned:
+            branch = mentioned[0]
+            projects = branch.projects[:4]
+            if projects:
+                response = f"🔧 **Project Ideas for {branch.name}:**\n\n"
+                for project in projects:
+                    response += f"• {project.name} ({project.difficulty})\n"
+                return response
+            else:
+                return f"No projects found for {branch.name} yet."
         
         # If no specific branch, show all projects
         response = "🔧 **Project Ideas by Branch:**\n\n"
         for branch in branches[:3]:
-            projects = Project.objects.filter(branch=branch)[:2]
+            projects = branch.projects[:2]
             if projects:
                 response += f"**{branch.name}:**\n"
                 for project in projects:
@@ -412,10 +452,22 @@ Just type your question! 🎯"""
                 response += "\n"
         return response
     
+    # Compare branches
+    if 'compare' in intents and len(mentioned) >= 2:
+        b1, b2 = mentioned[0], mentioned[1]
+        winner = _ranking().rank_branches(branch_ids=[b1.id, b2.id], k=1, snapshot=snapshot)[0]
+        return f"""🔄 **Comparison: {b1.name} vs {b2.name}**
+
+**Placement 2024:** {b1.placement_2024}% vs {b2.placement_2024}%
+**Salary:** ₹{b1.salary_2024}L vs ₹{b2.salary_2024}L
+**Growth:** +{b1.placement_growth()}% vs +{b2.placement_growth()}%
+
+**Winner:** {winner.name}"""
+    
     # Branch information
-    for branch in branches:
-        if branch.name.lower() in user_input or branch.code.lower() in user_input:
-            return f"""📚 **{branch.name} Engineering {branch.icon}**
+    if mentioned:
+        branch = mentioned[0]
+        return f"""📚 **{branch.name} Engineering {branch.icon}**
 
 **Placement 2024:** {branch.placement_2024}%
 **Placement 2026:** {branch.placement_2026}% ({branch.placement_growth():+.1f}% growth)
@@ -427,26 +479,6 @@ Just type your question! 🎯"""
 
 Ask me about courses or projects for {branch.name}!"""
     
-    # Compare branches
-    if 'compare' in user_input:
-        words = user_input.split()
-        branch_names = []
-        for word in words:
-            for branch in branches:
-                if branch.name.lower() in word.lower() or branch.code.lower() in word.lower():
-                    branch_names.append(branch.name)
-        
-        if len(branch_names) >= 2:
-            b1 = EngineeringBranch.objects.get(name=branch_names[0])
-            b2 = EngineeringBranch.objects.get(name=branch_names[1])
-            return f"""🔄 **Comparison: {b1.name} vs {b2.name}**
-
-**Placement 2024:** {b1.placement_2024}% vs {b2.placement_2024}%
-**Salary:** ₹{b1.salary_2024}L vs ₹{b2.salary_2024}L
-**Growth:** +{b1.placement_growth()}% vs +{b2.placement_growth()}%
-
-**Winner:** {b1.name if b1.placement_2024 + b1.salary_2024*8 > b2.placement_2024 + b2.salary_2024*8 else b2.name}"""
-    
     # Default response
     return """I'm not sure I understand. Try asking about:
 • Placement rates
@@ -458,197 +490,216 @@ Ask me about courses or projects for {branch.name}!"""
 Type 'help' for more options! 🤖"""
 
 # Courses page
+@cached_page
 def courses(request):
-    branches = EngineeringBranch.objects.all()
-    courses = Course.objects.all()
+    branches = list(EngineeringBranch.objects.all())
+    courses = Course.objects.select_related('branch')
     branch_filter = request.GET.get('branch', '')
     platform_filter = request.GET.get('platform', '')
     
+    # Filter on the indexed (branch_id, platform, name) columns, not a join on name
     if branch_filter:
-        courses = courses.filter(branch__name=branch_filter)
+        courses = courses.filter(branch_id=branch_id_for(branches, branch_filter))
     if platform_filter:
         courses = courses.filter(platform=platform_filter)
     
+    # Keyset pagination in the model's (branch, platform, name) order
+    page = keyset_paginate(courses, COURSE_ORDERING, request.GET.get('after'),
+                           request.GET.get('before'), page_size_from(request))
+    previous_query, next_query = page_queries(request, page)
+    
     context = {
         'branches': branches,
-        'courses': courses,
+        'courses': page.items,
+        'page': page,
+        'previous_query': previous_query,
+        'next_query': next_query,
         'branch_filter': branch_filter,
         'platform_filter': platform_filter,
     }
     return render(request, 'analyzer/courses.html', context)
 
 # Projects page
+@cached_page
 def projects(request):
-    branches = EngineeringBranch.objects.all()
-    projects = Project.objects.all()
+    branches = list(EngineeringBranch.objects.all())
+    projects = Project.objects.select_related('branch')
     branch_filter = request.GET.get('branch', '')
+    difficulty_filter = request.GET.get('difficulty', '')
     
     if branch_filter:
-        projects = projects.filter(branch__name=branch_filter)
+        projects = projects.filter(branch_id=branch_id_for(branches, branch_filter))
+    if difficulty_filter:
+        projects = projects.filter(difficulty=difficulty_filter)
+    
+    # Keyset pagination in the model's (branch, name) order
+    page = keyset_paginate(projects, PROJECT_ORDERING, request.GET.get('after'),
+                           request.GET.get('before'), page_size_from(request))
+    previous_query, next_query = page_queries(request, page)
     
     context = {
         'branches': branches,
-        'projects': projects,
+        'projects': page.items,
+        'page': page,
+        'previous_query': previous_query,
+        'next_query': next_query,
         'branch_filter': branch_filter,
+        'difficulty_filter': difficulty_filter,
     }
     return render(request, 'analyzer/projects.html', context)
 
+def branch_id_for(branches, name):
+    """Id of the branch called ``name`` (None if there is none, matching nothing)."""
+    return next((branch.id for branch in branches if branch.name == name), None)
+
+# Full-text search over branches, companies, courses and projects
+def search(request):
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind', '')
+    results = _search_results(query, request.GET.getlist('kind'), request.GET.get('limit'))
+    
+    context = {
+        'query': query,
+        'kind': kind,
+        'results': results,
+    }
+    return render(request, 'analyzer/search.html', context)
+
+def search_api(request):
+    query = request.GET.get('q', '').strip()
+    results = _search_results(query, request.GET.getlist('kind'), request.GET.get('limit'))
+    return JsonResponse({'query': query, 'results': results})
+
+def _search_results(query, kinds, limit):
+    try:
+        limit = int(limit or DEFAULT_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    with timed('search'):
+        matches = search_catalog(query, kinds, limit)
+    return [{
+        'kind': match.kind,
+        'id': match.id,
+        'title': match.title,
+        'snippet': match.snippet,
+        'score': round(match.score, 4),
+        'url': reverse('branch_detail', args=[match.branch_id]),
+    } for match in matches]
+
+# Read-only catalog API, v1
+def _api_resource(resource):
+    if resource not in api.RESOURCES:
+        raise Http404(f"No such resource: {resource}")
+    return api.RESOURCES[resource]
+
+def _api_etag(request, resource, pk=None):
+    name = resource if pk is None else f'{resource}-{pk}'
+    return api.etag(name, request, get_data_version())
+
+@require_safe
+@condition(etag_func=_api_etag)
+def api_collection(request, resource):
+    spec = _api_resource(resource)
+    try:
+        fields = api.select_fields(spec, request.GET.get('fields'))
+        queryset = api.filtered_queryset(spec, request.GET)
+    except api.ApiError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    
+    header = {'api_version': api.API_VERSION, 'resource': resource, 'data_version': get_data_version()}
+    chunks = api.encode_rows(queryset, fields, header)
+    response = StreamingHttpResponse(api.streaming_content(request, chunks),
+                                     content_type='application/json')
+    # Clients revalidate with If-None-Match and get a 304 until the data changes
+    patch_cache_control(response, no_cache=True)
+    return response
+
+@require_safe
+@condition(etag_func=_api_etag)
+def api_detail(request, resource, pk):
+    spec = _api_resource(resource)
+    try:
+        fields = api.select_fields(spec, request.GET.get('fields'))
+    except api.ApiError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    obj = get_object_or_404(spec.model, pk=pk)
+    response = HttpResponse(api.encode_row(obj, fields), content_type='application/json')
+    patch_cache_control(response, no_cache=True)
+    return response
+
 # About page
+@cached_page
 def about(request):
     return render(request, 'analyzer/about.html')
 
+# Prometheus metrics, for local scrapers only
+def metrics(request):
+    if metrics_client_ip(request) not in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1']):
+        return HttpResponseForbidden()
+    gauges = {
+        'chart_cache': chart_cache_stats(),
+        'chatbot_cache': chatbot_cache_stats(),
+        'fragment_cache': fragment_cache_stats(),
+        'page_cache': page_cache_stats(),
+        'feedback': get_feedback_writer().stats(),
+    }
+    return HttpResponse(render_prometheus(gauges), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def metrics_client_ip(request):
+    """Address /metrics checks: REMOTE_ADDR, or the one a trusted proxy reports.
+
+    With ``METRICS_CLIENT_IP_HEADER`` set (e.g. ``'HTTP_X_FORWARDED_FOR'``)
+    the last address in that header is used: the one the proxy appended.
+    """
+    header = getattr(settings, 'METRICS_CLIENT_IP_HEADER', None)
+    if not header:
+        return request.META.get('REMOTE_ADDR')
+    addresses = [address.strip() for address in request.META.get(header, '').split(',')]
+    return addresses[-1] or None
+
+# Stream feedback or a catalog table as CSV / JSON Lines (staff only):
+# /export/feedback.csv?since=2026-01-01&until=2026-01-31&gzip=1
+@staff_member_required
+@require_safe
+def export_data(request, kind, fmt):
+    compress = request.GET.get('gzip', '') in ('1', 'true', 'yes')
+    try:
+        chunks = exporter.export_chunks(kind, fmt,
+                                        since=exporter.parse_bound(request.GET.get('since')),
+                                        until=exporter.parse_bound(request.GET.get('until'), end=True),
+                                        compress=compress)
+    except exporter.ExportError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    content_type = 'application/gzip' if compress else f'{exporter.FORMATS[fmt]}; charset=utf-8'
+    response = StreamingHttpResponse(api.streaming_content(request, chunks), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{exporter.filename(kind, fmt, compress)}"'
+    patch_cache_control(response, no_store=True)
+    return response
+
+# Upload a CSV / JSON Lines file into the catalog (staff only)
+@staff_member_required
+def import_data(request):
+    if request.method == 'POST':
+        kind = request.POST.get('kind', '')
+        upload = request.FILES.get('file')
+        if kind not in IMPORT_KINDS or upload is None:
+            messages.error(request, 'Choose what to import and a file.')
+        else:
+            try:
+                report = import_file(kind, upload, upload.name)
+            except CatalogImportError as exc:
+                messages.error(request, f'Import failed: {exc}')
+            else:
+                messages.success(request, f'✅ Imported {kind}: {report}')
+                for line, message in report.errors[:10]:
+                    messages.warning(request, f'Line {line}: {message}')
+            return redirect('import_data')
+    
+    return render(request, 'analyzer/import_data.html', {'kinds': sorted(IMPORT_KINDS)})
+
 # Load initial data
 def load_initial_data(request):
-    # Clear existing data
-    EngineeringBranch.objects.all().delete()
-    Company.objects.all().delete()
-    Course.objects.all().delete()
-    Project.objects.all().delete()
-    
-    # Create branches
-    branches_data = [
-        {"name": "Computer Science", "code": "CS", "placement_2024": 88, "placement_2026": 91, "salary_2024": 9.2,
-         "future_trends": "AI jobs will grow by 40%, Cybersecurity demand increasing, Cloud computing expansion",
-         "future_skills": "AI/ML, Cloud Computing, Cybersecurity, Data Science, Full Stack Development", "icon": "💻"},
-        {"name": "Mechanical", "code": "ME", "placement_2024": 72, "placement_2026": 75, "salary_2024": 6.5,
-         "future_trends": "EV sector boom, Robotics automation expanding, Additive manufacturing growth",
-         "future_skills": "CAD/CAM, Robotics, EV Technology, 3D Printing, Thermodynamics", "icon": "🚗"},
-        {"name": "Civil", "code": "CE", "placement_2024": 68, "placement_2026": 70, "salary_2024": 5.9,
-         "future_trends": "Infrastructure projects under National Pipeline, Smart cities, Green building",
-         "future_skills": "BIM, Project Management, Sustainable Materials, Structural Analysis", "icon": "🏗️"},
-        {"name": "Electronics", "code": "EC", "placement_2024": 79, "placement_2026": 82, "salary_2024": 7.8,
-         "future_trends": "Semiconductor industry growth, IoT devices expansion, 5G implementation",
-         "future_skills": "VLSI, Embedded Systems, IoT, PCB Design, Communication Systems", "icon": "📱"},
-        {"name": "Chemical", "code": "CH", "placement_2024": 71, "placement_2026": 74, "salary_2024": 6.8,
-         "future_trends": "Green chemistry emerging, Pharmaceutical sector stable, Sustainable processes",
-         "future_skills": "Process Optimization, Green Chemistry, Data Analysis, Thermodynamics", "icon": "⚗️"},
-        {"name": "Aerospace", "code": "AE", "placement_2024": 75, "placement_2026": 78, "salary_2024": 8.1,
-         "future_trends": "Space tech growing, Drone technology expanding, Commercial space flight",
-         "future_skills": "Aerodynamics, Composite Materials, Drone Tech, Propulsion Systems", "icon": "✈️"},
-    ]
-    
-    branches = []
-    for data in branches_data:
-        branch = EngineeringBranch.objects.create(**data)
-        branches.append(branch)
-    
-    # Companies
-    companies_data = {
-        "Computer Science": ["Google", "Microsoft", "Amazon", "Infosys", "TCS", "Wipro", "Facebook", "Apple"],
-        "Mechanical": ["TATA Motors", "Mahindra", "L&T", "Maruti Suzuki", "John Deere", "BHEL", "Siemens"],
-        "Civil": ["L&T Construction", "Shapoorji Pallonji", "TATA Projects", "GMR Group", "DLF", "Prestige"],
-        "Electronics": ["Intel", "Samsung", "Qualcomm", "Texas Instruments", "NVIDIA", "AMD", "Broadcom"],
-        "Chemical": ["Reliance", "BASF", "Dow Chemical", "Shell", "BPCL", "IOCL", "ONGC"],
-        "Aerospace": ["ISRO", "DRDO", "Boeing", "Airbus", "HAL", "SpaceX", "Blue Origin"],
-    }
-    
-    for branch in branches:
-        for company_name in companies_data[branch.name]:
-            Company.objects.create(name=company_name, branch=branch)
-    
-    # Courses
-    courses_data = {
-        "Computer Science": [
-            {"platform": "NPTEL", "name": "Programming in Java", "level": "Intermediate", "duration": "12 weeks", "is_free": True},
-            {"platform": "Coursera", "name": "Machine Learning by Andrew Ng", "level": "Beginner", "duration": "11 weeks", "is_free": False},
-            {"platform": "edX", "name": "CS50's Introduction to CS", "level": "Beginner", "duration": "12 weeks", "is_free": True},
-            {"platform": "Udemy", "name": "Web Development Bootcamp", "level": "Beginner", "duration": "55 hours", "is_free": False},
-            {"platform": "NPTEL", "name": "Data Structures and Algorithms", "level": "Intermediate", "duration": "8 weeks", "is_free": True},
-        ],
-        "Mechanical": [
-            {"platform": "NPTEL", "name": "Introduction to Electric Vehicles", "level": "Beginner", "duration": "8 weeks", "is_free": True},
-            {"platform": "Coursera", "name": "Robotics Specialization", "level": "Intermediate", "duration": "7 months", "is_free": False},
-            {"platform": "edX", "name": "CAD and Digital Manufacturing", "level": "Intermediate", "duration": "9 weeks", "is_free": True},
-            {"platform": "NPTEL", "name": "Automobile Engineering", "level": "Advanced", "duration": "12 weeks", "is_free": True},
-        ],
-        "Civil": [
-            {"platform": "NPTEL", "name": "Building Information Modeling", "level": "Intermediate", "duration": "8 weeks", "is_free": True},
-            {"platform": "Coursera", "name": "Construction Management", "level": "Beginner", "duration": "6 months", "is_free": False},
-            {"platform": "edX", "name": "Sustainable Building Design", "level": "Intermediate", "duration": "10 weeks", "is_free": True},
-        ],
-        "Electronics": [
-            {"platform": "NPTEL", "name": "VLSI Design", "level": "Advanced", "duration": "12 weeks", "is_free": True},
-            {"platform": "Coursera", "name": "IoT Programming", "level": "Intermediate", "duration": "7 weeks", "is_free": False},
-            {"platform": "edX", "name": "Embedded Systems", "level": "Beginner", "duration": "8 weeks", "is_free": True},
-        ],
-        "Chemical": [
-            {"platform": "NPTEL", "name": "Process Integration", "level": "Advanced", "duration": "8 weeks", "is_free": True},
-            {"platform": "Coursera", "name": "Introduction to Chemistry", "level": "Beginner", "duration": "7 weeks", "is_free": True},
-            {"platform": "edX", "name": "Sustainable Chemical Engineering", "level": "Intermediate", "duration": "6 weeks", "is_free": True},
-        ],
-        "Aerospace": [
-            {"platform": "NPTEL", "name": "Aerodynamics", "level": "Advanced", "duration": "12 weeks", "is_free": True},
-            {"platform": "Coursera", "name": "Flight Mechanics", "level": "Intermediate", "duration": "8 weeks", "is_free": False},
-            {"platform": "edX", "name": "Introduction to Aeronautical Engineering", "level": "Beginner", "duration": "7 weeks", "is_free": True},
-        ],
-    }
-    
-    for branch in branches:
-        if branch.name in courses_data:
-            for course_data in courses_data[branch.name]:
-                Course.objects.create(branch=branch, **course_data)
-    
-    # Projects
-    projects_data = {
-        "Computer Science": [
-            "AI Chatbot using Python and NLP",
-            "E-commerce Website with React",
-            "Mobile App with Flutter",
-            "Stock Price Prediction Model",
-            "Blockchain-based Voting System",
-            "Cybersecurity Threat Detection"
-        ],
-        "Mechanical": [
-            "Electric Vehicle Conversion Kit",
-            "3D Printed Prosthetic Hand",
-            "Automated Solar Panel Cleaner",
-            "RC Aircraft with FPV System",
-            "Hydraulic Robotic Arm",
-            "Smart Irrigation System"
-        ],
-        "Civil": [
-            "BIM Model for Smart Building",
-            "Earthquake Resistant Design",
-            "Green Building with Sustainable Materials",
-            "Traffic Management System",
-            "Bridge Health Monitoring",
-            "Water Treatment Plant Design"
-        ],
-        "Electronics": [
-            "IoT Home Automation System",
-            "Arduino Weather Station",
-            "PCB Design for Power Supply",
-            "Drone with GPS Navigation",
-            "Digital Oscilloscope",
-            "Smart Energy Meter"
-        ],
-        "Chemical": [
-            "Biodiesel Production from Waste Oil",
-            "Water Purification System",
-            "Plastic Recycling Process",
-            "Chemical Process Simulation",
-            "Nanomaterial Synthesis",
-            "Food Preservation Technology"
-        ],
-        "Aerospace": [
-            "Quadcopter with Autonomous Navigation",
-            "Rocket Propulsion System Design",
-            "Aircraft Wing Design Optimization",
-            "Satellite Communication System",
-            "Drone-based Delivery System",
-            "Aerodynamic Analysis"
-        ],
-    }
-    
-    for branch in branches:
-        if branch.name in projects_data:
-            for project_name in projects_data[branch.name]:
-                difficulty = "Medium"
-                if "AI" in project_name or "Rocket" in project_name:
-                    difficulty = "Hard"
-                elif "Weather" in project_name or "Website" in project_name:
-                    difficulty = "Easy"
-                Project.objects.create(name=project_name, branch=branch, difficulty=difficulty)
-    
-    messages.success(request, '✅ Initial data loaded successfully!')
-    return index(request)
\ No newline at end of file
+    report = load_catalog(*initial_data.catalog())
+    messages.success(request, f'✅ Initial data loaded successfully! ({report})')
+    return redirect('home')
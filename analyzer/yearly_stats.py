@@ -0,0 +1,35 @@
+"""Mirror the headline branch columns into the yearly stats table.
+
+``EngineeringBranch`` keeps ``placement_2024``, ``placement_2026`` and
+``salary_2024``, which forms, the importer and the API still write. Each is
+copied into the ``BranchYearStat`` row of its year; other years live only
+in the stats table.
+"""
+from .models import BranchYearStat
+
+# year -> {stat field: branch column}
+HEADLINE_YEARS = {
+    2024: {'placement': 'placement_2024', 'salary': 'salary_2024'},
+    2026: {'placement': 'placement_2026'},
+}
+
+# Years whose figures are predictions (placement_2026), not recorded results;
+# trend analytics keep them out of the observed series
+FORECAST_YEARS = frozenset({2026})
+
+
+def sync_headline_stats(branches, batch_size=500):
+    """Upsert the headline years of saved ``branches``, one statement per year and batch."""
+    branches = list(branches)
+    if not branches:
+        return
+    for year, columns in HEADLINE_YEARS.items():
+        BranchYearStat.objects.bulk_create(
+            [BranchYearStat(branch_id=branch.pk, year=year,
+                            **{field: getattr(branch, column) for field, column in columns.items()})
+             for branch in branches],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['branch', 'year'],
+            update_fields=list(columns),
+        )
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,13 +50,15 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "analyzer.middleware.PerformanceMiddleware",
 ]
 
 ROOT_URLCONF = "career_analyzer.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, plus render timings for the request metrics
+        "BACKEND": "analyzer.metrics.InstrumentedDjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -107,12 +110,81 @@ USE_I18N = True
 
 USE_TZ = True
 
-# Add these settings for file handling
-MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Worker processes used to render charts off the request path (0 renders inline).
+# Requests never wait for a render; one still running after CHART_RENDER_TIMEOUT
+# seconds is abandoned and started again.
+CHART_RENDER_WORKERS = 2
+CHART_RENDER_TIMEOUT = 30
+
+# Rendered chart PNGs kept in memory by the /charts/ endpoint
+CHART_MEMORY_CACHE_SIZE = 16
+
+# Chatbot replies memoized per normalized question (entries, seconds)
+CHATBOT_CACHE_SIZE = 256
+CHATBOT_CACHE_TTL = 300
+
+# Rendered template fragments (branch cards, company and course lists) are
+# cached per branch and invalidated by model signals. 'locmem' keeps them per
+# process; 'file' shares them between the processes of one host.
+FRAGMENT_CACHE_BACKEND = 'locmem'
+FRAGMENT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Whole read-only pages, keyed on path, query string and data version.
+# Same choice of backend as the fragments. The data version is a database
+# row (analyzer.data_version) that every ORM write, bulk load and import
+# bumps in its own transaction, so a change made by any process expires
+# the pages of every process at once; the timeout only bounds how long
+# pages of old versions take up space. Writes that bypass those paths
+# (raw SQL, a restored database file) must call bump_data_version(), or
+# pages stay stale for up to PAGE_CACHE_TIMEOUT.
+PAGE_CACHE_BACKEND = 'locmem'
+PAGE_CACHE_TIMEOUT = 24 * 60 * 60
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache'
+                   if FRAGMENT_CACHE_BACKEND == 'file' else 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'career_analyzer_fragments')
+                    if FRAGMENT_CACHE_BACKEND == 'file' else 'fragments',
+        'TIMEOUT': FRAGMENT_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache'
+                   if PAGE_CACHE_BACKEND == 'file' else 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'career_analyzer_pages')
+                    if PAGE_CACHE_BACKEND == 'file' else 'pages',
+        'TIMEOUT': PAGE_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
 
-# Create media directory if it doesn't exist
-os.makedirs(MEDIA_ROOT, exist_ok=True)
+# Chatbot feedback is buffered and written with bulk_create in batches.
+# When the queue is full, 'drop' discards new records and 'block' waits briefly
+# (in a worker thread, never on the event loop); dropped records are counted.
+FEEDBACK_BATCH_SIZE = 100
+FEEDBACK_FLUSH_INTERVAL = 1.0
+FEEDBACK_QUEUE_SIZE = 10000
+FEEDBACK_QUEUE_POLICY = 'drop'
+
+# Default weights for branch ranking, per metric (placement_2024,
+# placement_2026, salary_2024, growth); overridable per request with w_<metric>
+BRANCH_RANKING_WEIGHTS = {'placement_2024': 1.0, 'salary_2024': 8.0}
+
+# Rows per page on the courses and projects pages (?page_size= up to the max)
+CATALOG_PAGE_SIZE = 24
+CATALOG_MAX_PAGE_SIZE = 100
+
+# Addresses allowed to scrape /metrics. They are matched against REMOTE_ADDR,
+# which behind a reverse proxy is the proxy itself: there, set
+# METRICS_CLIENT_IP_HEADER to the META key the proxy fills in (e.g.
+# 'HTTP_X_FORWARDED_FOR'; its last address is used). Only do so when every
+# request comes through that proxy, or clients can forge the header.
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+METRICS_CLIENT_IP_HEADER = None
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/